@@ -2,13 +2,22 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 from eventsourcing.domain.model.array import BigArray
+from eventsourcing.exceptions import ConcurrencyError, ProgrammingError
 from eventsourcing.infrastructure.base import (
     AbstractRecordManager,
     RecordManagerWithNotifications,
 )
+from eventsourcing.infrastructure.integersequencegenerators.base import (
+    AbstractIntegerSequenceGenerator,
+)
+from eventsourcing.utils import metrics
 
 DEFAULT_SECTION_SIZE = 20
 USE_REGULAR_SECTIONS = True
+DEFAULT_ARRAYS_IN_FLIGHT = 4
+
+# Item assigned to positions that were reserved but won't be used.
+ABANDONED_POSITION = {"__abandoned_position__": True}
 
 
 class Section(object):
@@ -184,9 +193,41 @@ class RecordManagerNotificationLog(LocalNotificationLog):
 class BigArrayNotificationLog(LocalNotificationLog):
     """
     Notification log that uses the BigArray class.
+
+    Since a big array can be stored in databases that don't have
+    auto-incrementing columns (such as Cassandra), this class can
+    provide a notification log for record managers that don't have
+    notifications of their own. No record manager writes to it, so
+    notifications need to be appended by the application.
+
+    If constructed with an integer sequence generator, notifications
+    are appended by reserving a block of positions for a batch of
+    items, and then assigning the items to the reserved positions,
+    which avoids contending with other writers for the last position
+    in the array.
+
+    A position that has been reserved but not yet assigned may still be
+    assigned by a slower writer, so items are only returned up to the
+    first such position. Positions that won't be assigned, for example
+    the rest of a block that a writer has closed, can be marked as
+    abandoned with ``abandon_positions()``, which can be given as the
+    ``on_unused`` callback of a reserving integer sequence generator.
+    Abandoned positions are presented as notification items of None.
+    Positions reserved by a writer that crashed stop readers until they
+    are abandoned.
+
+    Reading items across more than one of the big array's base arrays
+    is done concurrently, with up to ``arrays_in_flight`` base arrays
+    read at a time.
     """
 
-    def __init__(self, big_array: BigArray, section_size: int):
+    def __init__(
+        self,
+        big_array: BigArray,
+        section_size: int,
+        sequence_generator: Optional[AbstractIntegerSequenceGenerator] = None,
+        arrays_in_flight: Optional[int] = None,
+    ):
         super(BigArrayNotificationLog, self).__init__(section_size)
         assert isinstance(big_array, BigArray)
         if big_array.repo.array_size % section_size:
@@ -196,11 +237,76 @@ class BigArrayNotificationLog(LocalNotificationLog):
                 )
             )
         self.big_array = big_array
+        self.sequence_generator = sequence_generator
+        self.arrays_in_flight = arrays_in_flight or DEFAULT_ARRAYS_IN_FLIGHT
 
-    def get_items(self, start: int, stop: int) -> Sequence[Any]:
+    def append_notifications(self, items: Sequence[Any]) -> Sequence[int]:
+        """
+        Appends items to the notification log.
+
+        :param items: Items to be appended.
+        :return: Positions of the appended items.
+        """
+        if self.sequence_generator is None:
+            raise ProgrammingError(
+                "Appending notifications requires an integer sequence generator"
+            )
+        if not len(items):
+            return []
+        if len(items) == 1:
+            # Use the generator's current block, if it has one.
+            positions: Sequence[int] = [next(self.sequence_generator)]
+        else:
+            positions = self.sequence_generator.reserve(len(items))
+        try:
+            if isinstance(positions, range):
+                # Assign contiguous positions with one write per base array.
+                self.big_array.assign_many(positions.start, items)
+            else:
+                for position, item in zip(positions, items):
+                    self.big_array[position] = item
+        except Exception:
+            # Don't leave readers waiting for positions that won't be assigned.
+            self.abandon_positions(positions)
+            raise
+        return positions
+
+    def abandon_positions(self, positions: Sequence[int]) -> None:
+        """
+        Marks reserved positions that won't be assigned, so that
+        readers can move past them. Positions that have already
+        been assigned are left unchanged.
+        """
+        if isinstance(positions, range):
+            try:
+                self.big_array.assign_many(
+                    positions.start, [ABANDONED_POSITION] * len(positions)
+                )
+                return
+            except ConcurrencyError:
+                pass
+        for position in positions:
+            try:
+                self.big_array[position] = ABANDONED_POSITION
+            except ConcurrencyError:
+                pass
+
+    def get_items(self, start: int, stop: Optional[int]) -> Sequence[Any]:
         next_position = self.get_next_position()
-        stop = min(stop, next_position)
-        return self.big_array[start:stop]
+        stop = next_position if stop is None else min(stop, next_position)
+        if start >= stop:
+            return []
+        items = []
+        for item in self.big_array.get_slice(
+            start, stop, arrays_in_flight=self.arrays_in_flight
+        ):
+            if item is None:
+                # Stop at a position that may still be assigned.
+                break
+            elif item == ABANDONED_POSITION:
+                item = None
+            items.append(item)
+        return items
 
     def get_next_position(self) -> int:
         """Returns next unoccupied position in zero-based sequence.
@@ -267,6 +373,26 @@ class NotificationLogReader(ABC):
 
     def iter_notifications(
         self, stop_index: Optional[int] = None, advance_by: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        notifications = self._iter_notifications(stop_index, advance_by)
+        if metrics.sinks:
+            notifications = self._iter_notifications_with_metrics(notifications)
+        return notifications
+
+    def _iter_notifications_with_metrics(
+        self, notifications: Iterator[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        start_position = self.position
+        try:
+            yield from notifications
+        finally:
+            metrics.increment(
+                "notifications_read_total", self.position - start_position
+            )
+            metrics.increment("sections_read_total", self.section_count)
+
+    def _iter_notifications(
+        self, stop_index: Optional[int] = None, advance_by: Optional[int] = None
     ) -> Iterator[Dict[str, Any]]:
         self.section_count = 0
 
@@ -275,7 +401,8 @@ class NotificationLogReader(ABC):
             raise ValueError("Position less than zero: {}".format(self.position))
 
         if self.use_direct_query_if_available and isinstance(
-            self.notification_log, RecordManagerNotificationLog
+            self.notification_log,
+            (RecordManagerNotificationLog, BigArrayNotificationLog),
         ):
             # Directly query for notifications. The args 'start' and 'stop'
             # are the start and stop positions for a slice in a zero-based
@@ -24,10 +24,13 @@ class PersistencePolicy(object):
     ):
         self.event_store = event_store
         self.persist_event_type = persist_event_type
-        subscribe(self.store_events, self.is_event)
+        # Subscribing with the event type means the predicate is
+        # only called when events of that type are published.
+        if persist_event_type is not None:
+            subscribe(self.store_events, self.is_event, persist_event_type)
 
     def close(self) -> None:
-        unsubscribe(self.store_events, self.is_event)
+        unsubscribe(self.store_events, self.is_event, self.persist_event_type)
 
     def is_event(self, events: IterableOfEvents) -> bool:
         if self.persist_event_type is None:
@@ -1,6 +1,10 @@
+import logging
 import time
 from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
 from decimal import Decimal
+from itertools import islice
 from threading import Event, Lock
 from types import FunctionType
 from typing import (
@@ -12,6 +16,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Type,
     Union,
@@ -21,6 +26,7 @@ from uuid import UUID
 from eventsourcing.application.notificationlog import (
     AbstractNotificationLog,
     NotificationLogReader,
+    RecordManagerNotificationLog,
 )
 from eventsourcing.application.simple import (
     ListOfCausalDependencies,
@@ -35,13 +41,31 @@ from eventsourcing.domain.model.aggregate import (
     TAggregate,
     TAggregateEvent,
 )
+from eventsourcing.domain.model.deadletters import (
+    DeadLetter,
+    DeadLetters,
+    dead_letters_id,
+)
 from eventsourcing.domain.model.events import subscribe, unsubscribe
-from eventsourcing.exceptions import CausalDependencyFailed, ProgrammingError
+from eventsourcing.exceptions import (
+    CausalDependencyFailed,
+    OperationalError,
+    ProgrammingError,
+    RecordConflictError,
+    RepositoryKeyError,
+)
 from eventsourcing.infrastructure.base import RecordManagerWithTracking, TrackingKwargs
 from eventsourcing.infrastructure.eventsourcedrepository import EventSourcedRepository
+from eventsourcing.utils import metrics
+from eventsourcing.utils.topic import get_topic
 from eventsourcing.whitehead import IterableOfEvents
 
+logger = logging.getLogger(__name__)
+
 ListOfAggregateEvents = List[TAggregateEvent]
+PolicyResult = Tuple[
+    ListOfAggregateEvents, ListOfCausalDependencies, List[Any], List[Any]
+]
 
 
 class PromptToQuit(Prompt):
@@ -59,10 +83,20 @@ class WrappedRepository(Generic[TAggregate, TAggregateEvent]):
     """
 
     def __init__(
-        self, repository: EventSourcedRepository[TAggregate, TAggregateEvent]
+        self,
+        repository: EventSourcedRepository[TAggregate, TAggregateEvent],
+        copy_aggregates: bool = False,
     ) -> None:
+        """
+        :param copy_aggregates: Whether to copy aggregates got from the
+            repository cache, and not put new aggregates in the cache, so
+            that the policy can be called without changing the cache.
+        """
         self.repository = repository
+        self.copy_aggregates = copy_aggregates
         self.retrieved_aggregates: Dict[UUID, TAggregate] = {}
+        self.new_aggregates: List[TAggregate] = []
+        self.accessed_ids: Set[UUID] = set()
         self.causal_dependencies: List[Tuple[UUID, int]] = []
         self.orm_objs_pending_save: List[Any] = []
         self.orm_objs_pending_delete: List[Any] = []
@@ -71,14 +105,24 @@ class WrappedRepository(Generic[TAggregate, TAggregateEvent]):
         try:
             aggregate = self.retrieved_aggregates[entity_id]
         except KeyError:
+            self.accessed_ids.add(entity_id)
             aggregate = self.repository.__getitem__(entity_id)
+            if self.copy_aggregates and self.repository.use_cache:
+                aggregate = deepcopy(aggregate)
             self.retrieved_aggregates[entity_id] = aggregate
             self.causal_dependencies.append((aggregate.id, aggregate.__version__))
         return aggregate
 
     def __contains__(self, entity_id: UUID) -> bool:
+        if entity_id in self.retrieved_aggregates:
+            return True
+        self.accessed_ids.add(entity_id)
         return self.repository.__contains__(entity_id)
 
+    def get_version(self, entity_id: UUID) -> Optional[int]:
+        self.accessed_ids.add(entity_id)
+        return self.repository.get_version(entity_id)
+
     def save_orm_obj(self, orm_obj: Any) -> None:
         """
         Includes orm_obj in "process event", so that projections into
@@ -99,6 +143,15 @@ class WrappedRepository(Generic[TAggregate, TAggregateEvent]):
 class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
     notification_log_reader_class = NotificationLogReader
     apply_policy_to_generated_events = False
+    merged_pipeline_id: Optional[int] = None
+    policy_workers = 1
+    policy_window = 20
+    use_dead_letters = False
+    retryable_exceptions: Tuple[Type[Exception], ...] = (
+        OperationalError,
+        RecordConflictError,
+        CausalDependencyFailed,
+    )
 
     def __init__(
         self,
@@ -108,8 +161,23 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
         use_direct_query_if_available: bool = False,
         notification_log_reader_class: Optional[Type[NotificationLogReader]] = None,
         apply_policy_to_generated_events: bool = False,
+        merged_pipeline_id: Optional[int] = None,
+        policy_workers: Optional[int] = None,
+        policy_window: Optional[int] = None,
+        use_dead_letters: Optional[bool] = None,
         **kwargs: Any
     ):
+        """
+        :param merged_pipeline_id: ID of pipeline into which this process
+            application merges the notifications it processes from all pipelines.
+        :param policy_workers: Number of threads used to call the policy
+            concurrently (the policy is called serially by default).
+        :param policy_window: Number of notifications read ahead when
+            calling the policy concurrently.
+        :param use_dead_letters: Whether to park notifications for which the
+            policy raises an exception (other than retryable exceptions) as
+            dead letters, so that later notifications can be processed.
+        """
         self.policy_func = policy
         self.readers: OrderedDict[str, NotificationLogReader] = OrderedDict()
         self.is_reader_position_ok: Dict[str, bool] = defaultdict(bool)
@@ -125,12 +193,31 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
             apply_policy_to_generated_events
             or type(self).apply_policy_to_generated_events
         )
+        if merged_pipeline_id is not None:
+            self.merged_pipeline_id = merged_pipeline_id
+        if policy_workers is not None:
+            self.policy_workers = policy_workers
+        if policy_window is not None:
+            self.policy_window = policy_window
+        if use_dead_letters is not None:
+            self.use_dead_letters = use_dead_letters
+        if self.use_dead_letters and not self.set_notification_ids:
+            # The events of dead letters aren't notifiable.
+            raise ProgrammingError(
+                "Process application using dead letters must "
+                "set 'set_notification_ids=True'"
+            )
+        self._policy_executor: Optional[ThreadPoolExecutor] = None
 
         super(ProcessApplication, self).__init__(
             name=name, setup_table=setup_table, **kwargs
         )
 
         if self._event_store:
+            if self.merged_pipeline_id is not None:
+                # Track notifications in this pipeline, but write
+                # new events in the merged pipeline.
+                self._event_store.record_manager.pipeline_id = self.merged_pipeline_id
             self.notification_topic_key = (
                 self._event_store.record_manager.field_names.topic
             )
@@ -149,19 +236,29 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
         #    The particular way a prompt published here is actually sent to
         #    any followers is the responsibility of a particular system runner.
         if self._persistence_policy:
-            subscribe(
-                predicate=self._persistence_policy.is_event,
-                handler=self.publish_prompt_for_events,
-            )
+            persist_event_type = self._persistence_policy.persist_event_type
+            if persist_event_type is not None:
+                subscribe(
+                    handler=self.publish_prompt_for_events,
+                    event_type=persist_event_type,
+                )
 
     def close(self) -> None:
         if self._persistence_policy:
             unsubscribe(
-                predicate=self._persistence_policy.is_event,
                 handler=self.publish_prompt_for_events,
+                event_type=self._persistence_policy.persist_event_type,
             )
+        if self._policy_executor is not None:
+            self._policy_executor.shutdown()
+            self._policy_executor = None
         super(ProcessApplication, self).close()
 
+    def change_pipeline(self, pipeline_id: int) -> None:
+        super(ProcessApplication, self).change_pipeline(pipeline_id)
+        if self.merged_pipeline_id is not None:
+            self.event_store.record_manager.pipeline_id = self.merged_pipeline_id
+
     def publish_prompt_for_events(self, _: Optional[IterableOfEvents] = None) -> None:
         """
         Publishes prompt for a given event.
@@ -232,52 +329,186 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
                 self.is_reader_position_ok[upstream_name] = True
 
             try:
-                # Process all the new event notifications in the reader.
-                while True:
-                    with self._policy_lock:
-                        # Get notification generator.
-                        generator = self.get_notification_generator(
-                            upstream_name, advance_by
-                        )
-                        try:
-                            notification = next(generator)
-                        except StopIteration:
-                            self.del_notification_generator(upstream_name)
-                            break
+                if self.policy_workers > 1:
+                    # Call the policy concurrently with windows of notifications.
+                    notification_count += self.run_concurrently(
+                        upstream_name, advance_by
+                    )
+                else:
+                    # Process all the new event notifications in the reader.
+                    while True:
+                        with self._policy_lock:
+                            # Get notification generator.
+                            generator = self.get_notification_generator(
+                                upstream_name, advance_by
+                            )
+                            try:
+                                notification = next(generator)
+                            except StopIteration:
+                                self.del_notification_generator(upstream_name)
+                                break
+
+                            # Increment the notification count.
+                            notification_count += 1
+
+                            # Check causal dependencies.
+                            self.check_causal_dependencies(
+                                upstream_name, notification.get("causal_dependencies")
+                            )
+
+                            # Get event from notification.
+                            event = self.event_from_notification(notification)
+
+                            # Wait for the clock, if there is one.
+                            if self.clock_event is not None:
+                                self.clock_event.wait()
+
+                            # Process domain event.
+                            new_events, new_records = self.process_upstream_event(
+                                event, notification["id"], upstream_name
+                            )
+
+                        self.take_snapshots(new_events)
+                        self.publish_prompt_for_new_records(new_events, new_records)
+            except Exception as e:
+                # Need to invalidate reader position, so it is refreshed.
+                self.is_reader_position_ok[upstream_name] = False
+                raise
 
-                        # Increment the notification count.
-                        notification_count += 1
+            if metrics.sinks and prompt and prompt.head_notification_id:
+                metrics.gauge(
+                    "notification_lag",
+                    prompt.head_notification_id - self.readers[upstream_name].position,
+                    application=self.name,
+                    upstream=upstream_name,
+                )
+
+        return notification_count
+
+    def run_concurrently(self, upstream_name: str, advance_by: Optional[int]) -> int:
+        """
+        Processes the new event notifications from an upstream notification
+        log, by calling the policy concurrently with a window of notifications
+        on a pool of threads.
+
+        The results are recorded in the order of the notifications, so
+        that tracking records stay contiguous. If a call to the policy
+        accessed an aggregate that was changed by the result of an earlier
+        notification in the same window, or raised an exception, the policy
+        is called again after the earlier results have been recorded. Hence
+        policies must depend only on the domain event and on aggregates
+        accessed through the repository given to the policy.
 
-                        # Check causal dependencies.
+        :param upstream_name: Name of the upstream application being processed.
+        :param advance_by: Maximum event notifications to process.
+        :return: Returns number of events that have been processed.
+        """
+        notification_count = 0
+        while True:
+            processed: List[Tuple[ListOfAggregateEvents, List]] = []
+            with self._policy_lock:
+                # Get a window of notifications.
+                generator = self.get_notification_generator(upstream_name, advance_by)
+                notifications = list(islice(generator, self.policy_window))
+                if not notifications:
+                    self.del_notification_generator(upstream_name)
+                    break
+
+                # Call the policy concurrently with the events.
+                calls: List[Tuple[TAggregateEvent, WrappedRepository, Future]] = []
+                causal_dependency_failed: Optional[CausalDependencyFailed] = None
+                for notification in notifications:
+                    try:
                         self.check_causal_dependencies(
                             upstream_name, notification.get("causal_dependencies")
                         )
-
-                        # Get event from notification.
-                        event = self.event_from_notification(notification)
-
-                        # Wait for the clock, if there is one.
+                    except CausalDependencyFailed as e:
+                        # Process the earlier notifications, then raise.
+                        causal_dependency_failed = e
+                        break
+                    event = self.event_from_notification(notification)
+                    wrappedrepo = WrappedRepository(
+                        self.repository, copy_aggregates=True
+                    )
+                    future = self.policy_executor.submit(
+                        self.call_policy, event, wrappedrepo
+                    )
+                    calls.append((event, wrappedrepo, future))
+
+                # Record the results in the order of the notifications.
+                changed_ids: Set[UUID] = set()
+                try:
+                    for notification, (event, wrappedrepo, future) in zip(
+                        notifications, calls
+                    ):
                         if self.clock_event is not None:
                             self.clock_event.wait()
-
-                        # Process domain event.
+                        try:
+                            policy_result: Optional[PolicyResult] = future.result()
+                        except Exception:
+                            # Call the policy again, after earlier results.
+                            policy_result = None
+                        else:
+                            assert policy_result is not None
+                            accessed_ids = wrappedrepo.accessed_ids.union(
+                                e.originator_id for e in policy_result[0]
+                            )
+                            if not accessed_ids.isdisjoint(changed_ids):
+                                # Call the policy again, with the changes.
+                                policy_result = None
+                        notification_count += 1
                         new_events, new_records = self.process_upstream_event(
-                            event, notification["id"], upstream_name
+                            event, notification["id"], upstream_name, policy_result
                         )
+                        if policy_result is not None and self.repository.use_cache:
+                            # Put the recorded aggregates in the cache.
+                            for aggregate in list(
+                                wrappedrepo.retrieved_aggregates.values()
+                            ) + list(wrappedrepo.new_aggregates):
+                                self.repository.put_entity_in_cache(
+                                    aggregate.id, aggregate
+                                )
+                        changed_ids.update(e.originator_id for e in new_events)
+                        processed.append((new_events, new_records))
+                finally:
+                    for _, _, future in calls:
+                        future.cancel()
+
+            for new_events, new_records in processed:
+                self.take_snapshots(new_events)
+                self.publish_prompt_for_new_records(new_events, new_records)
+
+            if causal_dependency_failed is not None:
+                raise causal_dependency_failed
 
-                    self.take_snapshots(new_events)
+        return notification_count
 
-                    # Publish a prompt if there are new notifications.
-                    # Todo: Optionally send events as prompts, saves pulling
-                    #  event if it arrives in order.
-                    if any([event.__notifiable__ for event in new_events]):
-                        self.publish_prompt()
-            except Exception as e:
-                # Need to invalidate reader position, so it is refreshed.
-                self.is_reader_position_ok[upstream_name] = False
-                raise
+    @property
+    def policy_executor(self) -> ThreadPoolExecutor:
+        """
+        Pool of threads used to call the policy concurrently.
+        """
+        if self._policy_executor is None:
+            self._policy_executor = ThreadPoolExecutor(
+                max_workers=self.policy_workers,
+                thread_name_prefix="{}-policy".format(self.name),
+            )
+        return self._policy_executor
 
-        return notification_count
+    def publish_prompt_for_new_records(
+        self, new_events: ListOfAggregateEvents, new_records: List
+    ) -> None:
+        """
+        Publishes a prompt if there are new notifications. The notifications
+        are carried by the prompt, so they can be passed directly to
+        downstream processes.
+        """
+        if any([event.__notifiable__ for event in new_events]):
+            notifications = self.create_notifications_from_records(new_records)
+            head_notification_id = None
+            if notifications:
+                head_notification_id = notifications[-1]["id"]
+            self.publish_prompt(head_notification_id, notifications)
 
     def check_causal_dependencies(self, upstream_name, causal_dependencies_json):
         """
@@ -327,7 +558,11 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
                 )
 
     def process_upstream_event(
-        self, domain_event: TAggregateEvent, notification_id: int, upstream_name: str
+        self,
+        domain_event: TAggregateEvent,
+        notification_id: int,
+        upstream_name: str,
+        policy_result: Optional[PolicyResult] = None,
     ) -> Tuple[ListOfAggregateEvents, List]:
         """
         Processes given domain event from an upstream notification log.
@@ -339,19 +574,31 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
         :param domain_event: Domain event to be processed.
         :param notification_id: Position in notification log.
         :param upstream_name: Name of upstream application.
+        :param policy_result: Result of a call to the policy that has
+            already been made (the policy isn't called again).
         :return: Returns a list of new domain events.
         """
         cycle_started: Optional[float] = None
         if self.tick_interval is not None:
             cycle_started = time.process_time()
+        metrics_started: Optional[float] = None
+        if metrics.sinks:
+            metrics_started = time.perf_counter()
 
         # Call policy with the upstream event.
+        if policy_result is None:
+            if self.use_dead_letters:
+                policy_result = self.call_policy_or_park(
+                    domain_event, notification_id, upstream_name
+                )
+            else:
+                policy_result = self.call_policy(domain_event)
         (
             domain_events,
             causal_dependencies,
             orm_objs_pending_save,
             orm_objs_pending_delete,
-        ) = self.call_policy(domain_event)
+        ) = policy_result
 
         # Todo: Supplement causal dependencies with system software version?
         #  - this may help to inhibit premature processing when upgrading
@@ -401,10 +648,27 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
                 cycle_time = cycle_ended - cycle_started
                 cycle_perc = 100 * (cycle_time) / self.tick_interval
                 if cycle_perc > 100:
-                    msg = "Warning: {} cycle exceeded tick interval by: {:.2f}%".format(
-                        self.name, cycle_perc - 100
+                    logger.warning(
+                        "%s cycle exceeded tick interval by: %.2f%%",
+                        self.name,
+                        cycle_perc - 100,
                     )
-                    print(msg)
+                    if metrics.sinks:
+                        metrics.increment(
+                            "tick_interval_overruns_total", application=self.name
+                        )
+            if metrics_started is not None:
+                metrics.observe(
+                    "process_event_seconds",
+                    time.perf_counter() - metrics_started,
+                    application=self.name,
+                    upstream=upstream_name,
+                )
+                metrics.increment(
+                    "process_events_total",
+                    application=self.name,
+                    upstream=upstream_name,
+                )
         return domain_events, new_event_records
 
     def event_from_notification(
@@ -456,16 +720,21 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
     def get_recorded_position(self, upstream_name):
         record_manager = self.event_store.record_manager
         assert isinstance(record_manager, RecordManagerWithTracking)
-        recorded_position = record_manager.get_max_tracking_record_id(upstream_name)
+        recorded_position = record_manager.get_max_tracking_record_id(
+            upstream_name, pipeline_id=self.pipeline_id
+        )
         return recorded_position
 
     def call_policy(
-        self, domain_event: TAggregateEvent
-    ) -> Tuple[ListOfAggregateEvents, ListOfCausalDependencies, List[Any], List[Any]]:
+        self,
+        domain_event: TAggregateEvent,
+        wrappedrepo: Optional[WrappedRepository[TAggregate, TAggregateEvent]] = None,
+    ) -> PolicyResult:
         """
         Calls the process application policy with the given domain event.
 
         :param domain_event: Domain event that will be given to the policy.
+        :param wrappedrepo: Optional wrapped repository given to the policy.
 
         :return: Returns a list of domain events, and a list of causal dependencies.
         """
@@ -473,7 +742,8 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
         policy = self.policy_func or self.policy
 
         # Wrap the actual repository, so we can collect aggregates.
-        wrappedrepo = WrappedRepository(self.repository)
+        if wrappedrepo is None:
+            wrappedrepo = WrappedRepository(self.repository)
 
         # Initialise a deque for FIFO queue of unprocessed events.
         unprocessed: Deque[TAggregateEvent] = deque()
@@ -489,7 +759,16 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
             domain_event = unprocessed.popleft()
 
             # Call the policy with this domain event.
-            returned = policy(wrappedrepo, domain_event)
+            if metrics.sinks:
+                policy_started = time.perf_counter()
+                returned = policy(wrappedrepo, domain_event)
+                metrics.observe(
+                    "policy_seconds",
+                    time.perf_counter() - policy_started,
+                    application=self.name,
+                )
+            else:
+                returned = policy(wrappedrepo, domain_event)
 
             # Collect aggregates retrieved by the policy.
             touched = list(wrappedrepo.retrieved_aggregates.values())
@@ -502,8 +781,13 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
                     new_aggregates = [returned]
 
                 for aggregate in new_aggregates:
+                    wrappedrepo.new_aggregates.append(aggregate)
+
                     # Put new aggregates in repository cache (avoids replay).
-                    if wrappedrepo.repository.use_cache:
+                    if (
+                        wrappedrepo.repository.use_cache
+                        and not wrappedrepo.copy_aggregates
+                    ):
                         wrappedrepo.repository.put_entity_in_cache(
                             aggregate.id, aggregate
                         )
@@ -539,7 +823,7 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
                 pipeline_id, notification_id = rm.get_pipeline_and_notification_id(
                     entity_id, entity_version
                 )
-                if pipeline_id is not None and pipeline_id != self.pipeline_id:
+                if pipeline_id is not None and pipeline_id != rm.pipeline_id:
                     highest[pipeline_id] = max(notification_id, highest[pipeline_id])
 
             for pipeline_id, notification_id in highest.items():
@@ -554,6 +838,144 @@ class ProcessApplication(SimpleApplication[TAggregate, TAggregateEvent]):
             wrappedrepo.orm_objs_pending_delete,
         )
 
+    def call_policy_or_park(
+        self, domain_event: TAggregateEvent, notification_id: int, upstream_name: str
+    ) -> PolicyResult:
+        """
+        Calls the policy with the given domain event. If the policy raises an
+        exception that isn't retryable, the notification is parked as a dead
+        letter, and the result has only the event that parks the dead letter.
+        """
+        wrappedrepo = WrappedRepository(self.repository)
+        try:
+            return self.call_policy(domain_event, wrappedrepo)
+        except self.retryable_exceptions:
+            raise
+        except Exception as e:
+            # Purge from the cache aggregates the policy may have changed.
+            if self.repository.use_cache:
+                with self.repository.cache_lock:
+                    for aggregate_id in list(wrappedrepo.retrieved_aggregates) + [
+                        a.id for a in wrappedrepo.new_aggregates
+                    ]:
+                        self.repository.cache.pop(aggregate_id, None)
+            dead_letters = self.get_dead_letters_aggregate()
+            dead_letters.park(
+                upstream_name=upstream_name,
+                pipeline_id=self.pipeline_id,
+                notification_id=notification_id,
+                event_topic=get_topic(type(domain_event)),
+                error=repr(e),
+            )
+            return dead_letters.__batch_pending_events__(), [], [], []
+
+    def get_dead_letters_aggregate(self) -> DeadLetters:
+        dead_letters_id_ = dead_letters_id(self.name)
+        try:
+            dead_letters = self.repository[dead_letters_id_]
+        except RepositoryKeyError:
+            dead_letters = DeadLetters.__create__(originator_id=dead_letters_id_)
+        assert isinstance(dead_letters, DeadLetters)
+        return dead_letters
+
+    @property
+    def dead_letters(self) -> List[DeadLetter]:
+        """
+        Returns the notifications that have been parked as dead letters.
+        """
+        return self.get_dead_letters_aggregate().letters
+
+    def replay_dead_letter(
+        self,
+        upstream_name: str,
+        notification_id: int,
+        pipeline_id: Optional[int] = None,
+    ) -> ListOfAggregateEvents:
+        """
+        Calls the policy again with the event of a dead letter, and records
+        the new domain events atomically with the removal of the dead letter.
+
+        The notification is read again from the upstream notification log.
+        If the policy raises an exception, the dead letter is not removed.
+
+        :param upstream_name: Name of the upstream application.
+        :param notification_id: ID of the notification in the upstream log.
+        :param pipeline_id: Pipeline in which the notification was parked
+            (defaults to the pipeline of this application object).
+        :return: Returns a list of new domain events.
+        :raises KeyError: If the notification isn't a dead letter.
+        """
+        if pipeline_id is None:
+            pipeline_id = self.pipeline_id
+        with self._policy_lock:
+            dead_letters = self.get_dead_letters_aggregate()
+            dead_letters.get(upstream_name, pipeline_id, notification_id)
+
+            # Read the notification again.
+            reader = self.notification_log_reader_class(
+                self.get_upstream_notification_log(upstream_name, pipeline_id)
+            )
+            notification = reader[notification_id - 1]
+            event = self.event_from_notification(notification)
+
+            (
+                domain_events,
+                causal_dependencies,
+                orm_objs_pending_save,
+                orm_objs_pending_delete,
+            ) = self.call_policy(event)
+
+            dead_letters.remove(upstream_name, pipeline_id, notification_id)
+            domain_events += dead_letters.__batch_pending_events__()
+            process_event = ProcessEvent(
+                domain_events=domain_events,
+                causal_dependencies=causal_dependencies,
+                orm_objs_pending_save=orm_objs_pending_save,
+                orm_objs_pending_delete=orm_objs_pending_delete,
+            )
+            try:
+                new_records = self.record_process_event(process_event)
+            except Exception:
+                if self.repository.use_cache:
+                    originator_ids = set([e.originator_id for e in domain_events])
+                    with self.repository.cache_lock:
+                        for originator_id in originator_ids:
+                            self.repository.cache.pop(originator_id, None)
+                raise
+
+        self.take_snapshots(domain_events)
+        self.publish_prompt_for_new_records(domain_events, new_records)
+        return domain_events
+
+    def get_upstream_notification_log(
+        self, upstream_name: str, pipeline_id: int
+    ) -> AbstractNotificationLog:
+        """
+        Returns the notification log of the named upstream application that
+        is processed in the given pipeline.
+        """
+        notification_log = self.readers[upstream_name].notification_log
+        if pipeline_id == self.pipeline_id:
+            return notification_log
+        if not isinstance(notification_log, RecordManagerNotificationLog):
+            raise ProgrammingError(
+                "Can't read notification log of '{}' in pipeline {}".format(
+                    upstream_name, pipeline_id
+                )
+            )
+        record_manager = notification_log.record_manager
+        if record_manager.pipeline_id != self.pipeline_id:
+            # The upstream application merges its pipelines, so
+            # the same notification log is processed in all pipelines.
+            return notification_log
+        return RecordManagerNotificationLog(
+            record_manager=record_manager.clone(
+                application_name=record_manager.application_name,
+                pipeline_id=pipeline_id,
+            ),
+            section_size=notification_log.section_size,
+        )
+
     def policy(
         self,
         repository: WrappedRepository[TAggregate, TAggregateEvent],
@@ -1,8 +1,11 @@
 import os
 import zlib
+from copy import deepcopy
 from json import JSONDecoder, JSONEncoder
+from time import perf_counter
 from typing import (
     Any,
+    Callable,
     Dict,
     Generic,
     Iterable,
@@ -14,6 +17,7 @@ from typing import (
     Type,
     Union,
 )
+from uuid import UUID
 
 from eventsourcing.application.notificationlog import (
     LocalNotificationLog,
@@ -28,7 +32,12 @@ from eventsourcing.domain.model.entity import (
     TVersionedEvent,
 )
 from eventsourcing.domain.model.events import DomainEvent, publish
-from eventsourcing.exceptions import ProgrammingError, PromptFailed
+from eventsourcing.exceptions import (
+    ProgrammingError,
+    PromptFailed,
+    RecordConflictError,
+    RepositoryKeyError,
+)
 from eventsourcing.infrastructure.base import (
     AbstractEventStore,
     AbstractRecordManager,
@@ -45,6 +54,7 @@ from eventsourcing.infrastructure.eventstore import EventStore
 from eventsourcing.infrastructure.factory import InfrastructureFactory
 from eventsourcing.infrastructure.sequenceditem import StoredEvent
 from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.utils import metrics
 from eventsourcing.utils.cipher.aes import AESCipher
 from eventsourcing.utils.random import decode_bytes
 from eventsourcing.whitehead import ActualOccasion, IterableOfEvents, T
@@ -455,31 +465,90 @@ class SimpleApplication(Pipeable, Generic[TVersionedEntity, TVersionedEvent]):
             orm_objs_pending_save=orm_objects_pending_save,
             orm_objs_pending_delete=orm_objects_pending_delete,
         )
-        new_records = self.record_process_event(process_event)
+        try:
+            new_records = self.record_process_event(process_event)
+        except RecordConflictError:
+            # Evict cached aggregates that have evolved past their recorded
+            # state, so stale state isn't given by the repository.
+            if self.repository.use_cache:
+                with self.repository.cache_lock:
+                    for aggregate in aggregates:
+                        if self.repository.cache.get(aggregate.id) is aggregate:
+                            del self.repository.cache[aggregate.id]
+            raise
         record_manager = self.event_store.record_manager
         if isinstance(record_manager, RecordManagerWithNotifications):
             # Find the head notification ID.
             notifiable_events = [e for e in new_events if e.__notifiable__]
             head_notification_id = None
+            notifications: List[Dict[str, Any]] = []
             if len(notifiable_events):
-                notification_id_name = record_manager.notification_id_name
-                notifications = []
-                for record in new_records:
-                    if not hasattr(record, notification_id_name):
-                        continue
-                    if not isinstance(getattr(record, notification_id_name), int):
-                        continue
-                    notifications.append(
-                        record_manager.create_notification_from_record(record)
-                    )
-
+                notifications = self.create_notifications_from_records(new_records)
                 if len(notifications):
                     head_notification_id = notifications[-1]["id"]
-            self.publish_prompt(head_notification_id)
+            self.publish_prompt(head_notification_id, notifications)
         if self.repository.use_cache:
             for aggregate in aggregates:
                 self.repository.put_entity_in_cache(aggregate.id, aggregate)
 
+    def execute(
+        self,
+        aggregate_id: UUID,
+        command: Callable[[TVersionedEntity], Any],
+        max_attempts: int = 3,
+    ) -> Any:
+        """
+        Calls command on the aggregate with given ID, saves the aggregate,
+        and returns the value returned by the command.
+
+        With the repository cache in use, the cached aggregate is shared,
+        so the command is called on a copy of the aggregate, and the saved
+        copy replaces the cached aggregate, so repeated commands on the same
+        aggregate don't read from the database. The aggregate is copied for
+        each attempt, but if saving the new events conflicts with events
+        recorded elsewhere, the aggregate can be fast-forwarded by only the
+        events it is missing, and the command retried, without replaying
+        all the aggregate's events.
+
+        Without the repository cache, the command is called on the aggregate
+        without copying it, and the aggregate is retrieved again from the
+        repository after a conflict.
+
+        :param aggregate_id: ID of the aggregate.
+        :param command: Function called with the aggregate.
+        :param max_attempts: Number of times the command may be tried.
+        :raises RepositoryKeyError: If the aggregate is not found.
+        :raises RecordConflictError: If the command's events conflict
+            with recorded events after the last attempt.
+        """
+        use_cache = self.repository.use_cache
+        aggregate = self.repository[aggregate_id]
+        attempts = 0
+        while True:
+            attempts += 1
+            working = deepcopy(aggregate) if use_cache else aggregate
+            result = command(working)
+            try:
+                self.save(working)
+            except RecordConflictError:
+                if attempts >= max_attempts:
+                    raise
+                if not use_cache:
+                    aggregate = self.repository[aggregate_id]
+                    continue
+                # Get only the events recorded since the aggregate's version.
+                aggregate = self.repository.fastforward(aggregate)
+                if aggregate is None:
+                    with self.repository.cache_lock:
+                        self.repository.cache.pop(aggregate_id, None)
+                    raise RepositoryKeyError(aggregate_id)
+                self.repository.put_entity_in_cache(aggregate_id, aggregate)
+            else:
+                if use_cache and working.__is_discarded__:
+                    with self.repository.cache_lock:
+                        self.repository.cache.pop(aggregate_id, None)
+                return result
+
     def record_process_event(self, process_event: ProcessEvent) -> List:
         """
         Records a process event.
@@ -500,12 +569,17 @@ class SimpleApplication(Pipeable, Generic[TVersionedEntity, TVersionedEvent]):
         # Write event records with tracking record.
         record_manager = self.event_store.record_manager
         assert isinstance(record_manager, RecordManagerWithTracking)
+        started = perf_counter() if metrics.sinks else None
         record_manager.write_records(
             records=event_records,
             tracking_kwargs=process_event.tracking_kwargs,
             orm_objs_pending_save=process_event.orm_objs_pending_save,
             orm_objs_pending_delete=process_event.orm_objs_pending_delete,
         )
+        if started is not None:
+            metrics.observe(
+                "write_seconds", perf_counter() - started, application=self.name
+            )
         return event_records
 
     def construct_event_records(
@@ -559,15 +633,49 @@ class SimpleApplication(Pipeable, Generic[TVersionedEntity, TVersionedEvent]):
 
         return event_records
 
-    def publish_prompt(self, head_notification_id=None):
+    def create_notifications_from_records(self, records: Iterable) -> List[Dict]:
+        """
+        Creates notifications from event records that have notification IDs.
+
+        Records without an integer notification ID are skipped (for example,
+        when the ID will be set by the database).
+
+        :param records: Event records that have been written.
+        :return: A list of notifications.
+        """
+        record_manager = self.event_store.record_manager
+        assert isinstance(record_manager, RecordManagerWithNotifications)
+        notification_id_name = record_manager.notification_id_name
+        notifications = []
+        for record in records:
+            if not hasattr(record, notification_id_name):
+                continue
+            if not isinstance(getattr(record, notification_id_name), int):
+                continue
+            notifications.append(record_manager.create_notification_from_record(record))
+        return notifications
+
+    def publish_prompt(
+        self,
+        head_notification_id: Optional[int] = None,
+        notifications: Optional[List[Dict]] = None,
+    ) -> None:
         """
         Publishes a "prompt to pull" (instance of
         :class:`~eventsourcing.application.simple.PromptToPull`).
 
         :param head_notification_id: Maximum notification ID of event records
             to be pulled.
+        :param notifications: Optional notifications that have just been written.
         """
-        prompt = PromptToPull(self.name, self.pipeline_id, head_notification_id)
+        # Prompt for the pipeline the new notifications were written in.
+        if self._event_store is not None:
+            pipeline_id = self._event_store.record_manager.pipeline_id
+        else:
+            pipeline_id = self.pipeline_id
+        prompt = PromptToPull(
+            self.name, pipeline_id, head_notification_id, notifications
+        )
         try:
             publish(prompt)
         except PromptFailed:
@@ -591,10 +699,55 @@ def is_prompt_to_pull(events: IterableOfEvents) -> bool:
 
 
 class PromptToPull(Prompt):
-    def __init__(self, process_name: str, pipeline_id: int, head_notification_id=None):
+    """
+    Prompts downstream process applications to pull new notifications.
+
+    Notifications that have just been written can be carried by the prompt,
+    so that they can be passed on to downstream processes without having to
+    be read from the database. They aren't pickled, so they are only
+    available in the operating system process where they were written.
+    """
+
+    notifications: Optional[List[Dict]] = None
+
+    def __init__(
+        self,
+        process_name: str,
+        pipeline_id: int,
+        head_notification_id: Optional[int] = None,
+        notifications: Optional[List[Dict]] = None,
+    ):
         self.process_name: str = process_name
         self.pipeline_id: int = pipeline_id
         self.head_notification_id = head_notification_id
+        if notifications:
+            self.notifications = notifications
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop("notifications", None)
+        return state
+
+    def combine(self, later: "PromptToPull") -> "PromptToPull":
+        """
+        Returns a prompt with the highest head notification ID
+        of this prompt and a later prompt, and the notifications
+        carried by both.
+        """
+        head_ids = [
+            i
+            for i in (self.head_notification_id, later.head_notification_id)
+            if i is not None
+        ]
+        notifications = None
+        if self.notifications is not None and later.notifications is not None:
+            notifications = self.notifications + later.notifications
+        return type(self)(
+            self.process_name,
+            self.pipeline_id,
+            max(head_ids) if head_ids else None,
+            notifications,
+        )
 
     def __eq__(self, other: object) -> bool:
         return bool(
@@ -1,7 +1,10 @@
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil, log
-from typing import Any
-from uuid import uuid5
+from threading import Lock
+from typing import Any, Optional, Tuple
+from uuid import UUID, uuid5
 
 from eventsourcing.domain.model.decorators import retry
 from eventsourcing.domain.model.entity import TimestampedVersionedEntity
@@ -49,6 +52,28 @@ class Array(object):
         event = ItemAssigned(originator_id=self.id, index=index, item=item)
         publish([event])
 
+    def assign_many(self, start, items):
+        """
+        Sets items in array, at contiguous positions from given index.
+
+        The items are assigned with one write, so either all or
+        none of the items are assigned.
+        """
+        items = list(items)
+        if not items:
+            return
+        if start < 0:
+            raise ArrayIndexError("Index is {}".format(start))
+        size = self.repo.array_size
+        stop = start + len(items)
+        if size and stop > size:
+            raise ArrayIndexError("Index is {}, but size is {}".format(stop - 1, size))
+        events = [
+            ItemAssigned(originator_id=self.id, index=index, item=item)
+            for index, item in enumerate(items, start)
+        ]
+        publish(events)
+
     def __getitem__(self, item):
         """
         Returns item at index, or items in slice.
@@ -213,16 +238,83 @@ class BigArray(Array):
     command, or an auto-incrementing database column, may
     constitute a single point of failure.
 
+    The last base array is remembered, so that finding the last
+    item doesn't involve descending from the root each time. The
+    remembered array is checked by looking for items in the next
+    base array, and is forgotten if appending an item conflicts.
+
+    Slices that span more than one base array can be read using
+    a pool of threads, so that the base arrays are read concurrently.
+    The pool of threads is shared by all instances of this class.
     """
 
+    # Number of base arrays of a slice that are read concurrently.
+    arrays_in_flight = 1
+    max_workers = 10
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = Lock()
+
     def __init__(self, array_id, repo):
         super(BigArray, self).__init__(array_id=array_id, repo=repo)
+        self._last_array: Optional[Tuple[UUID, int]] = None
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns pool of threads used to read base arrays.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers, thread_name_prefix="bigarray"
+                )
+            return cls._executor
+
+    @retry(ConcurrencyError, max_attempts=50, wait=0.01)
+    def append(self, item):
+        """Sets item in next position after the last item."""
+        try:
+            self.__setitem__(self.get_next_position(), item)
+        except ConcurrencyError:
+            self._last_array = None
+            raise
 
     def get_last_array(self):
         """
-        Returns last array in compound.
+        Returns last array in compound, and the
+        position in the compound of its first item.
+        """
+        last_array = self._last_array
+        if last_array is not None:
+            array_id, array_i = self.advance_last_array(*last_array)
+            self._last_array = (array_id, array_i)
+            return self.repo[array_id], array_i
+
+        array, array_i = self.descend_to_last_array()
+        if array is not None:
+            self._last_array = (array.id, array_i)
+        return array, array_i
 
-        :rtype: CompoundSequenceReader
+    def advance_last_array(self, array_id, array_i):
+        """
+        Returns ID and position of the last array, starting from a
+        base array that was the last array, by moving on whilst the
+        next base array has items.
+        """
+        size = self.repo.array_size
+        capacity = size ** size
+        while array_i + size < capacity:
+            next_i = array_i + size
+            next_id = self.create_array_id(next_i, next_i + size)
+            if self.repo[next_id].get_next_position() == 0:
+                break
+            array_id, array_i = next_id, next_i
+        return array_id, array_i
+
+    def descend_to_last_array(self):
+        """
+        Returns last array in compound, by descending from the
+        apex of the compound through the last item of each array.
         """
         # Get the root array (might not have been registered).
         root = self.repo[self.id]
@@ -285,7 +377,14 @@ class BigArray(Array):
         base_array = self.repo[array_id]
         return base_array[offset]
 
-    def get_slice(self, start, stop):
+    def get_slice(self, start, stop, arrays_in_flight=None):
+        """
+        Yields items from start to stop.
+
+        Up to ``arrays_in_flight`` base arrays (by default the
+        ``arrays_in_flight`` attribute of the big array) are read
+        concurrently, with the items yielded in order.
+        """
         array_len = self.repo.array_size ** self.repo.array_size
 
         if start is None:
@@ -300,19 +399,49 @@ class BigArray(Array):
 
         stop = min(stop, array_len)
 
+        arrays_in_flight = arrays_in_flight or self.arrays_in_flight
+        base_slices = self.get_base_slices(start, stop)
+        if arrays_in_flight == 1 or stop - start <= self.repo.array_size:
+            for array_id, substart, substop in base_slices:
+                for item in self.repo[array_id][substart:substop]:
+                    yield item
+            return
+
+        # Read ahead up to arrays_in_flight base arrays at a time.
+        executor = self.get_executor()
+        futures = deque()
+        try:
+            for array_id, substart, substop in base_slices:
+                futures.append(
+                    executor.submit(self.get_base_slice, array_id, substart, substop)
+                )
+                if len(futures) == arrays_in_flight:
+                    for item in futures.popleft().result():
+                        yield item
+            while futures:
+                for item in futures.popleft().result():
+                    yield item
+        finally:
+            # Cancel reading base arrays that won't be used.
+            for future in futures:
+                future.cancel()
+
+    def get_base_slices(self, start, stop):
+        """
+        Yields ID of each base array that contains items from start
+        to stop, with the start and stop of the items in the base array.
+        """
         size = self.repo.array_size
         while start < stop:
             n = start // size
             i = n * size
             j = i + size
-            substart = start - i
-            substop = stop - i
-            array_id = self.create_array_id(i, j)
-            sequence = self.repo[array_id]
-            for item in sequence[substart:substop]:
-                yield item
+            yield self.create_array_id(i, j), start - i, stop - i
             start = j
 
+    def get_base_slice(self, array_id, substart, substop):
+        return self.repo[array_id][substart:substop]
+
     def __setitem__(self, position, item):
         # Calculate start and stop position
         # of the containing base array.
@@ -326,9 +455,64 @@ class BigArray(Array):
         index = position - start
         array[index] = item
 
+        self.register_base_array(array_id, start, stop, position)
+
+    def extend(self, items):
+        """
+        Appends items after the last item.
+
+        Unlike append(), conflicts with other writers aren't retried,
+        because the items of earlier base arrays may have been assigned.
+
+        :return: Position of the first item.
+        """
+        start = self.get_next_position()
+        try:
+            self.assign_many(start, items)
+        except ConcurrencyError:
+            self._last_array = None
+            raise
+        return start
+
+    def assign_many(self, start, items):
+        """
+        Sets items at contiguous positions from given position.
+
+        The items in each base array are assigned with one write,
+        and each base array is registered in its parent arrays once.
+        """
+        items = list(items)
+        if not items:
+            return
+        size = self.repo.array_size
+
+        # Check the items fit in the compound.
+        self.calc_required_height(start + len(items) - 1, size)
+
+        position = start
+        offset = 0
+        while offset < len(items):
+            # Assign a run of items in a base array.
+            array_start = (position // size) * size
+            array_stop = array_start + size
+            run = items[offset : offset + array_stop - position]
+            array_id = self.create_array_id(array_start, array_stop)
+            self.repo[array_id].assign_many(position - array_start, run)
+
+            # Register the base array up to the height of its last item.
+            position += len(run)
+            offset += len(run)
+            self.register_base_array(array_id, array_start, array_stop, position - 1)
+
+    def register_base_array(self, array_id, start, stop, position):
+        """
+        Sets ID of base array in containing arrays, up to the
+        height of the compound that contains given position.
+        """
         # Calculate the height of the apex of
         # the compound containing given position
         # (zero-based index in big array).
+        size = self.repo.array_size
         required_height = self.calc_required_height(position, size)
 
         # Set array IDs in containing arrays,
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Tuple
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from eventsourcing.domain.model.aggregate import BaseAggregateRoot, TAggregate
+
+
+class DeadLetter(NamedTuple):
+    """
+    Event notification that a process application failed to process.
+    """
+
+    upstream_name: str
+    pipeline_id: int
+    notification_id: int
+    event_topic: str
+    error: str
+
+
+class DeadLetters(BaseAggregateRoot):
+    """
+    Event notifications that a process application failed to process,
+    which have been parked so that later notifications can be processed.
+
+    The events of this aggregate are not notifiable, so that they don't
+    appear in the notification log of the process application, and aren't
+    processed by downstream applications.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super(DeadLetters, self).__init__(**kwargs)
+        self._letters: Dict[Tuple[str, int, int], DeadLetter] = OrderedDict()
+
+    class Event(BaseAggregateRoot.Event[TAggregate]):
+        __notifiable__ = False
+
+    class Created(Event[TAggregate], BaseAggregateRoot.Created[TAggregate]):
+        pass
+
+    @property
+    def letters(self) -> List[DeadLetter]:
+        return list(self._letters.values())
+
+    def get(
+        self, upstream_name: str, pipeline_id: int, notification_id: int
+    ) -> DeadLetter:
+        """
+        Returns dead letter for given notification.
+
+        :raises KeyError: If the notification isn't a dead letter.
+        """
+        return self._letters[(upstream_name, pipeline_id, notification_id)]
+
+    def park(
+        self,
+        upstream_name: str,
+        pipeline_id: int,
+        notification_id: int,
+        event_topic: str,
+        error: str,
+    ) -> None:
+        self.__trigger_event__(
+            self.Parked,
+            upstream_name=upstream_name,
+            pipeline_id=pipeline_id,
+            notification_id=notification_id,
+            event_topic=event_topic,
+            error=error,
+        )
+
+    class Parked(Event):
+        def mutate(self, obj: "DeadLetters") -> None:
+            letter = DeadLetter(
+                upstream_name=self.upstream_name,
+                pipeline_id=self.pipeline_id,
+                notification_id=self.notification_id,
+                event_topic=self.event_topic,
+                error=self.error,
+            )
+            key = (letter.upstream_name, letter.pipeline_id, letter.notification_id)
+            obj._letters[key] = letter
+
+    def remove(
+        self, upstream_name: str, pipeline_id: int, notification_id: int
+    ) -> None:
+        self.__trigger_event__(
+            self.Removed,
+            upstream_name=upstream_name,
+            pipeline_id=pipeline_id,
+            notification_id=notification_id,
+        )
+
+    class Removed(Event):
+        def mutate(self, obj: "DeadLetters") -> None:
+            key = (self.upstream_name, self.pipeline_id, self.notification_id)
+            obj._letters.pop(key, None)
+
+
+def dead_letters_id(application_name: str) -> UUID:
+    """
+    Returns ID of the dead letters aggregate of the named application.
+    """
+    return uuid5(NAMESPACE_URL, "/dead_letters/{}".format(application_name))
@@ -175,6 +175,8 @@ def retry(
     wait: float = 0,
     stall: float = 0,
     verbose: bool = False,
+    backoff: float = 1,
+    max_wait: Optional[float] = None,
 ) -> Callable:
     """
     Retry decorator.
@@ -184,6 +186,8 @@ def retry(
     :param wait: Amount of time to wait before retrying after an exception.
     :param stall: Amount of time to wait before the first attempt.
     :param verbose: If True, prints a message to STDOUT when retries occur.
+    :param backoff: Factor by which the wait increases after each attempt.
+    :param max_wait: Maximum amount of time to wait before retrying.
     :return: Returns the value returned by decorated function.
     """
 
@@ -204,7 +208,10 @@ def retry(
                         print("Error trying ", func, args, kwargs, e)
                     attempts += 1
                     if max_attempts is None or attempts < max_attempts:
-                        sleep(wait * (1 + 0.1 * (random.random() - 0.5)))
+                        delay = wait * backoff ** (attempts - 1)
+                        if max_wait is not None:
+                            delay = min(delay, max_wait)
+                        sleep(delay * (1 + 0.1 * (random.random() - 0.5)))
                         if verbose:
                             print("Retrying {}".format(func))
                     else:
@@ -236,6 +243,10 @@ def retry(
             raise TypeError("'max_attempts' must be an int: {}".format(max_attempts))
         if not isinstance(wait, (float, int)):
             raise TypeError("'wait' must be a float: {}".format(max_attempts))
+        if not isinstance(backoff, (float, int)) or backoff < 1:
+            raise TypeError(
+                "'backoff' must be a number not less than 1: {}".format(backoff)
+            )
         return _retry
 
 
@@ -1,6 +1,20 @@
 from abc import abstractmethod
 from decimal import Decimal
-from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid1
 
 from eventsourcing.domain.model.versioning import Upcastable
@@ -145,6 +159,105 @@ class DomainEvent(Upcastable, ActualOccasion, Generic[TEntity]):
         return hash_object(cls.__json_encoder_v1__, obj)
 
 
+class SlottedDomainEvent(Upcastable, ActualOccasion, Generic[TEntity]):
+    """
+    Base class for domain model events with attribute
+    values held in slots rather than an instance dict.
+
+    Slotted events use much less memory than dict-based events,
+    which matters when many events are held in memory. Subclasses
+    must declare the names of their attributes with '__slots__'.
+
+    Like DomainEvent, instances are read-only, comparable for
+    equality, and are hashed using a cryptographic hash of the
+    state of the event.
+    """
+
+    __slots__ = ()
+    __slot_names__: Tuple[str, ...] = ()
+    __json_encoder_v2__ = DomainEvent.__json_encoder_v2__
+    __notifiable__ = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        # Collect the names of all the slots declared on the class.
+        slot_names: List[str] = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                if name not in slot_names:
+                    slot_names.append(name)
+        cls.__slot_names__ = tuple(slot_names)
+
+    def __init__(self, **kwargs: Any):
+        """
+        Initialises event attribute values directly from constructor kwargs.
+        """
+        for key, value in kwargs.items():
+            object.__setattr__(self, key, value)
+
+    @property  # type: ignore
+    def __dict__(self) -> Dict[str, Any]:  # type: ignore
+        """
+        Returns a new dict with the attribute values of the event.
+
+        Since recorded states are upcast when events are reconstructed,
+        the class version of an event is the current class version.
+        """
+        state = {}
+        for name in self.__slot_names__:
+            try:
+                state[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if type(self).__class_version__ > 0:
+            state["__class_version__"] = type(self).__class_version__
+        return state
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.__dict__
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for key, value in state.items():
+            if key != "__class_version__":
+                object.__setattr__(self, key, value)
+
+    def __repr__(self) -> str:
+        return DomainEvent.__repr__(self)  # type: ignore
+
+    def __mutate__(self, obj: Optional[TEntity]) -> Optional[TEntity]:
+        if obj is not None:
+            self.mutate(obj)
+        return obj
+
+    def mutate(self, obj: TEntity) -> None:
+        """
+        Updates ("mutates") given 'obj'.
+        """
+
+    def __setattr__(self, key: Any, value: Any) -> None:
+        """
+        Inhibits event attributes from being updated by assignment.
+        """
+        raise AttributeError("DomainEvent attributes are read-only")
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, SlottedDomainEvent)
+            and self.__hash__() == other.__hash__()
+        )
+
+    def __ne__(self, other: object) -> bool:
+        return not (self == other)
+
+    def __hash__(self) -> int:
+        attrs = self.__dict__
+        attrs["__event_topic__"] = get_topic(type(self))
+        return hash(hash_object(self.__json_encoder_v2__, attrs))
+
+
 class EventWithHash(DomainEvent[TEntity]):
     """
     Base class for domain events with a cryptographic event hash.
@@ -329,11 +442,101 @@ class LoggedEvent(DomainEvent[TEntity]):
 
 Predicate = Callable[[Sequence[TEvent]], bool]
 Handler = Callable[[Sequence[TEvent]], None]
+EventType = Union[type, Tuple[type, ...]]
+
+
+class Subscription(NamedTuple):
+    handler: Handler
+    predicate: Optional[Predicate]
+    event_type: Optional[EventType]
+
 
-_subscriptions: List[Tuple[Optional[Predicate], Handler]] = []
+class Subscriptions(object):
+    """
+    Immutable collection of subscriptions, indexed by event type.
+
+    Subscriptions with an event type are found by looking up the
+    classes in the MRO of the published events, and the subscriptions
+    that need to be considered for each combination of published event
+    classes are cached. Subscriptions without an event type are
+    considered whenever events are published.
+    """
 
+    def __init__(self, subscriptions: Sequence[Subscription] = ()):
+        # Dicts are ordered, and have fast membership checks.
+        self.subscriptions: Dict[Subscription, None] = dict.fromkeys(subscriptions)
+        self.by_type: Dict[type, List[Subscription]] = {}
+        for subscription in self.subscriptions:
+            event_type = subscription.event_type
+            if event_type is not None:
+                if isinstance(event_type, type):
+                    event_type = (event_type,)
+                for cls in event_type:
+                    self.by_type.setdefault(cls, []).append(subscription)
+        self.dispatch_cache: Dict[Hashable, Tuple[Subscription, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def __contains__(self, subscription: Subscription) -> bool:
+        return subscription in self.subscriptions
+
+    def __repr__(self) -> str:
+        return repr(list(self.subscriptions))
 
-def subscribe(handler: Handler, predicate: Optional[Predicate] = None) -> None:
+    def add(self, subscription: Subscription) -> "Subscriptions":
+        return Subscriptions(list(self.subscriptions) + [subscription])
+
+    def remove(self, subscription: Subscription) -> "Subscriptions":
+        return Subscriptions([s for s in self.subscriptions if s != subscription])
+
+    def get_dispatch_key(self, events: Sequence[TEvent]) -> Hashable:
+        if isinstance(events, (list, tuple)):
+            return frozenset([type(e) for e in events])
+        else:
+            return type(events)
+
+    def select(self, events: Sequence[TEvent]) -> Tuple[Subscription, ...]:
+        """
+        Returns subscriptions to be considered for given events,
+        in the order they were subscribed.
+        """
+        key = self.get_dispatch_key(events)
+        try:
+            return self.dispatch_cache[key]
+        except KeyError:
+            selected = self.dispatch_cache[key] = self._select(key)
+            return selected
+
+    def _select(self, key: Hashable) -> Tuple[Subscription, ...]:
+        # Subscriptions with an event type match a list or tuple
+        # of events if they match all of the events, and match
+        # an object published on its own if they match the object.
+        if isinstance(key, frozenset):
+            classes = list(key)
+        else:
+            classes = [key]
+        matched: Optional[Set[Subscription]] = None
+        for cls in classes:
+            matched_cls: Set[Subscription] = set()
+            for base in cls.__mro__:
+                matched_cls.update(self.by_type.get(base, ()))
+            matched = matched_cls if matched is None else matched & matched_cls
+        matched = matched or set()
+        return tuple(
+            s for s in self.subscriptions if s.event_type is None or s in matched
+        )
+
+
+_subscriptions = Subscriptions()
+_subscriptions_lock = Lock()
+
+
+def subscribe(
+    handler: Handler,
+    predicate: Optional[Predicate] = None,
+    event_type: Optional[EventType] = None,
+) -> None:
     """
     Adds 'handler' to list of event handlers
     to be called if 'predicate' is satisfied.
@@ -341,23 +544,40 @@ def subscribe(handler: Handler, predicate: Optional[Predicate] = None) -> None:
     If predicate is None, the handler will
     be called whenever an event is published.
 
+    If event_type is given, the handler will only be called
+    when the published events are all instances of that type.
+    Handlers subscribed with an event type are found without
+    calling a predicate for every subscription.
+
     :param callable handler: Will be called when an event is published.
     :param callable predicate: Conditions whether the handler will be called.
+    :param event_type: Class, or tuple of classes, of events to be handled.
     """
-    if (predicate, handler) not in _subscriptions:
-        _subscriptions.append((predicate, handler))
-
-
-def unsubscribe(handler: Handler, predicate: Optional[Predicate] = None) -> None:
+    global _subscriptions
+    subscription = Subscription(handler, predicate, event_type)
+    with _subscriptions_lock:
+        if subscription not in _subscriptions:
+            _subscriptions = _subscriptions.add(subscription)
+
+
+def unsubscribe(
+    handler: Handler,
+    predicate: Optional[Predicate] = None,
+    event_type: Optional[EventType] = None,
+) -> None:
     """
     Removes 'handler' from list of event handlers
     to be called if 'predicate' is satisfied.
 
     :param callable handler: Previously subscribed handler.
     :param callable predicate: Previously subscribed predicate.
+    :param event_type: Previously subscribed event type.
     """
-    if (predicate, handler) in _subscriptions:
-        _subscriptions.remove((predicate, handler))
+    global _subscriptions
+    subscription = Subscription(handler, predicate, event_type)
+    with _subscriptions_lock:
+        if subscription in _subscriptions:
+            _subscriptions = _subscriptions.remove(subscription)
 
 
 def publish(events: Sequence[TEvent]) -> None:
@@ -373,7 +593,7 @@ def publish(events: Sequence[TEvent]) -> None:
     # A cache of conditions means predicates aren't evaluated
     # more than once for each event.
     cache: Dict[Predicate, bool] = {}
-    for predicate, handler in _subscriptions[:]:
+    for handler, predicate, _ in _subscriptions.select(events):
         if predicate is None:
             handler(events)
         else:
@@ -407,7 +627,9 @@ def clear_event_handlers() -> None:
     """
     Removes all previously subscribed event handlers.
     """
-    _subscriptions.clear()
+    global _subscriptions
+    with _subscriptions_lock:
+        _subscriptions = Subscriptions()
 
 
 def create_timesequenced_event_id() -> UUID:
@@ -13,7 +13,7 @@ from eventsourcing.domain.model.events import (
     publish,
 )
 from eventsourcing.domain.model.repository import AbstractEntityRepository
-from eventsourcing.exceptions import RepositoryKeyError
+from eventsourcing.exceptions import ConcurrencyError, RepositoryKeyError
 from eventsourcing.utils.times import (
     datetime_from_timestamp,
     decimaltimestamp,
@@ -50,10 +50,18 @@ class Timebucketedlog(TimestampedVersionedEntity):
     class BucketSizeChanged(Event, TimestampedVersionedEntity.AttributeChanged):
         pass
 
-    def __init__(self, name: UUID, bucket_size: Optional[str] = None, **kwargs: Any):
+    def __init__(
+        self,
+        name: UUID,
+        bucket_size: Optional[str] = None,
+        is_indexed: bool = False,
+        **kwargs: Any
+    ):
         super(Timebucketedlog, self).__init__(**kwargs)
         self._name = name
         self._bucket_size = bucket_size
+        self._is_indexed = is_indexed
+        self._last_indexed_bucket_id: Optional[UUID] = None
 
     @property
     def name(self) -> UUID:
@@ -68,11 +76,41 @@ class Timebucketedlog(TimestampedVersionedEntity):
         assert self._bucket_size
         return self._bucket_size
 
+    @property
+    def is_indexed(self) -> bool:
+        """
+        Whether the buckets that have messages are recorded in an index.
+
+        Logs started before buckets were indexed aren't indexed.
+        """
+        return self._is_indexed
+
     def log_message(self, message: str) -> "MessageLogged":
         assert isinstance(message, str)
-        bucket_id = make_timebucket_id(self.name, decimaltimestamp(), self.bucket_size)
-        event = MessageLogged(originator_id=bucket_id, message=message)
-        publish([event])
+        timestamp = decimaltimestamp()
+        bucket_id = make_timebucket_id(self.name, timestamp, self.bucket_size)
+        event = MessageLogged(
+            originator_id=bucket_id, message=message, timestamp=timestamp
+        )
+        if self._is_indexed and bucket_id != self._last_indexed_bucket_id:
+            # Index the bucket, when the first message is logged in it.
+            # The bucket is indexed at the time it starts, so that the
+            # index conflicts if the bucket has already been indexed,
+            # for example by another instance of the log.
+            bucket_started = TimebucketStarted(
+                originator_id=make_timebucket_index_id(self.name),
+                bucket_id=bucket_id,
+                timestamp=decimaltimestamp(
+                    timestamp_from_datetime(bucket_starts(timestamp, self.bucket_size))
+                ),
+            )
+            try:
+                publish([bucket_started, event])
+            except ConcurrencyError:
+                publish([event])
+            self._last_indexed_bucket_id = bucket_id
+        else:
+            publish([event])
         return event
 
 
@@ -101,6 +139,7 @@ def start_new_timebucketedlog(
         originator_id=name,
         name=name,
         bucket_size=bucket_size,
+        is_indexed=True,
         originator_topic=get_topic(Timebucketedlog),
     )
     entity = event.__mutate__(None)
@@ -110,9 +149,11 @@ def start_new_timebucketedlog(
 
 
 class MessageLogged(EventWithTimestamp, EventWithOriginatorID, LoggedEvent):
-    def __init__(self, message: str, originator_id: UUID):
+    def __init__(
+        self, message: str, originator_id: UUID, timestamp: Optional[Decimal] = None
+    ):
         super(MessageLogged, self).__init__(
-            originator_id=originator_id, message=message
+            originator_id=originator_id, message=message, timestamp=timestamp
         )
 
     @property
@@ -120,6 +161,26 @@ class MessageLogged(EventWithTimestamp, EventWithOriginatorID, LoggedEvent):
         return self.__dict__["message"]
 
 
+class TimebucketStarted(EventWithTimestamp, EventWithOriginatorID, LoggedEvent):
+    """
+    Happens when the first message is logged in a time bucket.
+
+    These events are the index of the buckets of a log that have messages,
+    so that the buckets without messages don't need to be read.
+    """
+
+    def __init__(
+        self, bucket_id: UUID, originator_id: UUID, timestamp: Optional[Decimal] = None
+    ):
+        super(TimebucketStarted, self).__init__(
+            originator_id=originator_id, bucket_id=bucket_id, timestamp=timestamp
+        )
+
+    @property
+    def bucket_id(self) -> UUID:
+        return self.__dict__["bucket_id"]
+
+
 def make_timebucket_id(
     log_id: UUID, timestamp: Union[Decimal, float], bucket_size: str
 ) -> UUID:
@@ -147,6 +208,10 @@ def make_timebucket_id(
     return uuid5(Namespace_Timebuckets, log_id.hex + "_" + boundary)
 
 
+def make_timebucket_index_id(log_id: UUID) -> UUID:
+    return uuid5(Namespace_Timebuckets, log_id.hex + "_index")
+
+
 def next_bucket_starts(timestamp: float, bucket_size: str) -> float:
     starts = bucket_starts(timestamp, bucket_size)
     duration = bucket_duration(bucket_size)
@@ -1,7 +1,14 @@
-from typing import Dict
+from typing import Any, Callable, Dict, Tuple
 
 from eventsourcing.whitehead import Event
 
+Upcaster = Callable[[Dict], Dict]
+
+# Compiled upcasters, keyed by class, recorded version, current
+# version, and upcast function (so that redefining the class version
+# or the upcast method causes a new upcaster to be compiled).
+_upcasters: Dict[Tuple[type, int, int, Any], Upcaster] = {}
+
 
 class Upcastable(Event):
     """
@@ -29,6 +36,7 @@ class Upcastable(Event):
     Ward Cunningham
     """
 
+    __slots__ = ()
     __class_version__ = 0
 
     def __init__(self):
@@ -43,11 +51,35 @@ class Upcastable(Event):
         state was recorded, to be compatible with current version of the class.
         """
         class_version = obj_state.get("__class_version__", 0)
-        while class_version < cls.__class_version__:
-            obj_state = cls.__upcast__(obj_state, class_version)
-            class_version += 1
-            obj_state["__class_version__"] = class_version
-        return obj_state
+        if class_version >= cls.__class_version__:
+            # Recorded state is already current.
+            return obj_state
+        return cls.__get_upcaster__(class_version)(obj_state)
+
+    @classmethod
+    def __get_upcaster__(cls, class_version: int) -> Upcaster:
+        """
+        Returns a function that upcasts object state from the given
+        version to the current version of the class.
+
+        Upcasters are compiled once for each class and recorded version,
+        and then reused, so that the chain of upcast steps isn't worked
+        out again each time an object is reconstructed.
+        """
+        upcast = cls.__upcast__
+        current_version = cls.__class_version__
+        key = (
+            cls,
+            class_version,
+            current_version,
+            getattr(upcast, "__func__", upcast),
+        )
+        try:
+            return _upcasters[key]
+        except KeyError:
+            upcaster = compile_upcaster(upcast, class_version, current_version)
+            _upcasters[key] = upcaster
+            return upcaster
 
     @classmethod
     def __upcast__(cls, obj_state: Dict, class_version: int) -> Dict:
@@ -121,3 +153,26 @@ class Upcastable(Event):
         the state of old versions of the event).
         """
         raise NotImplementedError(cls)
+
+
+def compile_upcaster(
+    upcast: Callable[[Dict, int], Dict], from_version: int, to_version: int
+) -> Upcaster:
+    """
+    Composes the steps of upcasting object state from one version to
+    another into a single function.
+
+    :param upcast: Method that upcasts state from a version to the next.
+    :param from_version: Version of the class when the state was recorded.
+    :param to_version: Current version of the class.
+    :return: Function that upcasts state through all the intervening versions.
+    """
+    class_versions = tuple(range(from_version, to_version))
+
+    def upcaster(obj_state: Dict) -> Dict:
+        for class_version in class_versions:
+            obj_state = upcast(obj_state, class_version)
+            obj_state["__class_version__"] = class_version + 1
+        return obj_state
+
+    return upcaster
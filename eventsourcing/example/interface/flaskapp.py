@@ -1,6 +1,6 @@
 import os
 
-from flask import Flask
+from flask import Flask, Response
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy_utils.types.uuid import UUIDType
 
@@ -9,6 +9,7 @@ from eventsourcing.example.application import (
     init_example_application,
 )
 from eventsourcing.infrastructure.sqlalchemy.manager import SQLAlchemyRecordManager
+from eventsourcing.utils import metrics
 
 # Read DB URI from environment.
 uri = os.environ.get("DB_URI", "sqlite:///:memory:")
@@ -22,6 +23,10 @@ application.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 # Define database connection.
 db = SQLAlchemy(application)
 
+# Aggregate metrics in memory, so they can be scraped.
+in_memory_metrics = metrics.InMemoryMetrics()
+metrics.add_sink(in_memory_metrics)
+
 
 # Define database tables.
 class IntegerSequencedItem(db.Model):
@@ -53,6 +58,14 @@ def hello():
     return "<h1 style='color:blue'>{}</h1>".format(entity.foo)
 
 
+@application.route("/metrics")
+def prometheus_metrics():
+    return Response(
+        metrics.prometheus_text(in_memory_metrics),
+        content_type="text/plain; version=0.0.4",
+    )
+
+
 # Run directly, with uWSGI, or otherwise as a WSGI application.
 #
 # uwsgi -H PATH_TO_VIRTUALENV --master --processes 4 --threads 2 --wsgi-file PATH_TO_THIS_FILE --http :5001
@@ -28,6 +28,7 @@ class AxonRecordManager(RecordManagerWithNotifications):
     can_lt_lte_get_records = False
     can_list_sequence_ids = False
     can_delete_records = False
+    can_update_records = False
 
     def __init__(self, axon_client: AxonClient, *args: Any, **kwargs: Any):
         super(AxonRecordManager, self).__init__(*args, **kwargs)
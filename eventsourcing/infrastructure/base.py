@@ -36,6 +36,7 @@ class AbstractRecordManager(ABC):
     can_lt_lte_get_records = True
     can_list_sequence_ids = True
     can_delete_records = True
+    can_update_records = True
 
     def __init__(self, **kwargs: Any):
         """
@@ -117,6 +118,15 @@ class AbstractRecordManager(ABC):
         Removes permanently given record from the table.
         """
 
+    def update_record_state(self, record: Any, state: bytes) -> None:
+        """
+        Overwrites the state of given record in the table.
+
+        Only intended for offline migrations, such as
+        upcasting stored events to current class versions.
+        """
+        raise NotImplementedError(type(self))
+
 
 TRecordManager = TypeVar("TRecordManager", bound=AbstractRecordManager)
 
@@ -353,9 +363,11 @@ class RecordManagerWithTracking(RecordManagerWithNotifications):
         return map(self.to_record, sequenced_items)
 
     @abstractmethod
-    def get_max_tracking_record_id(self, upstream_application_name: str) -> int:
+    def get_max_tracking_record_id(
+        self, upstream_application_name: str, pipeline_id: Optional[int] = None
+    ) -> int:
         """Return maximum tracking record ID for notification from upstream
-        application in pipeline."""
+        application in pipeline (defaults to this record manager's pipeline)."""
 
     @abstractmethod
     def has_tracking_record(
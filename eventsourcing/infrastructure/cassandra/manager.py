@@ -117,5 +117,12 @@ class CassandraRecordManager(BaseRecordManager):
         except InvalidRequest as e:
             raise ProgrammingError(e)
 
+    def update_record_state(self, record, state):
+        assert isinstance(record, self.record_class), type(record)
+        try:
+            record.update(**{self.field_names.state: state})
+        except InvalidRequest as e:
+            raise ProgrammingError(e)
+
     def filter(self, **kwargs):
         return self.record_class.objects.filter(**kwargs)
@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+from eventsourcing.infrastructure.base import RecordManagerWithNotifications
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.utils.compressor import CompressionDictionary, DictionaryCompressor
+
+
+def train_compressor(
+    compressor: DictionaryCompressor,
+    record_manager: RecordManagerWithNotifications,
+    event_mapper: SequencedItemMapper,
+    sample_size: int = 1000,
+    min_samples: int = 10,
+) -> List[CompressionDictionary]:
+    """
+    Trains dictionaries of the compressor from a sample of stored events.
+
+    The sample is the last ``sample_size`` notifications in the record
+    manager. A new dictionary is trained for each topic that has at least
+    ``min_samples`` events in the sample. States of the sampled events are
+    decoded by the event mapper, and so can be compressed and encrypted.
+
+    The new dictionaries aren't used to compress states until they have
+    been kept, and then added to the compressor with ``add_dictionary()``.
+
+    :return: The new dictionaries, which need to be kept.
+    """
+    max_notification_id = record_manager.get_max_notification_id()
+    records = record_manager.get_notification_records(
+        start=max(0, max_notification_id - sample_size), stop=max_notification_id
+    )
+    field_names = record_manager.field_names
+    samples: Dict[str, List[bytes]] = {}
+    for record in records:
+        topic = getattr(record, field_names.topic)
+        state = getattr(record, field_names.state)
+        _, event_attrs = event_mapper.get_event_class_and_attrs(topic, state)
+        samples.setdefault(topic, []).append(event_mapper.json_dumps(event_attrs))
+
+    return [
+        compressor.train(topic, topic_samples)
+        for topic, topic_samples in sorted(samples.items())
+        if len(topic_samples) >= min_samples
+    ]
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Iterable, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 import django.db
@@ -15,6 +15,25 @@ from eventsourcing.infrastructure.base import (
 class DjangoRecordManager(SQLRecordManager):
     _where_application_name_tmpl = " WHERE application_name = %s AND pipeline_id = %s"
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super(DjangoRecordManager, self).__init__(*args, **kwargs)
+        self._db_prep_funcs: Optional[List[Tuple[str, Callable]]] = None
+
+    @property
+    def db_prep_funcs(self) -> List[Tuple[str, Callable]]:
+        """
+        Functions that prepare the values of the record fields for the database.
+
+        The fields are looked up once, rather than for each value of each record.
+        """
+        if self._db_prep_funcs is None:
+            meta = self.record_class._meta  # type: ignore
+            self._db_prep_funcs = [
+                (col_name, meta.get_field(col_name).get_db_prep_value)
+                for col_name in self.field_names
+            ]
+        return self._db_prep_funcs
+
     def write_records(
         self,
         records: Iterable[Any],
@@ -74,27 +93,27 @@ class DjangoRecordManager(SQLRecordManager):
 
         if self.contiguous_record_ids:
             all_event_record_params = []
+            db_prep_funcs = self.db_prep_funcs
+            has_application_name = hasattr(self.record_class, "application_name")
+            has_pipeline_id = hasattr(self.record_class, "pipeline_id")
+            has_notification_id = bool(self.notification_id_name) and hasattr(
+                self.record_class, self.notification_id_name
+            )
             for record in records:
-                # Get values from record obj.
+                # Get values from record obj, and prepare them for database.
                 # List of params, because dict doesn't work with Django
                 # and SQLite.
-                params = []
-
-                for col_name in self.field_names:
-                    col_value = getattr(record, col_name)
-                    meta = self.record_class._meta  # type: ignore
-                    col_type = meta.get_field(col_name)
-
-                    # Prepare value for database.
-                    param = col_type.get_db_prep_value(col_value, connection)
-                    params.append(param)
+                params = [
+                    db_prep_value(getattr(record, col_name), connection)
+                    for col_name, db_prep_value in db_prep_funcs
+                ]
 
                 # Notification logs fields, to be inserted with event
                 # fields.
                 index_of_pipeline_id_param = None
-                if hasattr(self.record_class, "application_name"):
+                if has_application_name:
                     params.append(self.application_name)
-                if hasattr(self.record_class, "pipeline_id"):
+                if has_pipeline_id:
                     params.append(self.pipeline_id)
                     index_of_pipeline_id_param = len(params) - 1
                 if hasattr(record, "causal_dependencies"):
@@ -102,12 +121,12 @@ class DjangoRecordManager(SQLRecordManager):
 
                 if use_insert_select_max_statement:
                     # Where clause fields.
-                    if hasattr(self.record_class, "application_name"):
+                    if has_application_name:
                         params.append(self.application_name)
-                    if hasattr(self.record_class, "pipeline_id"):
+                    if has_pipeline_id:
                         params.append(self.pipeline_id)
                 elif self.notification_id_name:
-                    if hasattr(self.record_class, self.notification_id_name):
+                    if has_notification_id:
                         notification_id = getattr(record, self.notification_id_name)
                         if notification_id == EVENT_NOT_NOTIFIABLE:
                             notification_id = None
@@ -138,19 +157,27 @@ class DjangoRecordManager(SQLRecordManager):
                         cursor.execute(self.insert_tracking_record, tracking_params)
 
                     if all_event_record_params is not None:
-                        for event_record_params in all_event_record_params:
-                            # Use cursor to execute event insert statement.
-                            cursor.execute(event_insert_statement, event_record_params)
+                        # Use cursor to execute event insert statement, once
+                        # for all the records. The "insert select max" statement
+                        # is executed for each record in turn, so each record
+                        # gets the next notification ID.
+                        if len(all_event_record_params) == 1:
+                            cursor.execute(
+                                event_insert_statement, all_event_record_params[0]
+                            )
+                        elif all_event_record_params:
+                            cursor.executemany(
+                                event_insert_statement, all_event_record_params
+                            )
 
                     else:
                         # This can only work for simple models, without application_name
                         # and pipeline_id, because it relies on the auto-incrementing
                         # ID.
-                        # Todo: If it's faster, change to use an "insert_values" raw
-                        #  query.
-                        # Save record objects.
-                        for record in records:
-                            record.save()
+                        # Save record objects, with one statement.
+                        self.record_class.objects.bulk_create(  # type: ignore
+                            records
+                        )
 
                     # Call 'save()' on each of the ORM objects pending save.
                     if orm_objs_pending_save:
@@ -275,6 +302,13 @@ class DjangoRecordManager(SQLRecordManager):
         """
         record.delete()
 
+    def update_record_state(self, record: Any, state: bytes) -> None:
+        """
+        Overwrites the state of given record in the table.
+        """
+        setattr(record, self.field_names.state, state)
+        record.save(update_fields=[self.field_names.state])
+
     def get_max_notification_id(self) -> int:
         assert self.notification_id_name
         try:
@@ -288,16 +322,20 @@ class DjangoRecordManager(SQLRecordManager):
         except self.record_class.DoesNotExist:
             return 0
 
-    def get_max_tracking_record_id(self, upstream_application_name: str) -> int:
+    def get_max_tracking_record_id(
+        self, upstream_application_name: str, pipeline_id: Optional[int] = None
+    ) -> int:
         notification_id = 0
         assert self.tracking_record_class is not None
+        if pipeline_id is None:
+            pipeline_id = self.pipeline_id
         try:
             objects = self.tracking_record_class.objects  # type: ignore
             objects = objects.filter(application_name=self.application_name)
             objects = objects.filter(
                 upstream_application_name=upstream_application_name
             )
-            objects = objects.filter(pipeline_id=self.pipeline_id)
+            objects = objects.filter(pipeline_id=pipeline_id)
             notification_id = objects.latest("notification_id").notification_id
         except self.tracking_record_class.DoesNotExist:  # type: ignore
             pass
@@ -1,14 +1,16 @@
+from copy import deepcopy
 from functools import reduce
 from threading import Lock
 from typing import Any, Callable, Dict, Iterable, Optional, Type
 from uuid import UUID
 
 from eventsourcing.domain.model.entity import TVersionedEntity, TVersionedEvent
-from eventsourcing.domain.model.events import AbstractSnapshot
+from eventsourcing.domain.model.events import AbstractSnapshot, DiscardedEvent
 from eventsourcing.domain.model.repository import AbstractEntityRepository
 from eventsourcing.exceptions import RepositoryKeyError
 from eventsourcing.infrastructure.base import AbstractEventStore, AbstractRecordManager
 from eventsourcing.infrastructure.snapshotting import AbstractSnapshotStrategy
+from eventsourcing.utils import tracing
 from eventsourcing.whitehead import SEntity
 
 
@@ -76,7 +78,35 @@ class EventSourcedRepository(
         """
         Returns a boolean value according to whether entity with given ID exists.
         """
-        return self.get_entity(entity_id) is not None
+        return self.get_version(entity_id) is not None
+
+    def get_version(self, entity_id: UUID) -> Optional[int]:
+        """
+        Returns the current version of entity with given ID.
+
+        Only the most recent event of the entity is retrieved, so the
+        entity's events don't need to be replayed. Returns None if entity
+        not found, or if the most recent event discarded the entity.
+        """
+        if tracing.tracer is not None:
+            with tracing.tracer.span(
+                "repository.get_version", entity_id=str(entity_id)
+            ) as span:
+                version = self._get_version(entity_id)
+                span.set(version=version)
+                return version
+        return self._get_version(entity_id)
+
+    def _get_version(self, entity_id: UUID) -> Optional[int]:
+        if self.event_store.record_manager.has_integrated_snapshots:
+            # The most recent item may be a snapshot, so get the entity.
+            entity = self.get_entity(entity_id)
+            return None if entity is None else entity.__version__
+
+        latest_event = self.event_store.get_most_recent_event(entity_id)
+        if latest_event is None or isinstance(latest_event, DiscardedEvent):
+            return None
+        return latest_event.originator_version
 
     def __getitem__(self, entity_id: UUID) -> TVersionedEntity:
         """
@@ -107,10 +137,32 @@ class EventSourcedRepository(
         return entity
 
     def put_entity_in_cache(self, entity_id: UUID, entity: TVersionedEntity):
-        if entity is None or entity_id in self._cache:
+        """
+        Puts entity in the cache, unless the cache already
+        has the same entity at the same or a later version.
+        """
+        if entity is None:
             return
         with self._cache_lock:
-            self._cache[entity_id] = entity
+            cached = self._cache.get(entity_id)
+            if cached is None or entity.__version__ > cached.__version__:
+                self._cache[entity_id] = entity
+
+    def fastforward(self, entity: TVersionedEntity) -> Optional[TVersionedEntity]:
+        """
+        Returns a copy of given entity, evolved by any events that
+        have been stored since its version. The given entity isn't changed.
+
+        Only the missing tail of the entity's events is retrieved,
+        so a stale entity (for example, one whose events failed to
+        be stored because of a record conflict) can be brought up
+        to date without replaying all of its events.
+
+        Returns None if the entity has since been discarded.
+        """
+        return self.get_and_project_events(
+            entity.id, gt=entity.__version__, initial_state=deepcopy(entity)
+        )
 
     def get_entity(
         self, entity_id: UUID, at: Optional[int] = None
@@ -120,7 +172,18 @@ class EventSourcedRepository(
 
         Returns None if entity not found.
         """
-
+        if tracing.tracer is not None:
+            with tracing.tracer.span(
+                "repository.get_entity", entity_id=str(entity_id), at=at
+            ) as span:
+                entity = self._get_entity(entity_id, at)
+                span.set(version=getattr(entity, "__version__", None))
+                return entity
+        return self._get_entity(entity_id, at)
+
+    def _get_entity(
+        self, entity_id: UUID, at: Optional[int] = None
+    ) -> Optional[TVersionedEntity]:
         # Get a snapshot (None if none exist).
         if (
             self._snapshot_strategy
@@ -197,6 +260,13 @@ class EventSourcedRepository(
             domain_events = reversed(list(domain_events))
 
         # Project the domain events onto the initial state.
+        if tracing.tracer is not None:
+            # Get the events first, so the fold is timed by itself.
+            domain_events = list(domain_events)
+            with tracing.tracer.span(
+                "repository.mutate", entity_id=str(entity_id), count=len(domain_events)
+            ):
+                return self.project_events(initial_state, domain_events)
         return self.project_events(initial_state, domain_events)
 
     def project_events(
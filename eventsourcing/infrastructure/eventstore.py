@@ -1,9 +1,11 @@
-from typing import Iterable, NamedTuple, Optional
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
 from uuid import UUID
 
 from eventsourcing.exceptions import ConcurrencyError, RecordConflictError
 from eventsourcing.infrastructure.base import AbstractEventStore, TRecordManager
 from eventsourcing.infrastructure.iterators import SequencedItemIterator
+from eventsourcing.utils import tracing
 from eventsourcing.whitehead import TEvent
 
 # Todo: Unify iterators in EventStore and in NotificationLog,
@@ -28,11 +30,20 @@ class EventStore(AbstractEventStore[TEvent, TRecordManager]):
         """
 
         # Convert to sequenced item.
-        sequenced_items = self.items_from_events(events)
+        if tracing.tracer is not None:
+            with tracing.tracer.span("event_store.encode") as span:
+                sequenced_items = list(self.items_from_events(events))
+                span.set(count=len(sequenced_items))
+        else:
+            sequenced_items = list(self.items_from_events(events))
 
         # Append to the sequenced item(s) to the sequence.
         try:
-            self.record_manager.record_items(sequenced_items)
+            if tracing.tracer is not None:
+                with tracing.tracer.span("event_store.write"):
+                    self.record_manager.record_items(sequenced_items)
+            else:
+                self.record_manager.record_items(sequenced_items)
         except RecordConflictError as e:
             raise ConcurrencyError(e)
 
@@ -43,7 +54,7 @@ class EventStore(AbstractEventStore[TEvent, TRecordManager]):
         An iterable of events.
         """
         # Convert the domain event(s) to sequenced item(s).
-        return map(self.event_mapper.item_from_event, events)
+        return self.event_mapper.items_from_events(events)
 
     def iter_events(
         self,
@@ -92,9 +103,41 @@ class EventStore(AbstractEventStore[TEvent, TRecordManager]):
                 query_ascending=is_ascending,
                 results_ascending=is_ascending,
             )
+            if tracing.tracer is not None:
+                with tracing.tracer.span(
+                    "event_store.query", originator_id=str(originator_id)
+                ) as span:
+                    sequenced_items = list(sequenced_items)
+                    span.set(count=len(sequenced_items))
 
         # Deserialize to domain events.
-        return map(self.event_mapper.event_from_item, sequenced_items)
+        return self._decode_in_batches(
+            originator_id,
+            sequenced_items,
+            page_size or self.iterator_class.DEFAULT_PAGE_SIZE,
+        )
+
+    def _decode_in_batches(
+        self, originator_id: UUID, sequenced_items: Iterable, batch_size: int
+    ) -> Iterator[TEvent]:
+        # Decode in batches, so that the states of a batch can be decrypted
+        # together, and so that each batch is timed apart from the query
+        # that gets its items from the database.
+        items = iter(sequenced_items)
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return
+            if tracing.tracer is not None:
+                with tracing.tracer.span(
+                    "event_store.decode",
+                    originator_id=str(originator_id),
+                    count=len(batch),
+                ):
+                    events = self.event_mapper.events_from_items(batch)
+            else:
+                events = self.event_mapper.events_from_items(batch)
+            yield from events
 
     def get_event(self, originator_id: UUID, position: int) -> TEvent:
         """
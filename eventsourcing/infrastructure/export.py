@@ -0,0 +1,222 @@
+"""
+Export of stored events to columnar files, so that events can be analysed
+offline, without reading them through the event store or repositories.
+
+Notification records are read in order of their notification IDs in large
+pages, and each page is decoded into columns of event attribute values for
+each event topic, which are written by a :class:`ColumnarWriter`.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from eventsourcing.infrastructure.base import RecordManagerWithNotifications
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+
+# Notification ID, topic, and state of a notification record.
+NotificationRow = Tuple[int, str, bytes]
+
+# Columns of attribute values, for each event topic.
+TopicColumns = Dict[str, Dict[str, List[Any]]]
+
+COMMON_COLUMN_NAMES = (
+    "notification_id",
+    "originator_id",
+    "originator_version",
+    "timestamp",
+)
+
+
+class ColumnarWriter(ABC):
+    """
+    Writes columns of event attribute values, partitioned by event topic.
+    """
+
+    @abstractmethod
+    def write(self, topic: str, columns: Dict[str, List[Any]], page_id: int) -> None:
+        """
+        Writes columns of attribute values of events that have the given topic.
+
+        The page ID is the position of the page in the notification log, so
+        that resuming an export from the start of a page replaces the columns
+        written before.
+        """
+
+    def close(self) -> None:
+        """
+        Closes the writer.
+        """
+
+
+class ColumnarExporter(object):
+    """
+    Exports events from a record manager with notifications.
+
+    Pages are decoded concurrently by a pool of ``decode_workers``
+    operating system processes, or in this process if there are no
+    decode workers.
+    """
+
+    DEFAULT_PAGE_SIZE = 10000
+
+    def __init__(
+        self,
+        record_manager: RecordManagerWithNotifications,
+        event_mapper: SequencedItemMapper,
+        writer: ColumnarWriter,
+        page_size: Optional[int] = None,
+        decode_workers: int = 0,
+    ):
+        assert isinstance(record_manager, RecordManagerWithNotifications)
+        self.record_manager = record_manager
+        self.event_mapper = event_mapper
+        self.writer = writer
+        self.page_size = page_size or self.DEFAULT_PAGE_SIZE
+        self.decode_workers = decode_workers
+        self.position: Optional[int] = None
+
+    def export(self, start: int = 0, stop: Optional[int] = None) -> int:
+        """
+        Exports events from the given position in the notification log,
+        until the given stop position or the last notification.
+
+        The ``position`` attribute is set after each page is written,
+        so that an interrupted export can be resumed from there.
+
+        :return: Position after the exported notifications, from which
+            the export can be resumed.
+        """
+        # Notification IDs start from 1, and may have gaps, so
+        # stop after the notification that is last when starting.
+        max_notification_id = self.record_manager.get_max_notification_id()
+        if stop is None or stop > max_notification_id:
+            stop = max_notification_id
+        stop = max(start, stop)
+
+        self.position = start
+        pages = self.decode_pages(self.get_pages(start, stop))
+        for page_id, topic_columns in pages:
+            for topic, columns in topic_columns.items():
+                self.writer.write(topic, columns, page_id)
+            self.position = min(page_id + self.page_size, stop)
+        self.position = stop
+        return stop
+
+    def get_pages(
+        self, start: int, stop: int
+    ) -> Iterator[Tuple[int, List[NotificationRow]]]:
+        """
+        Yields pages of notification rows, with the position of each page.
+        """
+        field_names = self.record_manager.field_names
+        notification_id_name = self.record_manager.notification_id_name
+        for page_id in range(start, stop, self.page_size):
+            records = self.record_manager.get_notification_records(
+                start=page_id, stop=min(page_id + self.page_size, stop)
+            )
+            rows = [
+                (
+                    getattr(record, notification_id_name),
+                    getattr(record, field_names.topic),
+                    bytes(getattr(record, field_names.state)),
+                )
+                for record in records
+            ]
+            if rows:
+                yield page_id, rows
+
+    def decode_pages(
+        self, pages: Iterator[Tuple[int, List[NotificationRow]]]
+    ) -> Iterator[Tuple[int, TopicColumns]]:
+        """
+        Yields columns of each page, in order.
+        """
+        if not self.decode_workers:
+            for page_id, rows in pages:
+                yield page_id, decode_columns(self.event_mapper, rows)
+            return
+
+        # Decode up to twice as many pages as workers at a time.
+        with ProcessPoolExecutor(
+            max_workers=self.decode_workers,
+            initializer=_init_decode_worker,
+            initargs=(self.event_mapper,),
+        ) as executor:
+            futures: Deque[Tuple[int, Future]] = deque()
+            try:
+                for page_id, rows in pages:
+                    futures.append((page_id, executor.submit(_decode_page, rows)))
+                    if len(futures) == 2 * self.decode_workers:
+                        page_id, future = futures.popleft()
+                        yield page_id, future.result()
+                while futures:
+                    page_id, future = futures.popleft()
+                    yield page_id, future.result()
+            finally:
+                for _, future in futures:
+                    future.cancel()
+
+
+def decode_columns(
+    event_mapper: SequencedItemMapper, rows: List[NotificationRow]
+) -> TopicColumns:
+    """
+    Decodes notification rows into columns of event attribute values,
+    for each topic.
+
+    There is a column for each event attribute, after the notification
+    ID, originator ID, originator version and timestamp columns.
+    """
+    topic_rows: Dict[str, List[Dict[str, Any]]] = {}
+    for notification_id, topic, state in rows:
+        _, event_attrs = event_mapper.get_event_class_and_attrs(topic, state)
+        event_attrs["notification_id"] = notification_id
+        topic_rows.setdefault(topic, []).append(event_attrs)
+
+    topic_columns: TopicColumns = {}
+    for topic, attrs_list in topic_rows.items():
+        names: Set[str] = set()
+        for event_attrs in attrs_list:
+            names.update(event_attrs)
+        names.difference_update(COMMON_COLUMN_NAMES)
+        topic_columns[topic] = {
+            name: [
+                to_column_value(event_mapper, event_attrs.get(name))
+                for event_attrs in attrs_list
+            ]
+            for name in COMMON_COLUMN_NAMES + tuple(sorted(names))
+        }
+    return topic_columns
+
+
+def to_column_value(event_mapper: SequencedItemMapper, value: Any) -> Any:
+    """
+    Converts attribute value to a type that columnar formats support.
+
+    Decimal values, such as event timestamps, are converted to strings,
+    so that they are exported exactly. Values of other types are encoded
+    as JSON strings.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes, date)):
+        return value
+    elif isinstance(value, (UUID, Decimal)):
+        return str(value)
+    else:
+        return str(event_mapper.json_dumps(value), "utf8")
+
+
+_decode_worker_event_mapper: Optional[SequencedItemMapper] = None
+
+
+def _init_decode_worker(event_mapper: SequencedItemMapper) -> None:
+    global _decode_worker_event_mapper
+    _decode_worker_event_mapper = event_mapper
+
+
+def _decode_page(rows: List[NotificationRow]) -> TopicColumns:
+    assert _decode_worker_event_mapper is not None
+    return decode_columns(_decode_worker_event_mapper, rows)
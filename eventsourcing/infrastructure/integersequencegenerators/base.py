@@ -1,5 +1,9 @@
 from abc import abstractmethod
 from threading import Lock
+from time import monotonic
+from typing import Callable, Iterator, Optional, Sequence
+
+from eventsourcing.exceptions import ProgrammingError
 
 
 class AbstractIntegerSequenceGenerator(object):
@@ -16,6 +20,22 @@ class AbstractIntegerSequenceGenerator(object):
         Returns the next item in the container.
         """
 
+    def reserve(self, n: int) -> Sequence[int]:
+        """
+        Reserves a block of integers from the sequence.
+
+        The default implementation calls next() for each integer, so
+        the reserved integers may not be contiguous if the generator
+        is shared. Subclasses that can claim a contiguous block in a
+        single operation should override this method to return a range.
+
+        :param n: Number of integers to reserve.
+        :return: Sequence of reserved integers.
+        """
+        if n < 1:
+            raise ValueError("Number of integers must be positive: {}".format(n))
+        return [next(self) for _ in range(n)]
+
 
 class SimpleIntegerSequenceGenerator(AbstractIntegerSequenceGenerator):
     """
@@ -35,3 +55,122 @@ class SimpleIntegerSequenceGenerator(AbstractIntegerSequenceGenerator):
         self.i += 1
         self.lock.release()
         return i
+
+    def reserve(self, n: int) -> range:
+        """
+        Reserves a contiguous block of integers, acquiring the lock once.
+        """
+        if n < 1:
+            raise ValueError("Number of integers must be positive: {}".format(n))
+        with self.lock:
+            i = self.i
+            self.i += n
+        return range(i, i + n)
+
+
+class ReservingIntegerSequenceGenerator(AbstractIntegerSequenceGenerator):
+    """
+    Generates a sequence of integers, by reserving blocks of integers
+    from another generator, and issuing them locally.
+
+    A lock is only acquired when a block has been used up. The size of
+    the blocks is adapted to the rate at which integers are issued, so
+    that a new block is reserved about once every ``target_interval``
+    seconds, within the given minimum and maximum block sizes.
+
+    Integers in reserved blocks that aren't issued are reported to the
+    optional ``on_unused`` callable as a range, for example when the
+    generator is closed, so that readers can skip the resulting gaps.
+    """
+
+    def __init__(
+        self,
+        generator: AbstractIntegerSequenceGenerator,
+        block_size: int = 10,
+        min_block_size: int = 1,
+        max_block_size: int = 10000,
+        target_interval: float = 0.1,
+        on_unused: Optional[Callable[[range], None]] = None,
+    ):
+        if not 0 < min_block_size <= block_size <= max_block_size:
+            raise ValueError(
+                "Block sizes should be 0 < min <= initial <= max: {}".format(
+                    (min_block_size, block_size, max_block_size)
+                )
+            )
+        self.generator = generator
+        self.block_size = block_size
+        self.min_block_size = min_block_size
+        self.max_block_size = max_block_size
+        self.target_interval = target_interval
+        self.on_unused = on_unused
+        self.lock = Lock()
+        self._block: range = range(0)
+        self._issued: Iterator[int] = iter(self._block)
+        self._reserved_at: Optional[float] = None
+
+    def __next__(self) -> int:
+        """
+        Returns the next integer in the current block.
+        """
+        try:
+            return next(self._issued)
+        except StopIteration:
+            pass
+        with self.lock:
+            # Another thread may have reserved a new block.
+            try:
+                return next(self._issued)
+            except StopIteration:
+                self._reserve_block()
+                return next(self._issued)
+
+    def reserve(self, n: int) -> Sequence[int]:
+        """
+        Reserves a block of integers directly from the other generator.
+
+        Integers issued from the current block by other threads aren't
+        affected, since the current block isn't shared with the caller.
+        """
+        return self.generator.reserve(n)
+
+    def close(self) -> None:
+        """
+        Reports the rest of the current block as unused, so that the next
+        integer will be issued from a new block. Should be called when no
+        other threads are issuing integers from this generator.
+        """
+        with self.lock:
+            first = next(self._issued, None)
+            if first is not None:
+                self._report_unused(range(first, self._block.stop))
+            self._block = range(0)
+            self._issued = iter(self._block)
+
+    def _reserve_block(self) -> None:
+        self._adapt_block_size()
+        block = self.generator.reserve(self.block_size)
+        if not isinstance(block, range):
+            if block[-1] - block[0] + 1 != len(block):
+                raise ProgrammingError(
+                    "Generator didn't reserve a contiguous block: {}".format(
+                        self.generator
+                    )
+                )
+            block = range(block[0], block[-1] + 1)
+        self._block = block
+        self._issued = iter(block)
+
+    def _adapt_block_size(self) -> None:
+        now = monotonic()
+        if self._reserved_at is not None:
+            interval = now - self._reserved_at
+            if interval < self.target_interval / 2:
+                self.block_size = min(self.block_size * 2, self.max_block_size)
+            elif interval > self.target_interval * 2:
+                self.block_size = max(self.block_size // 2, self.min_block_size)
+        self._reserved_at = now
+
+    def _report_unused(self, unused: range) -> None:
+        if self.on_unused is not None and len(unused):
+            self.on_unused(unused)
@@ -13,6 +13,8 @@ class RedisIncr(AbstractIntegerSequenceGenerator):
     """
     Generates a sequence of integers, using Redis' INCR command.
 
+    Blocks of integers are reserved with Redis' INCRBY command.
+
     Maximum number is 2**63, or 9223372036854775807, the maximum
     value of a 64 bit signed integer.
     """
@@ -24,3 +26,12 @@ class RedisIncr(AbstractIntegerSequenceGenerator):
 
     def __next__(self) -> int:
         return self.redis.incr(self.key) - 1
+
+    def reserve(self, n: int) -> range:
+        """
+        Reserves a contiguous block of integers, with one INCRBY command.
+        """
+        if n < 1:
+            raise ValueError("Number of integers must be positive: {}".format(n))
+        stop = self.redis.incrby(self.key, n)
+        return range(stop - n, stop)
@@ -1,9 +1,13 @@
 from abc import abstractmethod
-from threading import Thread
-from typing import Any, Iterable, Iterator, List, NamedTuple, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Any, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from uuid import UUID
 
 from eventsourcing.infrastructure.base import AbstractRecordManager, BaseRecordManager
+from eventsourcing.utils import metrics, tracing
 
 
 class AbstractSequencedItemIterator(Iterable):
@@ -130,6 +134,15 @@ class SequencedItemIterator(AbstractSequencedItemIterator):
                 query_ascending=self.is_ascending,
                 results_ascending=self.is_ascending,
             )
+            if tracing.tracer is not None:
+                with tracing.tracer.span(
+                    "event_store.query",
+                    originator_id=str(self.sequence_id),
+                    query_number=self.query_counter + 1,
+                    limit=limit,
+                ) as span:
+                    sequenced_items = list(sequenced_items)
+                    span.set(count=len(sequenced_items))
 
             self._inc_query_counter()
 
@@ -159,121 +172,223 @@ class SequencedItemIterator(AbstractSequencedItemIterator):
 
 
 class ThreadedSequencedItemIterator(AbstractSequencedItemIterator):
-    def __iter__(self) -> Iterator[NamedTuple]:
-        # Start a thread to get a page of events.
-        thread = self.start_thread()
+    """
+    Yields sequenced items from pages that are retrieved by a pool of
+    threads, whilst the items of earlier pages are being yielded.
 
-        # Get pages of stored events, until the page isn't full.
-        while True:
-            # Wait for the next page of events.
-            thread.join(timeout=30)
+    The positions of integer-sequenced items are usually contiguous, so
+    after the first page the positions that the following pages start from
+    can be calculated, and up to ``pages_in_flight`` pages are retrieved
+    concurrently. Otherwise, the next page is requested as soon as a page
+    is retrieved. Pages are only bounded by where they start, so a page
+    that isn't full is the last page. If a full page isn't contiguous, there
+    is a gap in the positions, and the pages after it are requested again.
 
-            # Count the query.
-            self._inc_query_counter()
+    Pages that have been requested but are not needed, because the
+    last page was found or the iteration was stopped, are cancelled.
 
-            # Get the stored events from the thread.
-            stored_events = thread.stored_events
+    The pool of threads is shared by all instances of this class.
+    """
 
-            # Count the number of stored events that were retrieved.
-            num_stored_events = len(stored_events)
-
-            if num_stored_events:
-                self._inc_page_counter()
+    DEFAULT_PAGES_IN_FLIGHT = 2
+    max_workers = 10
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = Lock()
 
-            # Decide if this is the last page.
-            is_last_page = (num_stored_events != self.page_size) or (
-                self.all_item_counter + num_stored_events == self.limit
-            )
-
-            if not is_last_page:
-                # Update loop variables.
-                position = stored_events[-1]
-                self._update_position(position)
-
-                # Start the next thread.
-                thread = self.start_thread()
+    def __init__(
+        self, *args: Any, pages_in_flight: Optional[int] = None, **kwargs: Any
+    ):
+        """
+        :param pages_in_flight: Maximum number of pages retrieved concurrently.
+        """
+        super(ThreadedSequencedItemIterator, self).__init__(*args, **kwargs)
+        self.pages_in_flight = pages_in_flight or self.DEFAULT_PAGES_IN_FLIGHT
+        assert self.pages_in_flight > 0, self.pages_in_flight
+        self.page_latencies: List[float] = []
 
-            # Yield each stored event.
-            for stored_event in stored_events:
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns pool of threads used to retrieve pages.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers, thread_name_prefix="iterator"
+                )
+            return cls._executor
 
-                # Stop if we're over the limit.
-                if self.limit and self.all_item_counter >= self.limit:
+    def __iter__(self) -> Iterator[NamedTuple]:
+        executor = self.get_executor()
+        # Requested pages, with the position of their last item if they
+        # are full and contiguous, when that position was calculated.
+        pages: Deque[Tuple[Future, Optional[int]]] = deque()
+
+        # Request the first page, from the given bounds.
+        bounds = (self.gt, self.gte, self.lt, self.lte)
+        pages.append((executor.submit(self.get_page, *bounds), None))
+
+        # Position of the last item in the pages that have been requested,
+        # if the bounds of the following pages can be calculated.
+        last_position: Optional[int] = None
+        num_requested = 0
+        try:
+            # Get pages of stored events, until the page isn't full.
+            while pages:
+                # Wait for the next page of events.
+                page, expected_position = pages.popleft()
+                stored_events = self.wait_for_page(page)
+
+                # Count the number of stored events that were retrieved.
+                num_stored_events = len(stored_events)
+
+                if num_stored_events:
+                    self._inc_page_counter()
+
+                # Decide if this is the last page.
+                is_last_page = (num_stored_events != self.page_size) or (
+                    self.all_item_counter + num_stored_events == self.limit
+                )
+
+                if not is_last_page:
+                    # Update loop variables.
+                    self._update_position(stored_events[-1])
+
+                    # If there was a gap in the positions, the pages after
+                    # this one start from the wrong positions.
+                    if expected_position not in (None, self._position):
+                        while pages:
+                            pages.pop()[0].cancel()
+                        last_position = None
+
+                    # Request more pages, before yielding the stored events.
+                    if last_position is None and self.is_contiguous(stored_events):
+                        last_position = self._position
+                        num_requested = self.all_item_counter + num_stored_events
+                    if last_position is None:
+                        bounds = self.get_next_bounds()
+                        pages.append((executor.submit(self.get_page, *bounds), None))
+                    else:
+                        while len(pages) < self.pages_in_flight:
+                            # Don't request pages after the limit.
+                            if self.limit is not None and num_requested >= self.limit:
+                                break
+                            bounds = self.calc_page_bounds(last_position)
+                            if bounds is None:
+                                break
+                            num_requested += self.page_size
+                            if self.is_ascending:
+                                last_position += self.page_size
+                            else:
+                                last_position -= self.page_size
+                            page = executor.submit(self.get_page, *bounds)
+                            pages.append((page, last_position))
+
+                # Yield each stored event.
+                for stored_event in stored_events:
+
+                    # Stop if we're over the limit.
+                    if self.limit and self.all_item_counter >= self.limit:
+                        return
+
+                    # Count each event.
+                    self._inc_all_event_counter()
+
+                    # Yield the event.
+                    yield stored_event
+
+                # If that was the last page, then stop iterating.
+                if is_last_page:
                     return
-
-                # Count each event.
-                self._inc_all_event_counter()
-
-                # Yield the event.
-                yield stored_event
-
-            # If that was the last page, then stop iterating.
-            if is_last_page:
-                return
-
-    def start_thread(self) -> "GetEntityEventsThread":
-        gt = self.gt
-        gte = self.gte
-        lt = self.lt
-        lte = self.lte
-
-        if self._position is not None:
-            if self.is_ascending:
-                gt = self._position
-                gte = None
-            else:
-                lt = self._position
-                lte = None
-
-        thread = GetEntityEventsThread(
-            record_manager=self.record_manager,
-            sequence_id=self.sequence_id,
-            gt=gt,
-            gte=gte,
-            lt=lt,
-            lte=lte,
-            page_size=self.page_size,
-            is_ascending=self.is_ascending,
-        )
-        thread.start()
-        return thread
-
-
-class GetEntityEventsThread(Thread):
-    def __init__(
+        finally:
+            # Cancel pages that won't be used.
+            for page, _ in pages:
+                page.cancel()
+
+    def wait_for_page(self, page: Future) -> List[NamedTuple]:
+        if tracing.tracer is not None:
+            with tracing.tracer.span(
+                "event_store.query",
+                originator_id=str(self.sequence_id),
+                query_number=self.query_counter + 1,
+            ) as span:
+                stored_events = page.result()
+                span.set(count=len(stored_events))
+        else:
+            stored_events = page.result()
+
+        # Count the query.
+        self._inc_query_counter()
+        return stored_events
+
+    def get_page(
         self,
-        record_manager: AbstractRecordManager,
-        sequence_id: UUID,
-        gt: Optional[int] = None,
-        gte: Optional[int] = None,
-        lt: Optional[int] = None,
-        lte: Optional[int] = None,
-        page_size: Optional[int] = None,
-        is_ascending: bool = True,
-        *args: Any,
-        **kwargs: Any
-    ):
-        super(GetEntityEventsThread, self).__init__(*args, **kwargs)
-        assert isinstance(record_manager, BaseRecordManager), type(record_manager)
-        self.record_manager = record_manager
-        self.stored_entity_id = sequence_id
-        self.gt = gt
-        self.gte = gte
-        self.lt = lt
-        self.lte = lte
-        self.page_size = page_size
-        self.is_ascending = is_ascending
-        self.stored_events: List[NamedTuple] = []
-
-    def run(self) -> None:
-        self.stored_events = list(
+        gt: Optional[int],
+        gte: Optional[int],
+        lt: Optional[int],
+        lte: Optional[int],
+    ) -> List[NamedTuple]:
+        """
+        Retrieves a page of sequenced items, and records how long it took.
+        """
+        started = perf_counter()
+        stored_events = list(
             self.record_manager.get_items(
-                sequence_id=self.stored_entity_id,
-                gt=self.gt,
-                gte=self.gte,
-                lt=self.lt,
-                lte=self.lte,
+                sequence_id=self.sequence_id,
+                gt=gt,
+                gte=gte,
+                lt=lt,
+                lte=lte,
                 limit=self.page_size,
                 query_ascending=self.is_ascending,
                 results_ascending=self.is_ascending,
             )
         )
+        latency = perf_counter() - started
+        self.page_latencies.append(latency)
+        if metrics.sinks:
+            metrics.observe("iterator_page_seconds", latency)
+        return stored_events
+
+    def get_next_bounds(
+        self,
+    ) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+        """
+        Returns bounds of the page after the current position.
+        """
+        if self.is_ascending:
+            return self._position, None, self.lt, self.lte
+        else:
+            return self.gt, self.gte, self._position, None
+
+    def is_contiguous(self, stored_events: List[NamedTuple]) -> bool:
+        """
+        Decides whether the positions of the given stored events are
+        contiguous integers, so the bounds of later pages can be calculated.
+        """
+        position_field = self.record_manager.field_names.position
+        first = getattr(stored_events[0], position_field)
+        last = getattr(stored_events[-1], position_field)
+        if not isinstance(first, int) or not isinstance(last, int):
+            return False
+        return abs(last - first) == len(stored_events) - 1
+
+    def calc_page_bounds(
+        self, last_position: int
+    ) -> Optional[Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]]:
+        """
+        Returns bounds of the page after the given position, or
+        None if there can't be any items in that page.
+        """
+        if self.is_ascending:
+            if self.lte is not None and last_position >= self.lte:
+                return None
+            if self.lt is not None and last_position >= self.lt - 1:
+                return None
+            return last_position, None, self.lt, self.lte
+        else:
+            if self.gte is not None and last_position <= self.gte:
+                return None
+            if self.gt is not None and last_position <= self.gt + 1:
+                return None
+            return self.gt, self.gte, last_position, None
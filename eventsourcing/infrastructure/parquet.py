@@ -0,0 +1,28 @@
+import os
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+import pyarrow
+import pyarrow.parquet
+
+from eventsourcing.infrastructure.export import ColumnarWriter
+
+
+class ParquetWriter(ColumnarWriter):
+    """
+    Writes columns of event attribute values to Parquet files.
+
+    The files of each topic are in a directory named like a Hive
+    partition (for example "topic=..."), with one file for each page.
+    """
+
+    def __init__(self, path: str, compression: str = "snappy"):
+        self.path = path
+        self.compression = compression
+
+    def write(self, topic: str, columns: Dict[str, List[Any]], page_id: int) -> None:
+        dirname = os.path.join(self.path, "topic=" + quote(topic, safe=""))
+        os.makedirs(dirname, exist_ok=True)
+        filename = os.path.join(dirname, "part-{:020d}.parquet".format(page_id))
+        table = pyarrow.table(columns)
+        pyarrow.parquet.write_table(table, filename, compression=self.compression)
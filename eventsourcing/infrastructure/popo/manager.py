@@ -12,6 +12,14 @@ from eventsourcing.infrastructure.base import (
 
 
 class PopoNotification(object):
+    __slots__ = (
+        "notification_id",
+        "originator_id",
+        "originator_version",
+        "topic",
+        "state",
+    )
+
     def __init__(
         self,
         notification_id: int,
@@ -59,6 +67,12 @@ class PopoRecordManager(RecordManagerWithTracking):
             position = getattr(record, self.field_names.position)
             sequence_records.pop(position, None)
 
+    def update_record_state(self, record: Any, state: bytes) -> None:
+        with self._rw_lock.gen_wlock():
+            record.sequenced_item = record.sequenced_item._replace(
+                **{self.field_names.state: state}
+            )
+
     def get_max_notification_id(self) -> int:
         with self._rw_lock.gen_rlock():
             max_record_id = self._get_max_record_id()
@@ -98,19 +112,13 @@ class PopoRecordManager(RecordManagerWithTracking):
                 if stop is not None and i >= stop + 1:
                     break
                 try:
-                    notification_record = notification_records[i]
+                    record = notification_records[i]
                     notification = PopoNotification(
-                        notification_id=notification_record["notification_id"],
-                        originator_id=getattr(
-                            notification_record["sequenced_item"],
-                            self.field_names.sequence_id,
-                        ),
-                        originator_version=getattr(
-                            notification_record["sequenced_item"],
-                            self.field_names.position,
-                        ),
-                        topic=notification_record["sequenced_item"].topic,
-                        state=notification_record["sequenced_item"].state,
+                        notification_id=getattr(record, self.notification_id_name),
+                        originator_id=getattr(record, self.field_names.sequence_id),
+                        originator_version=getattr(record, self.field_names.position),
+                        topic=getattr(record, self.field_names.topic),
+                        state=getattr(record, self.field_names.state),
                     )
                     notifications.append(notification)
                 except KeyError:
@@ -120,12 +128,16 @@ class PopoRecordManager(RecordManagerWithTracking):
 
         return notifications
 
-    def get_max_tracking_record_id(self, upstream_application_name: str) -> int:
+    def get_max_tracking_record_id(
+        self, upstream_application_name: str, pipeline_id: Optional[int] = None
+    ) -> int:
+        if pipeline_id is None:
+            pipeline_id = self.pipeline_id
         max_id = 0
         with self._rw_lock.gen_rlock():
             try:
                 app_records = self._all_tracking_records[self.application_name]
-                upstream_records = app_records[upstream_application_name]
+                upstream_records = app_records[(upstream_application_name, pipeline_id)]
             except KeyError:
                 pass
             else:
@@ -215,7 +227,7 @@ class PopoRecordManager(RecordManagerWithTracking):
         with self._rw_lock.gen_rlock():
             try:
                 app_records = self._all_tracking_records[self.application_name]
-                upstream_records = app_records[upstream_application_name]
+                upstream_records = app_records[(upstream_application_name, pipeline_id)]
             except KeyError:
                 pass
             else:
@@ -250,6 +262,7 @@ class PopoRecordManager(RecordManagerWithTracking):
                 # Write a tracking record.
                 upstream_application_name = tracking_kwargs["upstream_application_name"]
                 application_name = tracking_kwargs["application_name"]
+                pipeline_id = tracking_kwargs["pipeline_id"]
                 notification_id = tracking_kwargs["notification_id"]
                 assert application_name == self.application_name, (
                     application_name,
@@ -262,19 +275,22 @@ class PopoRecordManager(RecordManagerWithTracking):
                     self._all_tracking_records[
                         self.application_name
                     ] = app_tracking_records
+                # Notification IDs are unique within each upstream pipeline.
+                upstream_key = (upstream_application_name, pipeline_id)
                 try:
-                    upstream_tracking_records = app_tracking_records[
-                        upstream_application_name
-                    ]
+                    upstream_tracking_records = app_tracking_records[upstream_key]
                 except KeyError:
                     upstream_tracking_records = set()
-                    app_tracking_records[
-                        upstream_application_name
-                    ] = upstream_tracking_records
+                    app_tracking_records[upstream_key] = upstream_tracking_records
 
                 if notification_id in upstream_tracking_records:
                     raise RecordConflictError(
-                        (application_name, upstream_application_name, notification_id)
+                        (
+                            application_name,
+                            upstream_application_name,
+                            pipeline_id,
+                            notification_id,
+                        )
                     )
                 upstream_tracking_records.add(notification_id)
 
@@ -296,7 +312,7 @@ class PopoRecordManager(RecordManagerWithTracking):
                                 self.notification_id_name,
                                 int,
                                 type(notification_id),
-                                record.__dict__,
+                                record.sequenced_item,
                             )
                         )
 
@@ -336,7 +352,10 @@ class PopoRecordManager(RecordManagerWithTracking):
                 )
 
         sequence_records[position] = record
-        self._all_sequence_max[self.application_name][sequence_id] = position
+        # Positions reserved in blocks can be written out of order.
+        sequence_max = self._all_sequence_max[self.application_name]
+        if position > sequence_max.get(sequence_id, -1):
+            sequence_max[sequence_id] = position
 
         # Write a notification record.
         if self.notification_id_name:
@@ -359,10 +378,7 @@ class PopoRecordManager(RecordManagerWithTracking):
                         notification_id = (self._get_max_record_id() or 0) + 1
                         setattr(record, self.notification_id_name, notification_id)
 
-                    notification_records[notification_id] = {
-                        "notification_id": notification_id,
-                        "sequenced_item": record,
-                    }
+                    notification_records[notification_id] = record
                     self._all_notification_max[self.application_name] = notification_id
 
     def to_record(self, sequenced_item: NamedTuple) -> object:
@@ -7,11 +7,14 @@ from eventsourcing.whitehead import TEvent
 
 class SequencedItemMapperForPopo(SequencedItemMapper):
     def get_event_class_and_attrs(
-        self, topic: str, state: bytes
+        self, topic: str, state: bytes, decrypt: bool = True
     ) -> Tuple[Type[TEvent], Dict]:
         return resolve_topic(topic), state  # type: ignore
 
     def get_item_topic_and_state(
-        self, domain_event_class: type, event_attrs: Dict[str, Any]
+        self,
+        domain_event_class: type,
+        event_attrs: Dict[str, Any],
+        encrypt: bool = True,
     ) -> Tuple[str, bytes]:
         return get_topic(domain_event_class), event_attrs  # type: ignore
@@ -5,6 +5,9 @@ class IntegerSequencedRecord(object):
     """
     Encapsulates sequenced item tuple (containing real event object).
     """
+
+    __slots__ = ("sequenced_item",)
+
     def __init__(self, sequenced_item: NamedTuple):
         self.sequenced_item = sequenced_item
 
@@ -13,7 +16,7 @@ class IntegerSequencedRecord(object):
 
 
 class SnapshotRecord(IntegerSequencedRecord):
-    pass
+    __slots__ = ()
 
 
 class StoredEventRecord(IntegerSequencedRecord):
@@ -22,5 +25,10 @@ class StoredEventRecord(IntegerSequencedRecord):
 
     Allows other attributes to be set, such as notification ID.
     """
-    notification_id = None
-    application_name = None
+
+    __slots__ = ("notification_id", "application_name")
+
+    def __init__(self, sequenced_item: NamedTuple):
+        super(StoredEventRecord, self).__init__(sequenced_item)
+        self.notification_id = None
+        self.application_name = None
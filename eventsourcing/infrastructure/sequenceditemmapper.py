@@ -1,14 +1,34 @@
 from abc import ABC, abstractmethod
+from importlib import import_module
 from json import JSONDecodeError
-from typing import Any, Dict, Generic, NamedTuple, Optional, Tuple, Type
+from time import perf_counter
+from types import ModuleType
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from eventsourcing.infrastructure.sequenceditem import (
     SequencedItem,
     SequencedItemFieldNames,
 )
+from eventsourcing.utils import tracing
 from eventsourcing.utils.cipher.aes import AESCipher
+from eventsourcing.utils.compressor import DictionaryCompressor
 from eventsourcing.utils.topic import get_topic, reconstruct_object, resolve_topic
-from eventsourcing.utils.transcoding import ObjectJSONDecoder, ObjectJSONEncoder
+from eventsourcing.utils.transcoding import (
+    ClassStateDecoder,
+    ObjectJSONDecoder,
+    ObjectJSONEncoder,
+    decoder,
+)
 from eventsourcing.whitehead import TEvent
 
 
@@ -30,6 +50,18 @@ class AbstractSequencedItemMapper(Generic[TEvent], ABC):
         Constructs and returns a domain event for given sequenced item.
         """
 
+    def items_from_events(self, domain_events: Iterable[TEvent]) -> List[NamedTuple]:
+        """
+        Constructs and returns sequenced items for given domain events.
+        """
+        return [self.item_from_event(e) for e in domain_events]
+
+    def events_from_items(self, sequenced_items: Iterable[NamedTuple]) -> List[TEvent]:
+        """
+        Constructs and returns domain events for given sequenced items.
+        """
+        return [self.event_from_item(i) for i in sequenced_items]
+
     @abstractmethod
     def json_dumps(self, o: object) -> bytes:
         """
@@ -82,15 +114,50 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
         self.json_encoder_class = json_encoder_class or ObjectJSONEncoder
         self.json_encoder = self.json_encoder_class(sort_keys=sort_keys)
         self.json_decoder_class = json_decoder_class or ObjectJSONDecoder
-        self.json_decoder = self.json_decoder_class()
+        self.construct_json_decoder()
         self.cipher = cipher
         self.compressor = compressor
+        # Dictionary compressors compress with a dictionary for the topic.
+        self.compress_with_topic = isinstance(compressor, DictionaryCompressor)
         self.field_names = SequencedItemFieldNames(self.sequenced_item_class)
         self.sequence_id_attr_name = (
             sequence_id_attr_name or self.field_names.sequence_id
         )
         self.position_attr_name = position_attr_name or self.field_names.position
         self.other_attr_names = other_attr_names or self.field_names.other_names
+        self.state_index = self.sequenced_item_class._fields.index(
+            self.field_names.state
+        )
+
+    def construct_json_decoder(self) -> None:
+        self.json_decoder = self.json_decoder_class()
+        # Decode states of known event classes without calling the
+        # decoder for each JSON object, unless decoding is customised.
+        if getattr(self.json_decoder, "object_hook", None) is decoder:
+            self.class_state_decoder: Optional[ClassStateDecoder] = ClassStateDecoder(
+                self.json_decoder
+            )
+        else:
+            self.class_state_decoder = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Mappers can be pickled, so that events can be decoded in
+        # other processes. JSON decoders have compiled scanners, and
+        # compressors are often modules, which can't be pickled.
+        state = self.__dict__.copy()
+        del state["json_decoder"]
+        del state["class_state_decoder"]
+        if isinstance(self.compressor, ModuleType):
+            state["compressor"] = None
+            state["compressor_module_name"] = self.compressor.__name__
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        compressor_module_name = state.pop("compressor_module_name", None)
+        if compressor_module_name is not None:
+            state["compressor"] = import_module(compressor_module_name)
+        self.__dict__.update(state)
+        self.construct_json_decoder()
 
     def item_from_event(self, domain_event: TEvent) -> NamedTuple:
         """
@@ -99,9 +166,27 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
         item_args = self.construct_item_args(domain_event)
         return self.construct_sequenced_item(item_args)
 
-    def construct_item_args(self, domain_event: TEvent) -> Tuple:
+    def items_from_events(self, domain_events: Iterable[TEvent]) -> List[NamedTuple]:
+        """
+        Constructs sequenced items from domain events, encrypting
+        the states of the items together.
+        """
+        if self.cipher is None:
+            return [self.item_from_event(e) for e in domain_events]
+
+        items_args = [self.construct_item_args(e, encrypt=False) for e in domain_events]
+        i = self.state_index
+        states = self.encrypt_many([item_args[i] for item_args in items_args])
+        return [
+            self.construct_sequenced_item(item_args[:i] + (state,) + item_args[i + 1 :])
+            for item_args, state in zip(items_args, states)
+        ]
+
+    def construct_item_args(self, domain_event: TEvent, encrypt: bool = True) -> Tuple:
         """
         Constructs attributes of a sequenced item from the given domain event.
+
+        :param encrypt: Whether to encrypt the state (if there is a cipher).
         """
         # Get the sequence ID.
         sequence_id = domain_event.__dict__[self.sequence_id_attr_name]
@@ -111,7 +196,7 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
 
         # Get topic and data.
         topic, state = self.get_item_topic_and_state(
-            domain_event.__class__, domain_event.__dict__
+            domain_event.__class__, domain_event.__dict__, encrypt=encrypt
         )
 
         # Get the 'other' args.
@@ -124,7 +209,10 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
         return (sequence_id, position, topic, state) + other_args
 
     def get_item_topic_and_state(
-        self, domain_event_class: type, event_attrs: Dict[str, Any]
+        self,
+        domain_event_class: type,
+        event_attrs: Dict[str, Any],
+        encrypt: bool = True,
     ) -> Tuple[str, bytes]:
         # Get the topic from the event attrs, otherwise from the class.
         topic = get_topic(domain_event_class)
@@ -135,15 +223,41 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
         # Compress plaintext bytes.
         if self.compressor:
             # Zlib reduces length by about 25% to 50%.
-            statebytes = self.compressor.compress(statebytes)
+            if self.compress_with_topic:
+                statebytes = self.compressor.compress(statebytes, topic)
+            else:
+                statebytes = self.compressor.compress(statebytes)
 
         # Encrypt serialised state.
-        if self.cipher:
+        if self.cipher and encrypt:
             # Increases length by about 10%.
-            statebytes = self.cipher.encrypt(statebytes)
+            if tracing.tracer is not None:
+                started = perf_counter()
+                statebytes = self.cipher.encrypt(statebytes)
+                self._add_to_current_span("encrypt_seconds", perf_counter() - started)
+            else:
+                statebytes = self.cipher.encrypt(statebytes)
 
         return topic, statebytes
 
+    def encrypt_many(self, plaintexts: List[bytes]) -> List[bytes]:
+        assert self.cipher is not None
+        if tracing.tracer is not None:
+            started = perf_counter()
+            ciphertexts = self.cipher.encrypt_many(plaintexts)
+            self._add_to_current_span("encrypt_seconds", perf_counter() - started)
+            return ciphertexts
+        return self.cipher.encrypt_many(plaintexts)
+
+    def decrypt_many(self, ciphertexts: List[bytes]) -> List[bytes]:
+        assert self.cipher is not None
+        if tracing.tracer is not None:
+            started = perf_counter()
+            plaintexts = self.cipher.decrypt_many(ciphertexts)
+            self._add_to_current_span("decrypt_seconds", perf_counter() - started)
+            return plaintexts
+        return self.cipher.decrypt_many(ciphertexts)
+
     def json_dumps(self, o: object) -> bytes:
         return self.json_encoder.encode(o)
 
@@ -166,41 +280,89 @@ class SequencedItemMapper(AbstractSequencedItemMapper[TEvent]):
 
         return self.event_from_topic_and_state(topic, state)
 
-    def event_from_topic_and_state(self, topic: str, state: bytes) -> TEvent:
-        domain_event_class, event_attrs = self.get_event_class_and_attrs(topic, state)
+    def events_from_items(self, sequenced_items: Iterable[NamedTuple]) -> List[TEvent]:
+        """
+        Reconstructs domain events from sequenced items, decrypting
+        the states of the items together.
+        """
+        if self.cipher is None:
+            return [self.event_from_item(i) for i in sequenced_items]
+
+        sequenced_items = list(sequenced_items)
+        states = self.decrypt_many(
+            [getattr(i, self.field_names.state) for i in sequenced_items]
+        )
+        return [
+            self.event_from_topic_and_state(
+                getattr(sequenced_item, self.field_names.topic), state, decrypt=False
+            )
+            for sequenced_item, state in zip(sequenced_items, states)
+        ]
+
+    def event_from_topic_and_state(
+        self, topic: str, state: bytes, decrypt: bool = True
+    ) -> TEvent:
+        domain_event_class, event_attrs = self.get_event_class_and_attrs(
+            topic, state, decrypt=decrypt
+        )
 
         # Reconstruct domain event object.
         return reconstruct_object(domain_event_class, event_attrs)
 
     def get_event_class_and_attrs(
-        self, topic: str, state: bytes
+        self, topic: str, state: bytes, decrypt: bool = True
     ) -> Tuple[Type[TEvent], Dict]:
         # Resolve topic to event class.
         domain_event_class: Type[TEvent] = resolve_topic(topic)
 
-        # Decrypt and decompress state.
-        if self.cipher:
-            state = self.cipher.decrypt(state)
+        # Decrypt state.
+        if self.cipher and decrypt:
+            if tracing.tracer is not None:
+                started = perf_counter()
+                state = self.cipher.decrypt(state)
+                self._add_to_current_span("decrypt_seconds", perf_counter() - started)
+            else:
+                state = self.cipher.decrypt(state)
 
         # Decompress plaintext bytes.
         if self.compressor:
-            state = self.compressor.decompress(state)
+            if self.compress_with_topic:
+                state = self.compressor.decompress(state, topic)
+            else:
+                state = self.compressor.decompress(state)
 
-        # Decode unicode bytes.
-        statestr = state.decode("utf8")
+        # Decode unicode bytes (or a memoryview of bytes).
+        statestr = str(state, "utf8")
 
         # Deserialize JSON.
-        event_attrs: Dict = self.json_loads(statestr)
+        if self.class_state_decoder is not None:
+            event_attrs: Dict = self.json_loads_for_class(domain_event_class, statestr)
+        else:
+            event_attrs = self.json_loads(statestr)
 
         # Return instance class and attribute values.
         return domain_event_class, event_attrs
 
+    @staticmethod
+    def _add_to_current_span(name: str, value: float) -> None:
+        if tracing.tracer is not None:
+            span = tracing.tracer.current_span()
+            if span is not None:
+                span.add(name, value)
+
     def json_loads(self, s: str) -> Dict:
         try:
             return self.json_decoder.decode(s)
         except JSONDecodeError:
             raise ValueError("Couldn't load JSON string: {}".format(s))
 
+    def json_loads_for_class(self, obj_class: type, s: str) -> Dict:
+        assert self.class_state_decoder is not None
+        try:
+            return self.class_state_decoder.decode(obj_class, s)
+        except JSONDecodeError:
+            raise ValueError("Couldn't load JSON string: {}".format(s))
+
     def event_from_notification(self, notification):
         """
         Reconstructs domain event from an event notification.
@@ -403,7 +403,9 @@ class SQLAlchemyRecordManager(SQLRecordManager):
         finally:
             self.session.close()
 
-    def get_max_tracking_record_id(self, upstream_application_name: str) -> int:
+    def get_max_tracking_record_id(
+        self, upstream_application_name: str, pipeline_id: Optional[int] = None
+    ) -> int:
         assert self.tracking_record_class is not None
         application_name_field = (
             self.tracking_record_class.application_name  # type: ignore
@@ -418,7 +420,9 @@ class SQLAlchemyRecordManager(SQLRecordManager):
         query = self.session.query(func.max(notification_id_field))
         query = query.filter(application_name_field == self.application_name)
         query = query.filter(upstream_app_name_field == upstream_application_name)
-        query = query.filter(pipeline_id_field == self.pipeline_id)
+        if pipeline_id is None:
+            pipeline_id = self.pipeline_id
+        query = query.filter(pipeline_id_field == pipeline_id)
         value = query.scalar() or 0
         return value
 
@@ -475,6 +479,20 @@ class SQLAlchemyRecordManager(SQLRecordManager):
         finally:
             self.session.close()
 
+    def update_record_state(self, record: Any, state: bytes) -> None:
+        """
+        Overwrites the state of given record in the table.
+        """
+        try:
+            setattr(record, self.field_names.state, state)
+            self.session.add(record)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            raise ProgrammingError(e)
+        finally:
+            self.session.close()
+
     def get_record_table_name(self, record_class: type) -> str:
         return record_class.__table__.name  # type: ignore
 
@@ -1,11 +1,16 @@
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from decimal import Decimal
-from typing import Iterable, Optional
+from threading import Lock
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Union
+from uuid import UUID
 
 from eventsourcing.domain.model.timebucketedlog import (
     MessageLogged,
     Timebucketedlog,
     make_timebucket_id,
+    make_timebucket_index_id,
     next_bucket_starts,
     previous_bucket_starts,
 )
@@ -19,14 +24,44 @@ def get_timebucketedlog_reader(
 
 
 class TimebucketedlogReader(object):
+    """
+    Reads the messages of a time-bucketed log.
+
+    Buckets can be read concurrently by a pool of threads,
+    which is shared by all instances of this class.
+    """
+
+    # Number of buckets that are read concurrently.
+    buckets_in_flight = 1
+    max_workers = 10
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = Lock()
+
     def __init__(
-        self, log: Timebucketedlog, event_store: AbstractEventStore, page_size: int = 50
+        self,
+        log: Timebucketedlog,
+        event_store: AbstractEventStore,
+        page_size: int = 50,
+        buckets_in_flight: Optional[int] = None,
     ):
         self.log = log
         self.event_store = event_store
         self.page_size = page_size
+        self.buckets_in_flight = buckets_in_flight or self.buckets_in_flight
         self.position: Optional[Decimal] = None
 
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns pool of threads used to read buckets.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers, thread_name_prefix="timebuckets"
+                )
+            return cls._executor
+
     def get_messages(
         self,
         gt: Optional[int] = None,
@@ -63,33 +98,42 @@ class TimebucketedlogReader(object):
     ) -> Iterable[MessageLogged]:
         assert limit is None or limit > 0
 
-        # Identify the first time bucket.
+        # Identify the first and last time buckets.
         now = time.time()
         started_on = self.log.started_on
         absolute_latest = min(float(now), lt or now, lte or now)
         absolute_earlyist = max(float(started_on), gt or 0, gte or 0)
-        if is_ascending:
-            position = absolute_earlyist
-        else:
-            position = absolute_latest
-
-        # Start counting events.
-        count_events = 0
 
-        while True:
-            bucket_id = make_timebucket_id(
-                self.log.name, position, self.log.bucket_size
-            )
-            for message_logged_event in self.event_store.iter_events(
-                originator_id=bucket_id,
+        if self.log.is_indexed:
+            bucket_ids = self.get_indexed_bucket_ids(
+                absolute_earlyist,
                 gt=gt,
                 gte=gte,
                 lt=lt,
                 lte=lte,
-                limit=limit,
                 is_ascending=is_ascending,
-                page_size=page_size,
-            ):
+            )
+        else:
+            bucket_ids = self.get_bucket_ids(
+                absolute_earlyist, absolute_latest, is_ascending=is_ascending
+            )
+
+        buckets = self.get_buckets(
+            bucket_ids,
+            gt=gt,
+            gte=gte,
+            lt=lt,
+            lte=lte,
+            limit=limit,
+            is_ascending=is_ascending,
+            page_size=page_size,
+        )
+
+        # Start counting events.
+        count_events = 0
+
+        for bucket in buckets:
+            for message_logged_event in bucket:
                 yield message_logged_event
 
                 if limit is not None:
@@ -97,6 +141,23 @@ class TimebucketedlogReader(object):
                     if count_events >= limit:
                         return
 
+    def get_bucket_ids(
+        self,
+        absolute_earlyist: Union[float, Decimal],
+        absolute_latest: Union[float, Decimal],
+        is_ascending: bool,
+    ) -> Iterator[UUID]:
+        """
+        Yields IDs of all the buckets between the given times.
+        """
+        if is_ascending:
+            position = absolute_earlyist
+        else:
+            position = absolute_latest
+
+        while True:
+            yield make_timebucket_id(self.log.name, position, self.log.bucket_size)
+
             # See if there's another bucket.
             if is_ascending:
                 next_timestamp = next_bucket_starts(position, self.log.bucket_size)
@@ -109,3 +170,70 @@ class TimebucketedlogReader(object):
                     return
                 else:
                     position = previous_bucket_starts(position, self.log.bucket_size)
+
+    def get_indexed_bucket_ids(
+        self,
+        absolute_earlyist: Union[float, Decimal],
+        gt: Optional[int] = None,
+        gte: Optional[int] = None,
+        lt: Optional[int] = None,
+        lte: Optional[int] = None,
+        is_ascending: bool = False,
+    ) -> Iterator[UUID]:
+        """
+        Yields IDs of the buckets that have messages, from the index of the log.
+        """
+        # Buckets are indexed at the time they start, so the bucket
+        # containing the earliest time may not be in the range.
+        first_bucket_id = make_timebucket_id(
+            self.log.name, absolute_earlyist, self.log.bucket_size
+        )
+        if is_ascending:
+            yield first_bucket_id
+
+        for bucket_started in self.event_store.iter_events(
+            originator_id=make_timebucket_index_id(self.log.name),
+            gt=gt,
+            gte=gte,
+            lt=lt,
+            lte=lte,
+            is_ascending=is_ascending,
+            page_size=self.page_size,
+        ):
+            if bucket_started.bucket_id != first_bucket_id:
+                yield bucket_started.bucket_id
+
+        if not is_ascending:
+            yield first_bucket_id
+
+    def get_buckets(
+        self, bucket_ids: Iterable[UUID], **kwargs: Any
+    ) -> Iterator[Iterable[MessageLogged]]:
+        """
+        Yields the events of each bucket.
+
+        Up to ``buckets_in_flight`` buckets are read concurrently,
+        with the buckets yielded in order.
+        """
+        if self.buckets_in_flight == 1:
+            for bucket_id in bucket_ids:
+                yield self.event_store.iter_events(originator_id=bucket_id, **kwargs)
+            return
+
+        # Read ahead up to buckets_in_flight buckets at a time.
+        executor = self.get_executor()
+        futures: Deque[Future] = deque()
+        try:
+            for bucket_id in bucket_ids:
+                futures.append(executor.submit(self.get_bucket, bucket_id, **kwargs))
+                if len(futures) == self.buckets_in_flight:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            # Cancel reading buckets that won't be used.
+            for future in futures:
+                future.cancel()
+
+    def get_bucket(self, bucket_id: UUID, **kwargs: Any) -> List[MessageLogged]:
+        return list(self.event_store.iter_events(originator_id=bucket_id, **kwargs))
@@ -0,0 +1,63 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from eventsourcing.domain.model.versioning import Upcastable
+from eventsourcing.infrastructure.base import AbstractEventStore
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+
+
+def upcast_stored_events(
+    event_store: AbstractEventStore,
+    originator_ids: Optional[Iterable[UUID]] = None,
+) -> int:
+    """
+    Rewrites stored events in place, so that the recorded state of each
+    event is compatible with the current version of its class.
+
+    Reading events that have already been upcast doesn't involve calling
+    any upcast methods, so running this migration after increasing the
+    version of a frequently used event class avoids having to pay the
+    cost of upcasting every time the events are retrieved.
+
+    This is intended to be used offline, when the application isn't
+    writing to the event store. Only the state of the stored events is
+    rewritten, so the state of snapshotted entities isn't upcast (a new
+    snapshot can be taken instead). Please note, upcasting changes the
+    state of an event, so events that have a cryptographic hash of their
+    original state will not pass hash checks after having been upcast.
+
+    :param event_store: Event store with records to be upcast.
+    :param originator_ids: Optional sequences to upcast (default all).
+    :return: Number of records that were rewritten.
+    """
+    record_manager = event_store.record_manager
+    event_mapper = event_store.event_mapper
+    assert isinstance(event_mapper, SequencedItemMapper), type(event_mapper)
+    if not record_manager.can_update_records:
+        raise NotImplementedError(
+            "Record manager can't update records: {}".format(type(record_manager))
+        )
+
+    if originator_ids is None:
+        originator_ids = record_manager.all_sequence_ids()
+
+    field_names = event_mapper.field_names
+    count = 0
+    for originator_id in originator_ids:
+        for record in record_manager.get_records(originator_id):
+            topic = getattr(record, field_names.topic)
+            state = getattr(record, field_names.state)
+            event_class, event_attrs = event_mapper.get_event_class_and_attrs(
+                topic, state
+            )
+            if not issubclass(event_class, Upcastable):
+                continue
+            class_version = event_attrs.get("__class_version__", 0)
+            if class_version >= event_class.__class_version__:
+                continue
+
+            event_attrs = event_class.__upcast_state__(event_attrs)
+            _, state = event_mapper.get_item_topic_and_state(event_class, event_attrs)
+            record_manager.update_record_state(record, state)
+            count += 1
+    return count
@@ -2,7 +2,8 @@ import weakref
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+from uuid import UUID
 
 from _weakref import ReferenceType
 from eventsourcing.application.popo import PopoApplication
@@ -16,6 +17,18 @@ TSystemRunner = TypeVar("TSystemRunner", bound="AbstractSystemRunner")
 TSystem = TypeVar("TSystem", bound="System")
 
 
+def partition(originator_id: UUID, pipeline_ids: Sequence[int]) -> int:
+    """
+    Returns the pipeline ID of the partition for the given originator ID.
+
+    All the events of an aggregate are processed in the same pipeline, and
+    aggregates are distributed evenly across the given pipeline IDs.
+    """
+    if not pipeline_ids:
+        raise ProgrammingError("No pipeline IDs to partition by")
+    return pipeline_ids[originator_id.int % len(pipeline_ids)]
+
+
 class System(object):
     """
     A system object has a set of pipeline expressions, which involve
@@ -92,6 +105,68 @@ class System(object):
         self.nodes_of_pipeline_spec = nodes
         self.edges_of_pipeline_spec = edges
 
+        # Find processes downstream of a process that merges pipelines.
+        self.merged_pipeline_ids: OrderedDict[str, int] = OrderedDict()
+        for process_name, process_class in self.process_classes.items():
+            merged_pipeline_id = process_class.merged_pipeline_id
+            if merged_pipeline_id is None:
+                continue
+            pending = list(self.downstream_names[process_name])
+            while pending:
+                downstream_name = pending.pop(0)
+                if downstream_name == process_name:
+                    raise ProgrammingError(
+                        "Process {} merges pipelines so can't be downstream "
+                        "of itself".format(process_name)
+                    )
+                existing = self.merged_pipeline_ids.get(downstream_name)
+                if existing is None:
+                    self.merged_pipeline_ids[downstream_name] = merged_pipeline_id
+                    pending.extend(self.downstream_names[downstream_name])
+                elif existing != merged_pipeline_id:
+                    raise ProgrammingError(
+                        "Process {} is downstream of pipelines merged into "
+                        "both {} and {}".format(
+                            downstream_name, existing, merged_pipeline_id
+                        )
+                    )
+
+        # Check processes downstream of a merge only follow merged pipelines.
+        for process_name in self.merged_pipeline_ids:
+            for upstream_name in self.upstream_names[process_name]:
+                if (
+                    upstream_name not in self.merged_pipeline_ids
+                    and self.process_classes[upstream_name].merged_pipeline_id is None
+                ):
+                    raise ProgrammingError(
+                        "Process {} is downstream of a merge so can't follow "
+                        "partitioned process {}".format(process_name, upstream_name)
+                    )
+
+    def get_pipeline_ids(
+        self, process_name: str, pipeline_ids: Sequence[int]
+    ) -> Sequence[int]:
+        """
+        Returns the IDs of the pipelines in which the named process should run.
+
+        A process downstream of a process that merges pipelines runs only in
+        the merged pipeline, otherwise processes run in all pipelines.
+        """
+        try:
+            return [self.merged_pipeline_ids[process_name]]
+        except KeyError:
+            return pipeline_ids
+
+    def get_output_pipeline_id(self, process_name: str, pipeline_id: int) -> int:
+        """
+        Returns the ID of the pipeline to which the named process, when running
+        in the given pipeline, writes its notifications.
+        """
+        merged_pipeline_id = self.process_classes[process_name].merged_pipeline_id
+        if merged_pipeline_id is not None:
+            return merged_pipeline_id
+        return self.merged_pipeline_ids.get(process_name, pipeline_id)
+
     def construct_app(
         self,
         process_class: Type[TProcessApplication],
@@ -203,6 +278,11 @@ class System(object):
 
 
 class AbstractSystemRunner(ABC):
+    pipeline_ids: Sequence[int] = (DEFAULT_PIPELINE_ID,)
+    # Whether the runner runs processes downstream of a
+    # merge only in the merged pipeline.
+    supports_merged_pipelines = False
+
     def __init__(
         self,
         system: System,
@@ -213,6 +293,14 @@ class AbstractSystemRunner(ABC):
         use_direct_query_if_available: bool = False,
     ):
         self.system = system
+        if not self.supports_merged_pipelines:
+            for process_name, process_class in system.process_classes.items():
+                if process_class.merged_pipeline_id is not None:
+                    raise ProgrammingError(
+                        "{} can't run process {} that merges pipelines".format(
+                            type(self).__name__, process_name
+                        )
+                    )
         self.infrastructure_class = (
             infrastructure_class or self.system.infrastructure_class
         )
@@ -222,6 +310,17 @@ class AbstractSystemRunner(ABC):
         )
         self.processes: Dict[str, Any] = {}
 
+    def get_pipeline_id(self, originator_id: UUID) -> int:
+        """
+        Returns the ID of the pipeline in which commands for the
+        aggregate with the given ID should be processed.
+
+        Commands aren't routed automatically. The caller needs to
+        change the pipeline of the application before the command
+        is executed, for example with ``change_pipeline()``.
+        """
+        return partition(originator_id, self.pipeline_ids)
+
     def __enter__(self: TSystemRunner) -> TSystemRunner:
         """
         Supports usage of a system runner as a context manager.
@@ -45,6 +45,7 @@ from eventsourcing.system.grpc.processor_pb2_grpc import (
     ProcessorStub,
     add_ProcessorServicer_to_server,
 )
+from eventsourcing.utils import metrics
 from eventsourcing.utils.topic import resolve_topic
 from eventsourcing.utils.transcoding import ObjectJSONDecoder, ObjectJSONEncoder
 
@@ -324,6 +325,10 @@ class ProcessorServer(ProcessorServicer):
             # self.prompt_events[upstream_name].set()
 
         self.downstream_prompt_event = Event()
+        self.downstream_prompt_lock = Lock()
+        self.num_prompts_pending = 0
+        self.num_prompts_received = 0
+        self.num_prompts_collapsed = 0
         subscribe(self._set_downstream_prompt_event, is_prompt_to_pull)
 
         self.serve()
@@ -385,6 +390,9 @@ class ProcessorServer(ProcessorServicer):
         #     "Setting downstream prompt event on %s for %s"
         #     % (self.application_name, event)
         # )
+        with self.downstream_prompt_lock:
+            self.num_prompts_pending += 1
+            self.num_prompts_received += 1
         self.downstream_prompt_event.set()
 
     def _push_prompts(self) -> None:
@@ -404,6 +412,23 @@ class ProcessorServer(ProcessorServicer):
     def __push_prompts(self):
         self.downstream_prompt_event.wait()
         self.downstream_prompt_event.clear()
+        # All the prompts since the last push are consolidated into one.
+        with self.downstream_prompt_lock:
+            num_prompts_pending = self.num_prompts_pending
+            if num_prompts_pending > 1:
+                self.num_prompts_collapsed += num_prompts_pending - 1
+            self.num_prompts_pending = 0
+        if metrics.sinks and num_prompts_pending:
+            metrics.increment(
+                "prompts_published_total",
+                num_prompts_pending,
+                application=self.application_name,
+            )
+            metrics.increment(
+                "prompts_collapsed_total",
+                num_prompts_pending - 1,
+                application=self.application_name,
+            )
         # logging.info("Pushing prompts from %s" % self.application_name)
         for downstream_name in self.downstreams:
             client = self.clients[downstream_name]
@@ -507,6 +532,12 @@ class ProcessorServer(ProcessorServicer):
         """
         Set prompt event for upstream name.
         """
+        if metrics.sinks:
+            metrics.increment(
+                "prompts_received_total",
+                application=self.application_name,
+                upstream=upstream_name,
+            )
         self.prompt_events[upstream_name].set()
 
     def GetNotifications(self, request, context):
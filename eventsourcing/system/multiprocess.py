@@ -1,8 +1,21 @@
+import ctypes
 import multiprocessing
+import pickle
+import struct
 from multiprocessing import Manager
 from queue import Empty, Queue
 from time import sleep
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from eventsourcing.application.notificationlog import RecordManagerNotificationLog
 from eventsourcing.application.popo import PopoApplication
@@ -11,22 +24,28 @@ from eventsourcing.application.simple import (
     ApplicationWithConcreteInfrastructure,
     Prompt,
     PromptToPull,
-    is_prompt_to_pull,
 )
-from eventsourcing.domain.model.decorators import retry
 from eventsourcing.domain.model.events import subscribe, unsubscribe
-from eventsourcing.exceptions import (
-    CausalDependencyFailed,
-    OperationalError,
-    ProgrammingError,
-    RecordConflictError,
+from eventsourcing.exceptions import ProgrammingError
+from eventsourcing.infrastructure.base import (
+    DEFAULT_PIPELINE_ID,
+    AbstractRecordManager,
 )
-from eventsourcing.infrastructure.base import DEFAULT_PIPELINE_ID
 from eventsourcing.system.definition import AbstractSystemRunner, System
-from eventsourcing.system.runner import DEFAULT_POLL_INTERVAL, PromptOutbox
+from eventsourcing.system.runner import (
+    DEFAULT_POLL_INTERVAL,
+    PromptOutbox,
+    RetryScheduler,
+    consolidate_prompts,
+    drain_prompts,
+    record_prompt_metrics,
+)
+from eventsourcing.utils import metrics
 
 
 class MultiprocessRunner(AbstractSystemRunner):
+    supports_merged_pipelines = True
+
     def __init__(
         self,
         system: System,
@@ -34,35 +53,83 @@ class MultiprocessRunner(AbstractSystemRunner):
         poll_interval: Optional[int] = None,
         setup_tables: bool = False,
         sleep_for_setup_tables: int = 0,
+        use_shared_memory: bool = False,
+        ring_buffer_size: int = 0,
+        ring_buffer_slot_size: int = 4096,
         **kwargs: Any
     ):
+        """
+        :param use_shared_memory: Whether to send prompts through shared memory
+            inboxes, rather than queues in a separate manager process.
+        :param ring_buffer_size: Number of recently written notifications of each
+            process application that are kept in shared memory (0 disables). The
+            process applications must set ``set_notification_ids=True``.
+        :param ring_buffer_slot_size: Maximum size in bytes of each notification
+            kept in shared memory (larger notifications are read from the database).
+        """
         super(MultiprocessRunner, self).__init__(system=system, **kwargs)
         self.pipeline_ids = pipeline_ids
         self.poll_interval = poll_interval or DEFAULT_POLL_INTERVAL
         assert isinstance(system, System)
         self.setup_tables = setup_tables or system.setup_tables
         self.sleep_for_setup_tables = sleep_for_setup_tables
+        self.use_shared_memory = use_shared_memory
+        self.ring_buffer_size = ring_buffer_size
+        self.ring_buffer_slot_size = ring_buffer_slot_size
+        if ring_buffer_size:
+            # Notifications are only written to the ring buffers
+            # if their IDs are set when the events are recorded.
+            for process_class in system.process_classes.values():
+                if not process_class.set_notification_ids:
+                    raise ProgrammingError(
+                        "Can't use ring buffers unless {} sets "
+                        "set_notification_ids=True".format(process_class.__name__)
+                    )
         self.os_processes: List[OperatingSystemProcess] = []
+        self.ring_buffers: Dict[Tuple[int, str], NotificationRingBuffer] = {}
 
     def start(self) -> None:
         self.os_processes = []
 
-        self.manager = Manager()
+        if not self.use_shared_memory:
+            self.manager = Manager()
 
         if TYPE_CHECKING:
-            self.inboxes: Dict[Tuple[int, str], Queue[Prompt]]
+            self.inboxes: Dict[Tuple[int, str], Union[Queue[Prompt], PromptInbox]]
             self.outboxes: Dict[Tuple[int, str], PromptOutbox[Tuple[int, str]]]
         self.inboxes = {}
         self.outboxes = {}
+        self.ring_buffers = {}
 
         # Setup queues.
-        for pipeline_id in self.pipeline_ids:
-            for process_name, upstream_names in self.system.upstream_names.items():
+        for process_name, upstream_names in self.system.upstream_names.items():
+            pipeline_ids = self.system.get_pipeline_ids(process_name, self.pipeline_ids)
+            for pipeline_id in pipeline_ids:
                 inbox_id = (pipeline_id, process_name.lower())
                 if inbox_id not in self.inboxes:
-                    self.inboxes[inbox_id] = self.manager.Queue()
+                    if self.use_shared_memory:
+                        self.inboxes[inbox_id] = PromptInbox(
+                            upstream_names=upstream_names, pipeline_id=pipeline_id
+                        )
+                    else:
+                        self.inboxes[inbox_id] = self.manager.Queue()
+                if self.ring_buffer_size:
+                    ring_buffer_id = (
+                        self.system.get_output_pipeline_id(process_name, pipeline_id),
+                        process_name.lower(),
+                    )
+                    if ring_buffer_id not in self.ring_buffers:
+                        self.ring_buffers[ring_buffer_id] = NotificationRingBuffer(
+                            num_slots=self.ring_buffer_size,
+                            slot_size=self.ring_buffer_slot_size,
+                        )
                 for upstream_class_name in upstream_names:
-                    outbox_id = (pipeline_id, upstream_class_name.lower())
+                    outbox_id = (
+                        self.system.get_output_pipeline_id(
+                            upstream_class_name, pipeline_id
+                        ),
+                        upstream_class_name.lower(),
+                    )
                     if outbox_id not in self.outboxes:
                         self.outboxes[outbox_id] = PromptOutbox()
                     if inbox_id not in self.outboxes[outbox_id].downstream_inboxes:
@@ -90,15 +157,30 @@ class MultiprocessRunner(AbstractSystemRunner):
 
         # Subscribe to broadcast prompts published by a process
         # application in the parent operating system process.
-        subscribe(handler=self.broadcast_prompt, predicate=is_prompt_to_pull)
+        subscribe(handler=self.broadcast_prompt, event_type=PromptToPull)
 
         # Start operating system process.
         expect_tables_exist = False
-        for pipeline_id in self.pipeline_ids:
-            for process_name, upstream_names in self.system.upstream_names.items():
-                process_class = self.system.process_classes[process_name]
+        for process_name, upstream_names in self.system.upstream_names.items():
+            process_class = self.system.process_classes[process_name]
+            pipeline_ids = self.system.get_pipeline_ids(process_name, self.pipeline_ids)
+            for pipeline_id in pipeline_ids:
+                output_pipeline_id = self.system.get_output_pipeline_id(
+                    process_name, pipeline_id
+                )
                 inbox = self.inboxes[(pipeline_id, process_name.lower())]
-                outbox = self.outboxes.get((pipeline_id, process_name.lower()))
+                outbox = self.outboxes.get((output_pipeline_id, process_name.lower()))
+                upstream_pipeline_ids = {
+                    name: self.system.get_output_pipeline_id(name, pipeline_id)
+                    for name in upstream_names
+                }
+                ring_buffers = {}
+                for name, p in list(upstream_pipeline_ids.items()) + [
+                    (process_name, output_pipeline_id)
+                ]:
+                    ring_buffer = self.ring_buffers.get((p, name.lower()))
+                    if ring_buffer is not None:
+                        ring_buffers[name.lower()] = ring_buffer
                 os_process = OperatingSystemProcess(
                     application_process_class=process_class,
                     infrastructure_class=self.infrastructure_class,
@@ -108,6 +190,8 @@ class MultiprocessRunner(AbstractSystemRunner):
                     setup_tables=self.setup_tables,
                     inbox=inbox,
                     outbox=outbox,
+                    ring_buffers=ring_buffers,
+                    upstream_pipeline_ids=upstream_pipeline_ids,
                 )
                 os_process.daemon = True
                 os_process.start()
@@ -125,12 +209,15 @@ class MultiprocessRunner(AbstractSystemRunner):
         outbox_id = (prompt.pipeline_id, prompt.process_name)
         outbox = self.outboxes.get(outbox_id)
         if outbox:
+            ring_buffer = self.ring_buffers.get(outbox_id)
+            if ring_buffer is not None and prompt.notifications:
+                ring_buffer.write(prompt.notifications)
             outbox.put(prompt)
 
     def close(self) -> None:
         super(MultiprocessRunner, self).close()
 
-        unsubscribe(handler=self.broadcast_prompt, predicate=is_prompt_to_pull)
+        unsubscribe(handler=self.broadcast_prompt, event_type=PromptToPull)
 
         for os_process in self.os_processes:
             os_process.inbox.put(PromptToQuit())
@@ -151,11 +238,13 @@ class OperatingSystemProcess(multiprocessing.Process):
         application_process_class: Type[ProcessApplication],
         infrastructure_class: Type[ApplicationWithConcreteInfrastructure],
         upstream_names: List[str],
-        inbox: Queue,
+        inbox: Union[Queue, "PromptInbox"],
         outbox: Optional[PromptOutbox[Tuple[int, str]]] = None,
         pipeline_id: int = DEFAULT_PIPELINE_ID,
         poll_interval: int = DEFAULT_POLL_INTERVAL,
         setup_tables: bool = False,
+        ring_buffers: Optional[Dict[str, "NotificationRingBuffer"]] = None,
+        upstream_pipeline_ids: Optional[Dict[str, int]] = None,
         *args: Any,
         **kwargs: Any
     ):
@@ -169,6 +258,10 @@ class OperatingSystemProcess(multiprocessing.Process):
         self.inbox = inbox
         self.outbox = outbox
         self.setup_tables = setup_tables
+        self.ring_buffers = ring_buffers or {}
+        self.upstream_pipeline_ids = upstream_pipeline_ids or {}
+        self.num_prompts_received = 0
+        self.num_prompts_collapsed = 0
 
     def run(self) -> None:
         # Construct process application class.
@@ -202,22 +295,29 @@ class OperatingSystemProcess(multiprocessing.Process):
                 # an API from which we can pull. It's not unreasonable to have a fixed
                 # number of application processes connecting to the same database.
                 record_manager = self.process.event_store.record_manager
-
-                notification_log = RecordManagerNotificationLog(
-                    record_manager=record_manager.clone(
-                        application_name=upstream_name,
-                        # Todo: Check if setting pipeline_id is necessary (it's the
-                        #  same?).
-                        pipeline_id=self.pipeline_id,
+                upstream_record_manager = record_manager.clone(
+                    application_name=upstream_name,
+                    # Read from the pipeline the upstream process writes
+                    # to, which is a merged pipeline if it merges pipelines.
+                    pipeline_id=self.upstream_pipeline_ids.get(
+                        upstream_name, self.pipeline_id
                     ),
-                    section_size=self.process.notification_log_section_size,
                 )
-                # Todo: Support upstream partition IDs different from self.pipeline_id?
-                # Todo: Support combining partitions. Read from different partitions
-                #  but write to the same partition,
-                # could be one os process that reads from many logs of the same
-                # upstream app, or many processes each
-                # reading one partition with contention writing to the same partition).
+                ring_buffer = self.ring_buffers.get(upstream_name.lower())
+                if ring_buffer is not None:
+                    # Read recently written notifications from shared memory.
+                    notification_log: RecordManagerNotificationLog = (
+                        RingBufferNotificationLog(
+                            record_manager=upstream_record_manager,
+                            section_size=self.process.notification_log_section_size,
+                            ring_buffer=ring_buffer,
+                        )
+                    )
+                else:
+                    notification_log = RecordManagerNotificationLog(
+                        record_manager=upstream_record_manager,
+                        section_size=self.process.notification_log_section_size,
+                    )
                 # Todo: Support dividing partitions Read from one but write to many.
                 #  Maybe one process per
                 # upstream partition, round-robin to pick partition for write. Or
@@ -245,15 +345,17 @@ class OperatingSystemProcess(multiprocessing.Process):
             # Make the process follow the upstream notification log.
             self.process.follow(upstream_name, notification_log)
 
+        # Schedule retries after errors without blocking other upstreams.
+        self.retries = RetryScheduler(self.process)
+
         # Subscribe to broadcast prompts published by the process application.
-        subscribe(handler=self.broadcast_prompt, predicate=is_prompt_to_pull)
+        subscribe(handler=self.broadcast_prompt, event_type=PromptToPull)
 
         try:
             self.loop_on_prompts()
         finally:
-            unsubscribe(handler=self.broadcast_prompt, predicate=is_prompt_to_pull)
+            unsubscribe(handler=self.broadcast_prompt, event_type=PromptToPull)
 
-    @retry(CausalDependencyFailed, max_attempts=100, wait=0.1)
     def loop_on_prompts(self) -> None:
 
         # Run once, in case prompts were missed.
@@ -261,30 +363,229 @@ class OperatingSystemProcess(multiprocessing.Process):
 
         # Loop on getting prompts.
         while True:
+            # Retry upstream applications after errors, when due.
+            self.retries.run_due()
             try:
                 # Todo: Make the poll interval gradually increase if there are only
                 #  timeouts?
-                item = self.inbox.get(timeout=self.poll_interval)
+                item = self.inbox.get(
+                    timeout=self.retries.get_timeout(self.poll_interval)
+                )
                 self.inbox.task_done()
 
-                if isinstance(item, PromptToQuit):
-                    self.process.close()
-                    break
+                # Consolidate the prompts that are waiting.
+                items = drain_prompts(self.inbox, item)
+                consolidated = consolidate_prompts(items)
+                self.num_prompts_received += len(items)
+                self.num_prompts_collapsed += len(items) - len(consolidated)
+                if metrics.sinks:
+                    record_prompt_metrics(self.process.name, items, consolidated)
 
-                elif isinstance(item, PromptToPull):
-                    self.run_process(item)
+                for item in consolidated:
+                    if isinstance(item, PromptToQuit):
+                        self.process.close()
+                        return
 
-                else:
-                    raise ProgrammingError("Unsupported prompt: {}".format(item))
+                    elif isinstance(item, PromptToPull):
+                        self.run_process(item)
+
+                    else:
+                        raise ProgrammingError("Unsupported prompt: {}".format(item))
 
             except Empty:
                 # Basically, we're polling after a timeout.
                 self.run_process()
 
-    @retry((OperationalError, RecordConflictError), max_attempts=100, wait=0.1)
-    def run_process(self, prompt: Optional[Prompt] = None) -> None:
-        self.process.run(prompt)
+    def run_process(self, prompt: Optional[PromptToPull] = None) -> None:
+        self.retries.run(prompt)
 
     def broadcast_prompt(self, prompt: PromptToPull) -> None:
         if self.outbox is not None:
+            ring_buffer = self.ring_buffers.get(prompt.process_name.lower())
+            if ring_buffer is not None and prompt.notifications:
+                ring_buffer.write(prompt.notifications)
             self.outbox.put(prompt)
+
+
+class PromptInbox(object):
+    """
+    Inbox for prompts, held in shared memory, which can be used instead of
+    a queue to send prompts between operating system processes.
+
+    Rather than queuing each prompt, the inbox has a flag for each upstream
+    process application, and the highest notification ID it has been prompted
+    with. Putting a prompt sets the flag and wakes the receiving process, which
+    gets one prompt for each upstream process application that was flagged.
+    Hence putting a prompt never blocks, the inbox doesn't grow, and there is
+    no need for a separate manager process to hold a shared queue.
+    """
+
+    def __init__(self, upstream_names: Sequence[str], pipeline_id: int):
+        self.upstream_names = [name.lower() for name in upstream_names]
+        self.pipeline_id = pipeline_id
+        self.lock = multiprocessing.Lock()
+        self.event = multiprocessing.Event()
+        num_upstream = len(self.upstream_names)
+        self.is_prompted = multiprocessing.RawArray(ctypes.c_bool, num_upstream)
+        self.head_ids = multiprocessing.RawArray(ctypes.c_longlong, num_upstream)
+        self.is_quitting = multiprocessing.RawValue(ctypes.c_bool, False)
+        self.received: List[Prompt] = []
+
+    def put(self, prompt: Prompt) -> None:
+        """
+        Puts prompt in the inbox.
+        """
+        with self.lock:
+            if isinstance(prompt, PromptToQuit):
+                self.is_quitting.value = True
+            elif isinstance(prompt, PromptToPull):
+                i = self.upstream_names.index(prompt.process_name.lower())
+                self.is_prompted[i] = True
+                head_id = prompt.head_notification_id or 0
+                self.head_ids[i] = max(self.head_ids[i], head_id)
+            else:
+                raise ProgrammingError("Unsupported prompt: {}".format(prompt))
+            self.event.set()
+
+    def get(self, timeout: Optional[float] = None) -> Prompt:
+        """
+        Gets prompt from the inbox.
+
+        :raises Empty: if there were no prompts before the timeout.
+        """
+        if not self.received:
+            if not self.event.wait(timeout):
+                raise Empty
+            with self.lock:
+                self.event.clear()
+                for i, upstream_name in enumerate(self.upstream_names):
+                    if self.is_prompted[i]:
+                        self.is_prompted[i] = False
+                        self.received.append(
+                            PromptToPull(
+                                upstream_name,
+                                self.pipeline_id,
+                                self.head_ids[i] or None,
+                            )
+                        )
+                if self.is_quitting.value:
+                    self.received.append(PromptToQuit())
+            if not self.received:
+                raise Empty
+        return self.received.pop(0)
+
+    def get_nowait(self) -> Prompt:
+        """
+        Gets prompt from the inbox, without waiting.
+
+        :raises Empty: if there were no prompts.
+        """
+        return self.get(timeout=0)
+
+    def task_done(self) -> None:
+        pass
+
+
+class NotificationRingBuffer(object):
+    """
+    Holds recently written notifications in shared memory, so that they can be
+    read by downstream operating system processes without querying the database.
+
+    Each notification is written to a slot determined by its ID. Hence the buffer
+    wraps around, and older notifications are overwritten by newer ones. A read
+    returns None if the slot doesn't hold the requested notification, for example
+    because it has been overwritten, or was too large to fit in a slot, or is
+    being written, and the notification can then be read from the database.
+    """
+
+    header = struct.Struct("qq")
+
+    def __init__(self, num_slots: int = 1000, slot_size: int = 4096):
+        if slot_size <= self.header.size:
+            raise ValueError("Slot size too small: {}".format(slot_size))
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.buffer = multiprocessing.RawArray(ctypes.c_char, num_slots * slot_size)
+        self.lock = multiprocessing.Lock()
+        self._view: Optional[memoryview] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_view"] = None
+        return state
+
+    @property
+    def view(self) -> memoryview:
+        if self._view is None:
+            self._view = memoryview(self.buffer).cast("B")  # type: ignore
+        return self._view
+
+    def write(self, notifications: Sequence[Dict[str, Any]]) -> None:
+        """
+        Writes notifications to their slots.
+        """
+        view = self.view
+        max_size = self.slot_size - self.header.size
+        with self.lock:
+            for notification in notifications:
+                notification_id = notification["id"]
+                offset = (notification_id % self.num_slots) * self.slot_size
+                # Invalidate the slot before writing the notification,
+                # so that readers don't see partly written notifications.
+                self.header.pack_into(view, offset, 0, 0)
+                data = pickle.dumps(notification, pickle.HIGHEST_PROTOCOL)
+                if len(data) > max_size:
+                    continue
+                start = offset + self.header.size
+                view[start : start + len(data)] = data
+                self.header.pack_into(view, offset, notification_id, len(data))
+
+    def read(self, notification_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns notification with given ID, or None if it isn't in the buffer.
+        """
+        view = self.view
+        offset = (notification_id % self.num_slots) * self.slot_size
+        slot_id, size = self.header.unpack_from(view, offset)
+        if slot_id != notification_id:
+            return None
+        start = offset + self.header.size
+        data = bytes(view[start : start + size])
+        # Check the slot wasn't overwritten whilst it was being read.
+        if self.header.unpack_from(view, offset)[0] != notification_id:
+            return None
+        return pickle.loads(data)
+
+
+class RingBufferNotificationLog(RecordManagerNotificationLog):
+    """
+    Notification log that gets recently written notifications from a ring
+    buffer in shared memory, and otherwise gets notifications from the
+    record manager.
+    """
+
+    def __init__(
+        self,
+        record_manager: AbstractRecordManager,
+        section_size: Optional[int] = None,
+        ring_buffer: Optional[NotificationRingBuffer] = None,
+    ):
+        super(RingBufferNotificationLog, self).__init__(
+            record_manager=record_manager, section_size=section_size
+        )
+        assert ring_buffer is not None
+        self.ring_buffer = ring_buffer
+
+    def get_items(self, start: int, stop: Optional[int]) -> Sequence[Any]:
+        items: List[Dict[str, Any]] = []
+        if stop is not None:
+            for notification_id in range(start + 1, stop + 1):
+                notification = self.ring_buffer.read(notification_id)
+                if notification is None:
+                    break
+                items.append(notification)
+            if len(items) == stop - start:
+                return items
+        # Get the rest from the database.
+        items.extend(self.record_manager.get_notifications(start + len(items), stop))
+        return items
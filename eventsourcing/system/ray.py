@@ -1,6 +1,6 @@
-import datetime
+import logging
 import os
-import traceback
+import random
 from inspect import ismethod
 from queue import Empty, Queue
 from threading import Event, Lock, Thread
@@ -34,9 +34,22 @@ from eventsourcing.system.definition import (
     System,
     TProcessApplication,
 )
-from eventsourcing.system.rayhelpers import RayDbJob, RayPrompt
+from eventsourcing.system.rayhelpers import (
+    NotificationBatch,
+    PromptedNotifications,
+    RayDbJob,
+    RayPrompt,
+)
 from eventsourcing.system.raysettings import ray_init_kwargs
-from eventsourcing.system.runner import DEFAULT_POLL_INTERVAL
+from eventsourcing.system.runner import (
+    DEFAULT_POLL_INTERVAL,
+    consolidate_prompts,
+    drain_prompts,
+    record_prompt_metrics,
+)
+from eventsourcing.utils import metrics
+
+logger = logging.getLogger(__name__)
 
 ray.init(**ray_init_kwargs)
 
@@ -181,6 +194,8 @@ class RayProcess:
         self.db_jobs_queue = Queue(maxsize=MAX_QUEUE_SIZE)
         self.upstream_event_queue = Queue(maxsize=MAX_QUEUE_SIZE)
         self.downstream_prompt_queue = Queue()  # no maxsize, call() can put prompt
+        self.num_prompts_received = 0
+        self.num_prompts_collapsed = 0
 
         self.has_been_stopped = Event()
         self.db_jobs_thread = Thread(target=self.db_jobs)
@@ -199,8 +214,8 @@ class RayProcess:
         self.push_prompts_thread.setDaemon(True)
         self.push_prompts_thread.start()
 
-        self._notification_rayids = {}
-        self._prompted_notifications = {}
+        self._notification_rayids = PromptedNotifications()
+        self._prompted_notifications = PromptedNotifications()
 
     def db_jobs(self):
         # print("Running do_jobs")
@@ -220,15 +235,22 @@ class RayProcess:
                     db_job.execute()
                 except Exception as e:
                     if db_job.error is None:
-                        print(traceback.format_exc())
-                        self._print_timecheck(
-                            "Continuing after error running DB job:", e
+                        logger.exception(
+                            "%s continuing after error running DB job: %s",
+                            self.process_application.name,
+                            e,
                         )
                         sleep(1)
                 # else:
                 #     self.print_timecheck("Done db job", item)
 
-    @retry((OperationalError, RecordConflictError), max_attempts=100, wait=0.01)
+    @retry(
+        (OperationalError, RecordConflictError),
+        max_attempts=100,
+        wait=0.01,
+        backoff=2,
+        max_wait=1,
+    )
     def do_db_job(self, method, args, kwargs):
         db_job = RayDbJob(method, args=args, kwargs=kwargs)
         self.db_jobs_queue.put(db_job)
@@ -333,15 +355,15 @@ class RayProcess:
         assert isinstance(prompt, RayPrompt), "Not a RayPrompt: %s" % prompt
         for notification_id, rayid in prompt.notification_ids:
             # self._print_timecheck("Received ray notification ID:", notification_id, rayid)
-            self._notification_rayids[(prompt.process_name, notification_id)] = rayid
+            self._notification_rayids.put(prompt.process_name, notification_id, rayid)
 
         latest_head = prompt.head_notification_id
         upstream_name = prompt.process_name
         if PROMPT_WITH_NOTIFICATION_OBJS:
             for notification in prompt.notifications:
-                self._prompted_notifications[
-                    (upstream_name, notification["id"])
-                ] = notification
+                self._prompted_notifications.put(
+                    upstream_name, notification["id"], notification
+                )
         if latest_head is not None:
             with self.heads_lock:
                 # Update head from prompt.
@@ -364,9 +386,11 @@ class RayProcess:
                 self.__process_prompts()
             except Exception as e:
                 if not self.has_been_stopped.is_set():
-                    print(traceback.format_exc())
-                    print("Continuing after error in 'process prompts' thread:", e)
-                    print()
+                    logger.exception(
+                        "%s continuing after error in 'process prompts' thread: %s",
+                        self.process_application.name,
+                        e,
+                    )
                     sleep(1)
 
     def __process_prompts(self):
@@ -390,6 +414,10 @@ class RayProcess:
                 current_position = self.positions.get(upstream_name)
             first_id = current_position + 1  # request the next one
 
+            # Release things from prompts that are no longer needed.
+            self._notification_rayids.evict(upstream_name, current_position)
+            self._prompted_notifications.evict(upstream_name, current_position)
+
             current_head = current_heads[upstream_name]
             if current_head is None:
                 last_id = None
@@ -418,39 +446,39 @@ class RayProcess:
             #  if we got full quota, then get again.
 
             notifications = []
-            if PROMPT_WITH_NOTIFICATION_IDS or PROMPT_WITH_NOTIFICATION_OBJS:
+            if PROMPT_WITH_NOTIFICATION_IDS:
+                while last_id is not None and first_id <= last_id:
+                    try:
+                        rayid = self._notification_rayids.pop(upstream_name, first_id)
+                    except KeyError:
+                        break
+                    else:
+                        # Get a batch of notifications with one call.
+                        batch = ray.get(rayid)
+                        # self._print_timecheck(
+                        #     "Got notification batch from ray id",
+                        #     first_id,
+                        #     rayid,
+                        #     len(batch),
+                        # )
+                        notifications.extend(batch)
+                        first_id = batch.ids[-1] + 1
+            elif PROMPT_WITH_NOTIFICATION_OBJS:
                 if last_id is not None:
                     for notification_id in range(first_id, last_id + 1):
-                        if PROMPT_WITH_NOTIFICATION_IDS:
-                            try:
-                                rayid = self._notification_rayids.pop(
-                                    (upstream_name, notification_id)
-                                )
-                            except KeyError:
-                                break
-                            else:
-                                notification = ray.get(rayid)
-                                # self._print_timecheck(
-                                #     "Got notification from ray id",
-                                #     notification_id,
-                                #     rayid,
-                                #     notification,
-                                # )
-                                notifications.append(notification)
-                        elif PROMPT_WITH_NOTIFICATION_OBJS:
-                            try:
-                                notification = self._prompted_notifications.pop(
-                                    (upstream_name, notification_id)
-                                )
-                                # self._print_timecheck(
-                                #     "Got notification from prompted notifications dict",
-                                #     notification_id,
-                                #     notification,
-                                # )
-                            except KeyError:
-                                break
-                            else:
-                                notifications.append(notification)
+                        try:
+                            notification = self._prompted_notifications.pop(
+                                upstream_name, notification_id
+                            )
+                            # self._print_timecheck(
+                            #     "Got notification from prompted notifications dict",
+                            #     notification_id,
+                            #     notification,
+                            # )
+                        except KeyError:
+                            break
+                        else:
+                            notifications.append(notification)
                         first_id += 1
 
             # Pull the ones we don't have.
@@ -458,9 +486,9 @@ class RayProcess:
                 # self._print_timecheck("Pulling notifications", first_id, last_id,
                 # 'from', upstream_name)
                 rayid = upstream_process.get_notifications.remote(first_id, last_id)
-                _notifications = ray.get(rayid)
-                # self._print_timecheck("Pulled notifications", _notifications)
-                notifications += _notifications
+                batch = ray.get(rayid)
+                # self._print_timecheck("Pulled notifications", len(batch))
+                notifications.extend(batch)
 
             # self.print_timecheck(
             #     "Obtained notifications:", len(notifications), 'from',
@@ -498,7 +526,7 @@ class RayProcess:
 
     def get_notifications(self, first_notification_id, last_notification_id):
         """
-        Returns a list of notifications, with IDs from first_notification_id
+        Returns a batch of notifications, with IDs from first_notification_id
         to last_notification_id, inclusive. IDs are 1-based sequence.
 
         This is called by the "process prompts" thread of a downstream process.
@@ -512,15 +540,22 @@ class RayProcess:
         assert isinstance(record_manager, RecordManagerWithNotifications)
         start = first_notification_id - 1
         stop = last_notification_id
-        return list(record_manager.get_notifications(start, stop))
+        return NotificationBatch.from_notifications(
+            list(record_manager.get_notifications(start, stop)),
+            topic_key=record_manager.field_names.topic,
+            state_key=record_manager.field_names.state,
+        )
 
     def _process_events(self):
         while not self.has_been_stopped.is_set():
             try:
                 self.__process_events()
             except Exception as e:
-                print(traceback.format_exc())
-                print("Continuing after error in 'process events' thread:", e)
+                logger.exception(
+                    "%s continuing after error in 'process events' thread: %s",
+                    self.process_application.name,
+                    e,
+                )
                 sleep(1)
 
     def __process_events(self):
@@ -539,6 +574,7 @@ class RayProcess:
                 # notification_id, upstream_name))
 
                 new_events, new_records = (), ()
+                attempts = 0
                 while not self.has_been_stopped.is_set():
                     try:
                         new_events, new_records = self.do_db_job(
@@ -548,12 +584,23 @@ class RayProcess:
                         )
                         break
                     except Exception as e:
-                        print(traceback.format_exc())
-                        self._print_timecheck(
-                            "Retrying to reprocess event after error:", e
+                        logger.exception(
+                            "%s retrying to reprocess event after error: %s",
+                            self.process_application.name,
+                            e,
                         )
-                        sleep(1)
-                        # Todo: Forever? What if this is the wrong event?
+                        if metrics.sinks:
+                            metrics.increment(
+                                "process_event_retries_total",
+                                application=self.process_application.name,
+                                upstream=upstream_name,
+                            )
+                        # Back off exponentially, with jitter. Events that
+                        # can never be processed are parked as dead letters
+                        # if the process application uses dead letters.
+                        attempts += 1
+                        delay = min(5.0, 0.01 * 2 ** attempts)
+                        sleep(delay * (1 - 0.5 * random.random()))
 
                 if self.has_been_stopped.is_set():
                     return
@@ -610,8 +657,15 @@ class RayProcess:
         # sleep(0.1)
 
     def _put_notifications_in_ray_object_store(self, notifications):
-        notification_ids = [(n["id"], ray.put(n)) for n in notifications]
-        return notification_ids
+        # Put all the notifications in the object store as one batch, which
+        # is identified by the ID of its first notification.
+        manager = self.process_application.event_store.record_manager
+        batch = NotificationBatch.from_notifications(
+            notifications,
+            topic_key=manager.field_names.topic,
+            state_key=manager.field_names.state,
+        )
+        return [(notifications[0]["id"], ray.put(batch))]
 
     def _enqueue_prompt_to_pull(self, prompt):
         # print("Enqueing locally published prompt:", prompt)
@@ -623,47 +677,56 @@ class RayProcess:
             try:
                 self.__push_prompts()
             except Exception as e:
-                print(traceback.format_exc())
-                print("Continuing after error in 'push prompts' thread:", e)
+                logger.exception(
+                    "%s continuing after error in 'push prompts' thread: %s",
+                    self.process_application.name,
+                    e,
+                )
                 sleep(1)
 
     def __push_prompts(self):
         try:
             item = self.downstream_prompt_queue.get()  # timeout=1)
             self.downstream_prompt_queue.task_done()
-            # Todo: Instead, drain the queue and consolidate prompts.
         except Empty:
-            self._print_timecheck(
-                "timed out getting item from downstream prompt " "queue"
-            )
+            self._log_timecheck("timed out getting item from downstream prompt queue")
             if self.has_been_stopped.is_set():
                 return
         else:
             # self.print_timecheck("task done on downstream prompt queue")
-            if item is None or self.has_been_stopped.is_set():
+            # Drain the queue and consolidate the prompts.
+            items = drain_prompts(self.downstream_prompt_queue, item)
+            if None in items or self.has_been_stopped.is_set():
                 return
-            elif isinstance(item, PromptToPull):
-                if item.head_notification_id:
-                    head_notification_id = item.head_notification_id
-                else:
-                    head_notification_id = self._get_max_notification_id()
-                prompt = RayPrompt(
-                    self.process_application.name,
-                    self.process_application.pipeline_id,
-                    head_notification_id,
+            prompts = []
+            for item in items:
+                if isinstance(item, PromptToPull):
+                    item = RayPrompt(
+                        self.process_application.name,
+                        self.process_application.pipeline_id,
+                        item.head_notification_id,
+                    )
+                prompts.append(item)
+            consolidated = consolidate_prompts(prompts)
+            self.num_prompts_received += len(prompts)
+            self.num_prompts_collapsed += len(prompts) - len(consolidated)
+            if metrics.sinks:
+                record_prompt_metrics(
+                    self.process_application.name, prompts, consolidated
                 )
-            else:
-                prompt = item
-            # self._print_timecheck('pushing prompt with', prompt.notification_ids)
-            prompt_response_ids = []
-            # self.print_timecheck("pushing prompts", prompt)
-            for downstream_name, ray_process in self.downstream_processes.items():
-                prompt_response_ids.append(ray_process.prompt.remote(prompt))
-                if self.has_been_stopped.is_set():
-                    return
-                # self._print_timecheck("pushed prompt to", downstream_name)
-            ray.get(prompt_response_ids)
-            # self._print_timecheck("pushed prompts")
+            for prompt in consolidated:
+                if not prompt.head_notification_id:
+                    prompt.head_notification_id = self._get_max_notification_id()
+                # self._print_timecheck('pushing prompt with', prompt.notification_ids)
+                prompt_response_ids = []
+                # self.print_timecheck("pushing prompts", prompt)
+                for downstream_name, ray_process in self.downstream_processes.items():
+                    prompt_response_ids.append(ray_process.prompt.remote(prompt))
+                    if self.has_been_stopped.is_set():
+                        return
+                    # self._print_timecheck("pushed prompt to", downstream_name)
+                ray.get(prompt_response_ids)
+                # self._print_timecheck("pushed prompts")
 
     def _get_max_notification_id(self):
         """
@@ -718,17 +781,16 @@ class RayProcess:
         # print("%s actor stopped %s" % (os.getpid(), datetime.datetime.now()))
         ray.actor.exit_actor()
 
-    def _print_timecheck(self, activity, *args):
-        # pass
-        process_name = self.application_process_class.__name__.lower()
-        print(
-            "Timecheck",
-            datetime.datetime.now(),
-            self.pipeline_id,
-            process_name,
-            activity,
-            *args
-        )
+    def _log_timecheck(self, activity, *args):
+        if logger.isEnabledFor(logging.DEBUG):
+            process_name = self.application_process_class.__name__.lower()
+            logger.debug(
+                "Timecheck %s %s %s %s",
+                self.pipeline_id,
+                process_name,
+                activity,
+                " ".join(str(arg) for arg in args),
+            )
 
 
 class ProxyApplication:
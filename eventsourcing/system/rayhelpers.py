@@ -1,5 +1,7 @@
+from array import array
 from datetime import datetime
 from threading import Event, Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from eventsourcing.application.simple import Prompt
 
@@ -59,6 +61,25 @@ class RayPrompt(Prompt):
         self.notification_ids = notification_ids
         self.notifications = notifications
 
+    def combine(self, later: "RayPrompt") -> "RayPrompt":
+        """
+        Returns a prompt with the highest head notification ID
+        of this prompt and a later prompt, and the notification
+        IDs and notifications carried by both.
+        """
+        head_ids = [
+            i
+            for i in (self.head_notification_id, later.head_notification_id)
+            if i is not None
+        ]
+        return type(self)(
+            self.process_name,
+            self.pipeline_id,
+            max(head_ids) if head_ids else None,
+            tuple(self.notification_ids) + tuple(later.notification_ids),
+            tuple(self.notifications) + tuple(later.notifications),
+        )
+
     def __repr__(self) -> str:
         return "{}({}={}, {}={}, {}={})".format(
             type(self).__name__,
@@ -71,5 +92,146 @@ class RayPrompt(Prompt):
         )
 
 
+class NotificationBatch(object):
+    """
+    Columnar batch of notifications, put in the Ray object store as one object.
+
+    The notification IDs are held in one array, the topics are held once each
+    with an array of indexes, and the states are held in one contiguous bytes
+    buffer with an array of offsets. Hence a whole page of notifications can
+    be got with one call to ray.get(), and the states are sliced from the
+    buffer as memoryviews, without being copied or unpickled one by one.
+    """
+
+    def __init__(
+        self,
+        ids: array,
+        topics: List[str],
+        topic_indexes: array,
+        states: bytes,
+        state_offsets: array,
+        causal_dependencies: Optional[List[Optional[str]]] = None,
+        topic_key: str = "topic",
+        state_key: str = "state",
+    ):
+        self.ids = ids
+        self.topics = topics
+        self.topic_indexes = topic_indexes
+        self.states = states
+        self.state_offsets = state_offsets
+        self.causal_dependencies = causal_dependencies
+        self.topic_key = topic_key
+        self.state_key = state_key
+
+    @classmethod
+    def from_notifications(
+        cls,
+        notifications: Sequence[Dict[str, Any]],
+        topic_key: str = "topic",
+        state_key: str = "state",
+    ) -> "NotificationBatch":
+        """
+        Constructs a batch from a sequence of notification dicts.
+        """
+        ids = array("q")
+        topics: List[str] = []
+        topic_indexes = array("l")
+        indexes_by_topic: Dict[str, int] = {}
+        states = bytearray()
+        state_offsets = array("q", [0])
+        causal_dependencies: Optional[List[Optional[str]]] = None
+        if notifications and "causal_dependencies" in notifications[0]:
+            causal_dependencies = []
+        for notification in notifications:
+            ids.append(notification["id"])
+            topic = notification[topic_key]
+            try:
+                topic_index = indexes_by_topic[topic]
+            except KeyError:
+                topic_index = indexes_by_topic[topic] = len(topics)
+                topics.append(topic)
+            topic_indexes.append(topic_index)
+            states += notification[state_key]
+            state_offsets.append(len(states))
+            if causal_dependencies is not None:
+                causal_dependencies.append(notification.get("causal_dependencies"))
+        return cls(
+            ids=ids,
+            topics=topics,
+            topic_indexes=topic_indexes,
+            states=bytes(states),
+            state_offsets=state_offsets,
+            causal_dependencies=causal_dependencies,
+            topic_key=topic_key,
+            state_key=state_key,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields notification dicts, with states as memoryviews of the buffer.
+        """
+        states = memoryview(self.states)
+        offsets = self.state_offsets
+        for i, notification_id in enumerate(self.ids):
+            notification = {
+                "id": notification_id,
+                self.topic_key: self.topics[self.topic_indexes[i]],
+                self.state_key: states[offsets[i] : offsets[i + 1]],
+            }
+            if self.causal_dependencies is not None:
+                notification["causal_dependencies"] = self.causal_dependencies[i]
+            yield notification
+
+
+class PromptedNotifications(object):
+    """
+    Keeps things received with prompts, such as Ray object refs of
+    notification batches, by upstream process name and notification ID.
+
+    Things that haven't been used by the time the reader's position has
+    passed their notification ID are evicted, so that, for example, the
+    object store can release batches that were sent with prompts that
+    weren't aligned with the reader's position.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[str, Dict[int, Any]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(items) for items in self._items.values())
+
+    def put(self, upstream_name: str, notification_id: int, item: Any) -> None:
+        with self._lock:
+            self._items.setdefault(upstream_name, {})[notification_id] = item
+
+    def pop(self, upstream_name: str, notification_id: int) -> Any:
+        """
+        Removes and returns the thing kept for the notification ID.
+
+        :raises KeyError: if nothing is kept for the notification ID
+        """
+        with self._lock:
+            return self._items[upstream_name].pop(notification_id)
+
+    def evict(self, upstream_name: str, position: int) -> int:
+        """
+        Discards the things kept for notification IDs at or below the
+        given position, and returns how many were discarded.
+        """
+        with self._lock:
+            items = self._items.get(upstream_name)
+            if not items:
+                return 0
+            evicted = [i for i in items if i <= position]
+            for notification_id in evicted:
+                del items[notification_id]
+            return len(evicted)
+
+
 class ProcessHasStopped(Exception):
     pass
@@ -1,6 +1,8 @@
+import logging
+import random
 import time
 from abc import abstractmethod
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from queue import Empty, Queue
 from threading import Barrier, BrokenBarrierError, Event, Lock, Thread, Timer
 from time import sleep
@@ -11,6 +13,7 @@ from typing import (
     Deque,
     Dict,
     Generic,
+    Iterable,
     List,
     Optional,
     Tuple,
@@ -25,21 +28,16 @@ from eventsourcing.application.simple import (
     ApplicationWithConcreteInfrastructure,
     Prompt,
     PromptToPull,
-    is_prompt_to_pull,
 )
-from eventsourcing.domain.model.decorators import retry
 from eventsourcing.domain.model.events import subscribe, unsubscribe
-from eventsourcing.exceptions import (
-    CausalDependencyFailed,
-    EventSourcingError,
-    OperationalError,
-    ProgrammingError,
-    RecordConflictError,
-)
+from eventsourcing.exceptions import EventSourcingError, ProgrammingError
 from eventsourcing.infrastructure.base import DEFAULT_PIPELINE_ID
 from eventsourcing.system.definition import AbstractSystemRunner, System
+from eventsourcing.utils import metrics
 from eventsourcing.whitehead import T
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_POLL_INTERVAL = 5
 
 
@@ -68,7 +66,7 @@ class InProcessRunner(AbstractSystemRunner):
                 downstream_process.follow(upstream_name, upstream_log)
 
         # Do something to propagate prompts.
-        subscribe(predicate=is_prompt_to_pull, handler=self.handle_prompt)
+        subscribe(handler=self.handle_prompt, event_type=PromptToPull)
 
     @abstractmethod
     def handle_prompt(self, prompt: Prompt) -> None:
@@ -81,7 +79,7 @@ class InProcessRunner(AbstractSystemRunner):
     def close(self) -> None:
         super(InProcessRunner, self).close()
 
-        unsubscribe(predicate=is_prompt_to_pull, handler=self.handle_prompt)
+        unsubscribe(handler=self.handle_prompt, event_type=PromptToPull)
 
 
 class SingleThreadedRunner(InProcessRunner):
@@ -141,6 +139,11 @@ class SingleThreadedRunner(InProcessRunner):
                                 ]
                                 downstream_process.run(prompt)
                                 i += 1
+                                if metrics.sinks:
+                                    metrics.increment(
+                                        "prompts_received_total",
+                                        application=downstream_name,
+                                    )
                         self.pending_prompts.task_done()
             finally:
                 # run_frequency = i / (time.time() - start_time)
@@ -239,9 +242,10 @@ class MultiThreadedRunner(InProcessRunner):
                 tick_oversize = tick_size - tick_interval
                 tick_oversize_percentage = 100 * (tick_oversize) / tick_interval
                 if tick_oversize_percentage > 300:
-                    print(
-                        f"Warning: Tick over size: {tick_size :.6f}s "
-                        f"{tick_oversize_percentage:.2f}%"
+                    logger.warning(
+                        "Tick over size: %.6fs %.2f%%",
+                        tick_size,
+                        tick_oversize_percentage,
                     )
 
                 if abs(tick_oversize_percentage) < 300:
@@ -307,21 +311,228 @@ class MultiThreadedRunner(InProcessRunner):
         self.inboxes.clear()
 
 
+def consolidate_prompts(prompts: Iterable[Any]) -> List[Any]:
+    """
+    Collapses prompts to pull from the same process application in the
+    same pipeline into one prompt, with the highest head notification ID.
+
+    Prompts to pull are those with a ``combine()`` method. Other prompts,
+    such as prompts to quit, are returned after the prompts to pull.
+    """
+    consolidated: Dict[Tuple[str, int], Any] = OrderedDict()
+    others = []
+    for prompt in prompts:
+        if not hasattr(prompt, "combine"):
+            others.append(prompt)
+            continue
+        key = (prompt.process_name, prompt.pipeline_id)
+        try:
+            earlier = consolidated[key]
+        except KeyError:
+            consolidated[key] = prompt
+        else:
+            consolidated[key] = earlier.combine(prompt)
+    return list(consolidated.values()) + others
+
+
+def drain_prompts(inbox: Any, prompt: Any) -> List[Any]:
+    """
+    Returns the given prompt, followed by any other prompts
+    that are already waiting in the inbox.
+    """
+    prompts = [prompt]
+    while True:
+        try:
+            prompts.append(inbox.get_nowait())
+        except Empty:
+            break
+        else:
+            inbox.task_done()
+    return prompts
+
+
+def record_prompt_metrics(
+    application_name: str, prompts: List[Any], consolidated: List[Any]
+) -> None:
+    """
+    Records the number of prompts drained from an inbox, and how
+    many of them were collapsed when they were consolidated.
+    """
+    metrics.gauge("prompt_queue_depth", len(prompts), application=application_name)
+    metrics.increment(
+        "prompts_received_total", len(prompts), application=application_name
+    )
+    metrics.increment(
+        "prompts_collapsed_total",
+        len(prompts) - len(consolidated),
+        application=application_name,
+    )
+
+
+class RetryScheduler(object):
+    """
+    Runs a process application, and schedules retries after retryable
+    exceptions (such as operational errors, record conflicts, and failed
+    causal dependencies) for each upstream application.
+
+    Rather than sleeping for a fixed time before retrying, the upstream
+    application is retried after a delay that increases exponentially
+    with each attempt, with random jitter, whilst the notifications of
+    other upstream applications continue to be processed.
+    """
+
+    def __init__(
+        self,
+        process: ProcessApplication,
+        initial_delay: float = 0.01,
+        max_delay: float = 5.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        :param process: Process application to be run.
+        :param initial_delay: Delay before the first retry.
+        :param max_delay: Maximum delay before a retry.
+        :param multiplier: Factor by which the delay increases with each attempt.
+        :param jitter: Fraction of the delay that is random.
+        :param max_attempts: Number of attempts after which an exception
+            is raised (default is to keep retrying).
+        """
+        self.process = process
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.attempts: Dict[str, int] = defaultdict(int)
+        self.scheduled: Dict[str, Tuple[float, PromptToPull]] = {}
+
+    def get_delay(self, attempts: int) -> float:
+        """
+        Returns the delay before retrying after the given number of attempts.
+        """
+        delay = self.initial_delay * self.multiplier ** (attempts - 1)
+        delay = min(self.max_delay, delay)
+        return delay * (1 - self.jitter * random.random())
+
+    def run(self, prompt: Optional[PromptToPull] = None) -> None:
+        """
+        Runs the process application with the given prompt, or
+        with all the upstream applications if there is no prompt.
+
+        Prompts for an upstream application that has a scheduled
+        retry are combined with the scheduled prompt.
+        """
+        if prompt is None:
+            prompts = [
+                PromptToPull(upstream_name, self.process.pipeline_id)
+                for upstream_name in self.process.readers
+            ]
+        else:
+            prompts = [prompt]
+        for prompt in prompts:
+            upstream_name = prompt.process_name
+            if upstream_name in self.scheduled:
+                due, scheduled = self.scheduled[upstream_name]
+                self.scheduled[upstream_name] = (due, scheduled.combine(prompt))
+                continue
+            try:
+                self.process.run(prompt)
+            except self.process.retryable_exceptions:
+                self.attempts[upstream_name] += 1
+                attempts = self.attempts[upstream_name]
+                if self.max_attempts is not None and attempts >= self.max_attempts:
+                    del self.attempts[upstream_name]
+                    raise
+                due = time.monotonic() + self.get_delay(attempts)
+                self.scheduled[upstream_name] = (due, prompt)
+                if metrics.sinks:
+                    metrics.increment(
+                        "retries_scheduled_total",
+                        application=self.process.name,
+                        upstream=upstream_name,
+                    )
+            else:
+                self.attempts.pop(upstream_name, None)
+
+    def run_due(self) -> None:
+        """
+        Runs the process application with the prompts that are due to be retried.
+        """
+        now = time.monotonic()
+        for upstream_name, (due, prompt) in list(self.scheduled.items()):
+            if due <= now:
+                del self.scheduled[upstream_name]
+                self.run(prompt)
+
+    def get_timeout(self, timeout: float) -> float:
+        """
+        Returns the given timeout, or less if a retry is due sooner.
+        """
+        if self.scheduled:
+            next_due = min(due for due, _ in self.scheduled.values())
+            timeout = max(0.0, min(timeout, next_due - time.monotonic()))
+        return timeout
+
+
 class PromptOutbox(Generic[T]):
     """
     Has a collection of downstream prompt inboxes.
 
+    Prompts that are put whilst prompts are being delivered are
+    consolidated, so that one prompt for each upstream process
+    application and pipeline is delivered to each downstream inbox.
     """
 
     def __init__(self) -> None:
         self.downstream_inboxes: Dict[T, Queue] = {}
+        self.num_prompts_put = 0
+        self.num_prompts_collapsed = 0
+        self._init_delivery()
+
+    def _init_delivery(self) -> None:
+        self._lock = Lock()
+        self._pending: List[Union[PromptToPull, str]] = []
+        self._is_delivering = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in ("_lock", "_pending", "_is_delivering"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_delivery()
 
     def put(self, prompt: Union[PromptToPull, str]) -> None:
         """
         Puts prompt in each downstream inbox (an actual queue).
         """
-        for queue in self.downstream_inboxes.values():
-            queue.put(prompt)
+        with self._lock:
+            self._pending.append(prompt)
+            self.num_prompts_put += 1
+            if self._is_delivering:
+                # The delivering thread will deliver this prompt.
+                return
+            self._is_delivering = True
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._is_delivering = False
+                        return
+                    prompts = consolidate_prompts(self._pending)
+                    self.num_prompts_collapsed += len(self._pending) - len(prompts)
+                    self._pending = []
+                for prompt in prompts:
+                    for queue in self.downstream_inboxes.values():
+                        queue.put(prompt)
+        except BaseException:
+            with self._lock:
+                self._is_delivering = False
+            raise
 
 
 class PromptQueuedApplicationThread(Thread):
@@ -360,6 +571,9 @@ class PromptQueuedApplicationThread(Thread):
         self.outbox = outbox
         self.clock_event = clock_event
         self.is_running = Event()
+        self.num_prompts_received = 0
+        self.num_prompts_collapsed = 0
+        self.retries = RetryScheduler(process)
 
     def run(self) -> None:
         self.loop_on_prompts()
@@ -369,10 +583,15 @@ class PromptQueuedApplicationThread(Thread):
         # Loop on getting prompts.
         self.is_running.set()
         while True:
+            # Retry upstream applications after errors, when due.
+            if self.clock_event is None:
+                self.run_due_retries()
             try:
                 # Todo: Make the poll interval gradually
                 #  increase if there are only timeouts?
-                prompt = self.inbox.get(timeout=self.poll_interval)
+                prompt = self.inbox.get(
+                    timeout=self.retries.get_timeout(self.poll_interval)
+                )
 
             except Empty:
                 # Basically, we're polling after a timeout.
@@ -382,47 +601,61 @@ class PromptQueuedApplicationThread(Thread):
             else:
                 self.inbox.task_done()
 
-                if isinstance(prompt, PromptToQuit):
-                    self.app.close()
-                    break
+                # Consolidate the prompts that are waiting.
+                prompts = drain_prompts(self.inbox, prompt)
+                consolidated = consolidate_prompts(prompts)
+                self.num_prompts_received += len(prompts)
+                self.num_prompts_collapsed += len(prompts) - len(consolidated)
+                if metrics.sinks:
+                    record_prompt_metrics(self.app.name, prompts, consolidated)
 
-                elif isinstance(prompt, PromptToPull):
-                    started = None
-                    if self.clock_event is not None:
-                        self.clock_event.wait()
-                        started = time.time()
-
-                    self.run_process(prompt)
-
-                    if self.clock_event is not None:
-                        assert started
-                        ended = time.time()
-                        duration = ended - started
-                        if self.clock_event.is_set():
-                            print(
-                                f"Warning: Process {self.app.name} overran clock "
-                                f"cycle: {duration}"
-                            )
-                        else:
-                            print(
-                                f"Info: Process {self.app.name} ran within clock "
-                                f"cycle: {duration}"
-                            )
-                else:
-                    raise Exception("Unsupported prompt: {}".format(prompt))
+                for prompt in consolidated:
+                    if isinstance(prompt, PromptToQuit):
+                        self.app.close()
+                        return
+
+                    elif isinstance(prompt, PromptToPull):
+                        self.process_prompt(prompt)
+
+                    else:
+                        raise Exception("Unsupported prompt: {}".format(prompt))
+
+    def process_prompt(self, prompt: PromptToPull) -> None:
+        started = None
+        if self.clock_event is not None:
+            self.clock_event.wait()
+            started = time.time()
+
+        self.run_process(prompt)
+
+        if self.clock_event is not None:
+            assert started
+            ended = time.time()
+            duration = ended - started
+            if self.clock_event.is_set():
+                logger.warning(
+                    "%s overran clock cycle: %.6fs", self.app.name, duration
+                )
+                if metrics.sinks:
+                    metrics.increment(
+                        "tick_interval_overruns_total", application=self.app.name
+                    )
+            else:
+                logger.debug(
+                    "%s ran within clock cycle: %.6fs", self.app.name, duration
+                )
 
     def run_process(self, prompt: Optional[PromptToPull] = None) -> None:
         try:
-            self._run_process(prompt)
-        except CausalDependencyFailed:
-            pass
+            self.retries.run(prompt)
         except EventSourcingError:
             pass
 
-    @retry(CausalDependencyFailed, max_attempts=100, wait=0.2)
-    @retry((OperationalError, RecordConflictError), max_attempts=100, wait=0.01)
-    def _run_process(self, prompt: Optional[PromptToPull] = None) -> None:
-        self.app.run(prompt)
+    def run_due_retries(self) -> None:
+        try:
+            self.retries.run_due()
+        except EventSourcingError:
+            pass
 
 
 class SteppingRunner(InProcessRunner):
@@ -482,7 +715,7 @@ class SteppingSingleThreadedRunner(SteppingRunner):
         if self.clock_thread:
             self.clock_thread.join(5)
             if self.clock_thread.is_alive():
-                print("Warning: clock thread was still alive")
+                logger.warning("Clock thread was still alive")
 
 
 class ClockThread(Thread):
@@ -757,10 +990,8 @@ class SteppingMultiThreadedRunner(SteppingRunner):
         for thread in self.application_threads.values():
             thread.join(timeout=1)
             if thread.is_alive():
-                print(
-                    f"Warning: application thread '"
-                    f"{thread.app.name}"
-                    f"' was still alive."
+                logger.warning(
+                    "Application thread '%s' was still alive", thread.app.name
                 )
 
         self.application_threads.clear()
@@ -768,7 +999,7 @@ class SteppingMultiThreadedRunner(SteppingRunner):
         if self.clock_thread:
             self.clock_thread.join(timeout=1)
             if self.clock_thread.is_alive():
-                print(f"Warning: clock thread was still alive")
+                logger.warning("Clock thread was still alive")
 
 
 class BarrierControlledApplicationThread(Thread):
@@ -325,8 +325,8 @@ class ProcessSlave(Actor):
         #  - slave actor process application doesn't publish
         #    events, so we don't need this
         unsubscribe(
-            predicate=self.process.persistence_policy.is_event,
             handler=self.process.publish_prompt_for_events,
+            event_type=self.process.persistence_policy.persist_event_type,
         )
 
         # Construct and follow upstream notification logs.
@@ -0,0 +1,377 @@
+"""
+Benchmarks of the library, which can be run on POPO and SQLite, and
+also with Django (on SQLite, unless DJANGO_SETTINGS_MODULE is set).
+
+The results are JSON, and can be saved as a baseline, so that later
+results can be compared with the baseline to catch regressions::
+
+    $ python -m eventsourcing.tests.benchmarks --output baseline.json
+    $ python -m eventsourcing.tests.benchmarks --baseline baseline.json
+
+Each benchmark is run a number of times, and the best time is used to
+calculate the throughput, so that results are reproducible on a quiet machine.
+Benchmarks of memory usage also record the number of bytes used by each operation.
+"""
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eventsourcing import __version__
+from eventsourcing.application.popo import PopoApplication
+from eventsourcing.application.simple import (
+    ApplicationWithConcreteInfrastructure,
+    SimpleApplication,
+)
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.exceptions import ProgrammingError
+
+POPO = "popo"
+SQLITE = "sqlite"
+DJANGO = "django"
+BACKENDS = (POPO, SQLITE, DJANGO)
+DEFAULT_BACKENDS = (POPO, SQLITE)
+
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+
+Result = Dict[str, Any]
+BenchmarkFunc = Callable[["BenchmarkContext"], None]
+
+
+class Benchmark(object):
+    """
+    Registered benchmark, run with each of its backends.
+    """
+
+    def __init__(
+        self, name: str, func: BenchmarkFunc, backends: Sequence[Optional[str]]
+    ):
+        self.name = name
+        self.func = func
+        self.backends = backends
+
+
+benchmarks: "OrderedDict[str, Benchmark]" = OrderedDict()
+
+
+def benchmark(
+    name: str, backends: Sequence[Optional[str]] = DEFAULT_BACKENDS
+) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """
+    Registers decorated function as a benchmark.
+
+    Benchmarks that don't depend on infrastructure can be registered
+    with the backend None, so they are run only once.
+    """
+
+    def decorator(func: BenchmarkFunc) -> BenchmarkFunc:
+        if name in benchmarks:
+            raise ProgrammingError("Benchmark already registered: {}".format(name))
+        benchmarks[name] = Benchmark(name, func, backends)
+        return func
+
+    return decorator
+
+
+class BenchmarkContext(object):
+    """
+    Passed to benchmark functions, to construct applications and
+    record timings. The sizes of benchmarks are multiplied by the scale.
+    """
+
+    def __init__(
+        self, name: str, backend: Optional[str], scale: float, repeat: int, db_dir: str
+    ):
+        self.name = name
+        self.backend = backend
+        self.scale = scale
+        self.repeat = repeat
+        self.db_dir = db_dir
+        self.results: List[Result] = []
+        self._db_count = 0
+
+    def size(self, n: int) -> int:
+        """
+        Returns the given size multiplied by the scale (at least one).
+        """
+        return max(1, int(n * self.scale))
+
+    @property
+    def infrastructure_class(self) -> type:
+        if self.backend == POPO:
+            return PopoApplication
+        elif self.backend == SQLITE:
+            return SQLAlchemyApplication
+        elif self.backend == DJANGO:
+            from eventsourcing.application.django import DjangoApplication
+
+            return DjangoApplication
+        else:
+            raise ProgrammingError("Unsupported backend: {}".format(self.backend))
+
+    def new_db_uri(self) -> Optional[str]:
+        """
+        Returns the URI of a new SQLite database file, or None for POPO.
+        """
+        if self.backend != SQLITE:
+            return None
+        self._db_count += 1
+        path = os.path.join(self.db_dir, "{}-{}.db".format(self.name, self._db_count))
+        return "sqlite:///{}".format(path)
+
+    def construct_application(
+        self, application_class: type = SimpleApplication, **kwargs: Any
+    ) -> ApplicationWithConcreteInfrastructure:
+        """
+        Constructs application with the backend's infrastructure,
+        and a new database.
+        """
+        if self.backend == SQLITE:
+            kwargs.setdefault("uri", self.new_db_uri())
+        elif self.backend == DJANGO:
+            setup_django_database()
+        app_class = application_class.mixin(self.infrastructure_class)
+        return app_class(**kwargs)
+
+    def measure(
+        self,
+        func: Callable[[], Any],
+        ops: int,
+        setup: Optional[Callable[[], Any]] = None,
+        **params: Any
+    ) -> Result:
+        """
+        Times calling func, repeatedly, and records the best time.
+
+        :param func: Function that performs the operations.
+        :param ops: Number of operations performed by each call of func.
+        :param setup: Optional function called (untimed) before each call of func.
+        :param params: Parameters of the benchmark, which identify the result.
+        """
+        times = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            started = perf_counter()
+            func()
+            times.append(perf_counter() - started)
+        return self.record(ops, times, **params)
+
+    def measure_memory(
+        self,
+        func: Callable[[], Any],
+        ops: int,
+        setup: Optional[Callable[[], Any]] = None,
+        **params: Any
+    ) -> Result:
+        """
+        Times calling func, like measure(), and also records the number of bytes
+        allocated by func for each operation that are still in use when it returns.
+
+        The value returned by func is kept until the memory has been measured,
+        so that the memory it uses is counted. Times include the overhead of
+        tracing memory allocations.
+        """
+        times = []
+        sizes = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                started = perf_counter()
+                value = func()
+                times.append(perf_counter() - started)
+                gc.collect()
+                sizes.append(tracemalloc.get_traced_memory()[0])
+            finally:
+                tracemalloc.stop()
+            del value
+        result = self.record(ops, times, **params)
+        result["bytes_per_op"] = min(sizes) / ops
+        return result
+
+    def record(self, ops: int, times: List[float], **params: Any) -> Result:
+        """
+        Records times taken to perform a number of operations.
+        """
+        best = min(times)
+        result: Result = OrderedDict()
+        result["name"] = self.name
+        result["backend"] = self.backend
+        result["params"] = OrderedDict(sorted(params.items()))
+        result["ops"] = ops
+        result["seconds"] = best
+        result["ops_per_second"] = ops / best if best else None
+        result["times"] = times
+        self.results.append(result)
+        return result
+
+
+def setup_django_database() -> None:
+    """
+    Sets up Django with an in-memory SQLite database, unless Django
+    has been configured with DJANGO_SETTINGS_MODULE, and creates the tables.
+    """
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if not settings.configured and not os.getenv("DJANGO_SETTINGS_MODULE"):
+        settings.configure(
+            DATABASES={
+                "default": {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": ":memory:",
+                }
+            },
+            INSTALLED_APPS=["eventsourcing.infrastructure.django"],
+            USE_TZ=True,
+        )
+    django.setup()
+    call_command("migrate", verbosity=0, interactive=False)
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    backends: Iterable[str] = DEFAULT_BACKENDS,
+    scale: float = 1.0,
+    repeat: int = DEFAULT_REPEAT,
+    report: Optional[Callable[[Result], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs benchmarks, and returns the results with metadata about the run.
+    """
+    # Register the library's benchmarks.
+    import eventsourcing.tests.benchmarks.scenarios  # noqa: F401
+
+    if names is None:
+        selected = list(benchmarks.values())
+    else:
+        selected = []
+        for name in names:
+            try:
+                selected.append(benchmarks[name])
+            except KeyError:
+                raise ProgrammingError("Benchmark not registered: {}".format(name))
+
+    backends = list(backends)
+    results: List[Result] = []
+    db_dir = tempfile.mkdtemp(prefix="eventsourcing-benchmarks-")
+    try:
+        for bench in selected:
+            for backend in bench.backends:
+                if backend is not None and backend not in backends:
+                    continue
+                context = BenchmarkContext(bench.name, backend, scale, repeat, db_dir)
+                bench.func(context)
+                for result in context.results:
+                    if report is not None:
+                        report(result)
+                    results.append(result)
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    return OrderedDict(
+        [
+            ("metadata", get_metadata(scale=scale, repeat=repeat)),
+            ("results", results),
+        ]
+    )
+
+
+def get_metadata(**kwargs: Any) -> Dict[str, Any]:
+    metadata: Dict[str, Any] = OrderedDict()
+    metadata["eventsourcing"] = __version__
+    metadata["python"] = sys.version.split()[0]
+    metadata["implementation"] = platform.python_implementation()
+    metadata["platform"] = platform.platform()
+    metadata["machine"] = platform.machine()
+    metadata["timestamp"] = datetime.now(timezone.utc).isoformat()
+    metadata.update(kwargs)
+    return metadata
+
+
+def result_key(result: Result) -> Tuple:
+    """
+    Returns key that identifies a result, so it can be matched with a baseline.
+    """
+    return (
+        result["name"],
+        result["backend"],
+        tuple(sorted((k, str(v)) for k, v in result["params"].items())),
+    )
+
+
+def compare_results(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """
+    Compares results with a baseline, and returns the regressions.
+
+    A result has regressed if its throughput is less than the
+    throughput of the baseline by more than the tolerance (a fraction).
+    Results that don't have a baseline are ignored.
+    """
+    baselines = {result_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        try:
+            base = baselines[result_key(result)]
+        except KeyError:
+            continue
+        if not base["ops_per_second"] or not result["ops_per_second"]:
+            continue
+        ratio = result["ops_per_second"] / base["ops_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                OrderedDict(
+                    [
+                        ("name", result["name"]),
+                        ("backend", result["backend"]),
+                        ("params", result["params"]),
+                        ("baseline_ops_per_second", base["ops_per_second"]),
+                        ("ops_per_second", result["ops_per_second"]),
+                        ("ratio", ratio),
+                    ]
+                )
+            )
+    return regressions
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_result(result: Result) -> str:
+    params = ", ".join("{}={}".format(k, v) for k, v in result["params"].items())
+    formatted = "{:<20} {:<7} {:<45} {:>12.0f} ops/s ({:.6f}s for {} ops)".format(
+        result["name"],
+        result["backend"] or "-",
+        params,
+        result["ops_per_second"] or 0,
+        result["seconds"],
+        result["ops"],
+    )
+    if "bytes_per_op" in result:
+        formatted += " {:.0f} bytes/op".format(result["bytes_per_op"])
+    return formatted
@@ -0,0 +1,81 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from eventsourcing.tests.benchmarks import (
+    BACKENDS,
+    DEFAULT_BACKENDS,
+    DEFAULT_REPEAT,
+    DEFAULT_TOLERANCE,
+    compare_results,
+    format_result,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m eventsourcing.tests.benchmarks",
+        description="Runs benchmarks, and compares results with a saved baseline.",
+    )
+    parser.add_argument(
+        "names", nargs="*", help="names of benchmarks to run (default all)"
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=BACKENDS,
+        help="backend to run benchmarks on (default {})".format(
+            " and ".join(DEFAULT_BACKENDS)
+        ),
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiplies sizes of benchmarks"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="times to run each benchmark"
+    )
+    parser.add_argument("--output", help="file to write JSON results to")
+    parser.add_argument("--baseline", help="file of JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="fraction by which throughput may fall below the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        names=args.names or None,
+        backends=args.backend or DEFAULT_BACKENDS,
+        scale=args.scale,
+        repeat=args.repeat,
+        report=lambda result: print(format_result(result)),
+    )
+
+    if args.output:
+        save_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare_results(
+            results, load_results(args.baseline), tolerance=args.tolerance
+        )
+        for regression in regressions:
+            print(
+                "Regression: {} {} {}: {:.0f} ops/s (baseline {:.0f} ops/s)".format(
+                    regression["name"],
+                    regression["backend"] or "-",
+                    dict(regression["params"]),
+                    regression["ops_per_second"],
+                    regression["baseline_ops_per_second"],
+                )
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
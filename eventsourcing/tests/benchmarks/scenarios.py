@@ -0,0 +1,424 @@
+"""
+Benchmarks of writing and loading aggregates, reading notifications,
+running systems of process applications, transcoding event state, and
+the memory used by stored and replayed events.
+"""
+import os
+import zlib
+from random import Random
+from threading import Thread
+from time import perf_counter, sleep
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from eventsourcing.application.notificationlog import NotificationLogReader
+from eventsourcing.application.simple import SimpleApplication
+from eventsourcing.application.snapshotting import SnapshottingApplication
+from eventsourcing.domain.model.aggregate import AggregateRoot
+from eventsourcing.domain.model.events import DomainEvent, SlottedDomainEvent
+from eventsourcing.infrastructure.eventstore import EventStore
+from eventsourcing.infrastructure.popo.manager import PopoRecordManager
+from eventsourcing.infrastructure.popo.records import StoredEventRecord
+from eventsourcing.infrastructure.sequenceditem import StoredEvent
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.system.definition import System
+from eventsourcing.system.multiprocess import MultiprocessRunner
+from eventsourcing.system.runner import MultiThreadedRunner, SingleThreadedRunner
+from eventsourcing.tests.benchmarks import (
+    DJANGO,
+    POPO,
+    SQLITE,
+    BenchmarkContext,
+    benchmark,
+)
+from eventsourcing.tests.system_test_fixtures import Orders, Payments, Reservations
+from eventsourcing.utils.cipher.aes import AESCipher
+from eventsourcing.utils.compressor import DictionaryCompressor
+from eventsourcing.utils.topic import get_topic
+
+WORDS = ("order", "payment", "reservation", "customer", "amount", "status", "item")
+
+
+class Counter(AggregateRoot):
+    """
+    Aggregate used in the benchmarks.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super(Counter, self).__init__(**kwargs)
+        self.count = 0
+
+    class Event(AggregateRoot.Event):
+        pass
+
+    class Created(Event, AggregateRoot.Created):
+        pass
+
+    def increment(self) -> None:
+        self.__trigger_event__(Counter.Incremented)
+
+    class Incremented(Event):
+        def mutate(self, obj: "Counter") -> None:
+            obj.count += 1
+
+
+class SlottedEvent(SlottedDomainEvent):
+    """
+    Event with slots, used in the memory benchmark.
+    """
+
+    __slots__ = ("originator_id", "originator_version", "timestamp", "value")
+
+
+def create_counter(app: SimpleApplication, num_events: int) -> Counter:
+    """
+    Saves a new counter with the given number of events.
+    """
+    counter = Counter.__create__()
+    for _ in range(num_events - 1):
+        counter.increment()
+    app.save(counter)
+    return counter
+
+
+def make_text(size: int) -> str:
+    """
+    Returns deterministic text of the given size, made from a few words.
+    """
+    random = Random(size)
+    words = []
+    length = 0
+    while length < size:
+        word = random.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+@benchmark("write")
+def write(ctx: BenchmarkContext) -> None:
+    """
+    Saves new aggregates, from one thread and from concurrent threads.
+    """
+    num_aggregates = ctx.size(200)
+    for num_threads in (1, 4):
+        app = ctx.construct_application(persist_event_type=Counter.Event)
+        with app:
+
+            def save_counters(n: int) -> None:
+                for _ in range(n):
+                    counter = Counter.__create__()
+                    counter.increment()
+                    app.save(counter)
+
+            def save_concurrently() -> None:
+                num_per_thread = max(1, num_aggregates // num_threads)
+                threads = [
+                    Thread(target=save_counters, args=(num_per_thread,))
+                    for _ in range(num_threads)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            if num_threads == 1:
+                ctx.measure(
+                    lambda: save_counters(num_aggregates), num_aggregates, threads=1
+                )
+            else:
+                ops = max(1, num_aggregates // num_threads) * num_threads
+                ctx.measure(save_concurrently, ops, threads=num_threads)
+
+
+@benchmark("write_batch", backends=(POPO, SQLITE, DJANGO))
+def write_batch(ctx: BenchmarkContext) -> None:
+    """
+    Saves new aggregates that have many pending events, as when a
+    policy emits many events, so the events are written together.
+    """
+    num_events = ctx.size(1000)
+    for batch_size in (1, 10, 100):
+        app = ctx.construct_application(persist_event_type=Counter.Event)
+        with app:
+            num_aggregates = max(1, num_events // batch_size)
+
+            def save_batches() -> None:
+                for _ in range(num_aggregates):
+                    create_counter(app, batch_size)
+
+            ctx.measure(save_batches, num_aggregates * batch_size, batch=batch_size)
+
+
+@benchmark("aggregate_load")
+def aggregate_load(ctx: BenchmarkContext) -> None:
+    """
+    Gets aggregates with histories of different lengths, by replaying all
+    of their events, by replaying events after a snapshot, and from a cache.
+    """
+    num_loads = 10
+    for history in (ctx.size(10), ctx.size(100), ctx.size(1000)):
+        for variant in ("replay", "snapshot", "cache"):
+            if variant == "snapshot":
+                app = ctx.construct_application(
+                    SnapshottingApplication, persist_event_type=Counter.Event
+                )
+            else:
+                app = ctx.construct_application(
+                    persist_event_type=Counter.Event, use_cache=variant == "cache"
+                )
+            with app:
+                counter = create_counter(app, history)
+                if variant == "snapshot":
+                    app.repository.take_snapshot(counter.id)
+                # Get the aggregate once, so it is in the cache (if there is one).
+                assert app.repository[counter.id].count == history - 1
+
+                def load() -> None:
+                    for _ in range(num_loads):
+                        app.repository[counter.id]
+
+                ctx.measure(load, num_loads, history=history, variant=variant)
+
+
+@benchmark("notification_read")
+def notification_read(ctx: BenchmarkContext) -> None:
+    """
+    Reads all the notifications of an application, using linked
+    sections of the notification log and using direct queries.
+    """
+    num_notifications = ctx.size(1000)
+    app = ctx.construct_application(persist_event_type=Counter.Event)
+    with app:
+        created = 0
+        while created < num_notifications:
+            num_events = min(10, num_notifications - created)
+            create_counter(app, num_events)
+            created += num_events
+
+        for use_direct_query in (False, True):
+
+            def read() -> None:
+                reader = NotificationLogReader(
+                    app.notification_log,
+                    use_direct_query_if_available=use_direct_query,
+                )
+                notifications = reader.list_notifications()
+                assert len(notifications) == num_notifications
+
+            ctx.measure(read, num_notifications, direct_query=use_direct_query)
+
+
+@benchmark("process_system")
+def process_system(ctx: BenchmarkContext) -> None:
+    """
+    Processes orders end-to-end (orders are reserved and then paid),
+    with each of the system runners that can run on the backend.
+    """
+    num_orders = ctx.size(20)
+    runner_classes: List[Any] = [SingleThreadedRunner, MultiThreadedRunner]
+    if ctx.backend == SQLITE:
+        # Processes can only share a database through a file.
+        runner_classes.append(MultiprocessRunner)
+
+    for runner_class in runner_classes:
+        times = []
+        for _ in range(ctx.repeat):
+            system = System(
+                Orders | Reservations | Orders,
+                Orders | Payments | Orders,
+                setup_tables=True,
+                infrastructure_class=ctx.infrastructure_class,
+            )
+            db_uri = ctx.new_db_uri()
+            previous_db_uri = os.environ.get("DB_URI")
+            if db_uri is not None:
+                os.environ["DB_URI"] = db_uri
+            try:
+                if runner_class is MultiprocessRunner:
+                    # Create the tables before starting the processes.
+                    with system.construct_app(Orders):
+                        pass
+                with runner_class(system) as runner:
+                    orders = runner.get(Orders)
+                    started = perf_counter()
+                    order_ids = [orders.create_new_order() for _ in range(num_orders)]
+                    for order_id in order_ids:
+                        timeout = 60.0
+                        while not orders.is_order_paid(order_id):
+                            sleep(0.001)
+                            timeout -= 0.001
+                            assert timeout > 0, "Timed out waiting for order"
+                    times.append(perf_counter() - started)
+            finally:
+                if previous_db_uri is None:
+                    os.environ.pop("DB_URI", None)
+                else:
+                    os.environ["DB_URI"] = previous_db_uri
+        ctx.record(num_orders, times, runner=runner_class.__name__)
+
+
+@benchmark("transcoding", backends=(None,))
+def transcoding(ctx: BenchmarkContext) -> None:
+    """
+    Encodes and decodes domain events, with and without
+    compression and encryption.
+    """
+    num_events = ctx.size(1000)
+    originator_id = uuid4()
+    events = [
+        DomainEvent(
+            originator_id=originator_id,
+            originator_version=i,
+            description=make_text(200),
+            amount=i * 100,
+        )
+        for i in range(num_events)
+    ]
+    cipher = AESCipher(cipher_key=b"0123456789abcdef")
+    dictionary_compressor = DictionaryCompressor()
+    dictionary_compressor.add_dictionary(
+        dictionary_compressor.train(
+            get_topic(DomainEvent),
+            [SequencedItemMapper().json_dumps(e.__dict__) for e in events[:100]],
+        )
+    )
+    codecs = (
+        ("json", None, None),
+        ("json+zlib", None, zlib),
+        ("json+dictionary", None, dictionary_compressor),
+        ("json+zlib+aes", cipher, zlib),
+    )
+    for codec, codec_cipher, compressor in codecs:
+        mapper = SequencedItemMapper(
+            sequence_id_attr_name="originator_id",
+            position_attr_name="originator_version",
+            cipher=codec_cipher,
+            compressor=compressor,
+        )
+        items = [mapper.item_from_event(e) for e in events]
+
+        def encode() -> None:
+            for event in events:
+                mapper.item_from_event(event)
+
+        def decode() -> None:
+            for item in items:
+                mapper.event_from_item(item)
+
+        def encode_many() -> None:
+            mapper.items_from_events(events)
+
+        def decode_many() -> None:
+            mapper.events_from_items(items)
+
+        ctx.measure(encode, num_events, codec=codec, operation="encode")
+        ctx.measure(decode, num_events, codec=codec, operation="decode")
+        ctx.measure(encode_many, num_events, codec=codec, operation="encode_many")
+        ctx.measure(decode_many, num_events, codec=codec, operation="decode_many")
+
+
+@benchmark("cipher", backends=(None,))
+def cipher(ctx: BenchmarkContext) -> None:
+    """
+    Encrypts and decrypts payloads of different sizes.
+    """
+    num_ops = ctx.size(1000)
+    aes = AESCipher(cipher_key=b"0123456789abcdef")
+    for size in (100, 10000):
+        plaintext = make_text(size).encode("utf8")
+        ciphertext = aes.encrypt(plaintext)
+
+        def encrypt() -> None:
+            for _ in range(num_ops):
+                aes.encrypt(plaintext)
+
+        def decrypt() -> None:
+            for _ in range(num_ops):
+                aes.decrypt(ciphertext)
+
+        ctx.measure(encrypt, num_ops, size=size, operation="encrypt")
+        ctx.measure(decrypt, num_ops, size=size, operation="decrypt")
+
+
+@benchmark("compressor", backends=(None,))
+def compressor(ctx: BenchmarkContext) -> None:
+    """
+    Compresses and decompresses payloads of different sizes with zlib.
+    """
+    num_ops = ctx.size(1000)
+    for size in (100, 10000):
+        plaintext = make_text(size).encode("utf8")
+        compressed = zlib.compress(plaintext)
+
+        def compress() -> None:
+            for _ in range(num_ops):
+                zlib.compress(plaintext)
+
+        def decompress() -> None:
+            for _ in range(num_ops):
+                zlib.decompress(compressed)
+
+        ctx.measure(compress, num_ops, size=size, operation="compress")
+        ctx.measure(decompress, num_ops, size=size, operation="decompress")
+
+
+@benchmark("memory", backends=(None,))
+def memory(ctx: BenchmarkContext) -> None:
+    """
+    Stores events in the in-memory record manager, and replays them, with
+    and without slots, and reports the bytes used for each event.
+    """
+    num_events = ctx.size(100000)
+    batch_size = 10000
+    for event_class in (DomainEvent, SlottedEvent):
+        state: Dict[str, Any] = {}
+
+        def setup_store() -> None:
+            state["event_store"] = EventStore(
+                record_manager=PopoRecordManager(
+                    record_class=StoredEventRecord,
+                    sequenced_item_class=StoredEvent,
+                    contiguous_record_ids=True,
+                    application_name=uuid4().hex,
+                ),
+                event_mapper=SequencedItemMapper(sequenced_item_class=StoredEvent),
+            )
+            state["originator_id"] = originator_id = uuid4()
+            state["events"] = [
+                event_class(
+                    originator_id=originator_id,
+                    originator_version=i,
+                    timestamp=i,
+                    value="value",
+                )
+                for i in range(num_events)
+            ]
+
+        def store() -> None:
+            events = state["events"]
+            for i in range(0, num_events, batch_size):
+                state["event_store"].store_events(events[i : i + batch_size])
+
+        def setup_replay() -> None:
+            setup_store()
+            store()
+            del state["events"]
+
+        def replay() -> List[DomainEvent]:
+            return state["event_store"].list_events(state["originator_id"])
+
+        ctx.measure_memory(
+            store,
+            num_events,
+            setup=setup_store,
+            event_class=event_class.__name__,
+            operation="store",
+        )
+        ctx.measure_memory(
+            replay,
+            num_events,
+            setup=setup_replay,
+            event_class=event_class.__name__,
+            operation="replay",
+        )
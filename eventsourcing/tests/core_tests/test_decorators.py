@@ -67,6 +67,23 @@ class TestDecorators(TestCase):
         with self.assertRaises(TypeError):
             retry(wait="")  # needs to be a float
 
+        with self.assertRaises(TypeError):
+            retry(backoff=0.5)  # needs to be not less than 1
+
+    def test_retry_with_backoff(self):
+        def func_raises():
+            raise NotImplementedError
+
+        with mock.patch("eventsourcing.domain.model.decorators.sleep") as sleep:
+            with self.assertRaises(NotImplementedError):
+                retry(
+                    NotImplementedError, max_attempts=5, wait=1, backoff=2, max_wait=5
+                )(func_raises)()
+        waits = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 4)
+        for wait, expected in zip(waits, [1, 2, 4, 5]):
+            self.assertAlmostEqual(wait, expected, delta=expected * 0.05)
+
     def test_mutate_without_arg(self):
         # Define an entity class, and event class, and a mutator function.
 
@@ -1,5 +1,6 @@
 from uuid import uuid4
 
+from eventsourcing.domain.model.aggregate import AggregateRoot
 from eventsourcing.example.domainmodel import Example
 from eventsourcing.example.infrastructure import ExampleRepository
 from eventsourcing.infrastructure.eventsourcedrepository import EventSourcedRepository
@@ -10,6 +11,7 @@ from eventsourcing.tests.datastore_tests.test_sqlalchemy import (
     SQLAlchemyDatastoreTestCase,
 )
 from eventsourcing.utils.topic import get_topic
+from eventsourcing.utils.tracing import Tracer
 
 
 class TestEventSourcedRepository(SQLAlchemyDatastoreTestCase):
@@ -88,3 +90,41 @@ class TestEventSourcedRepository(SQLAlchemyDatastoreTestCase):
         self.assertEqual(1, example.a)
         self.assertEqual(2, example.b)
         self.assertEqual(entity_id, example.id)
+
+    def test_get_version(self) -> None:
+        event_store = self.construct_event_store()
+        event_sourced_repo: EventSourcedRepository[
+            AggregateRoot, AggregateRoot.Event
+        ] = EventSourcedRepository(event_store=event_store)
+
+        # Check a non-existent entity has no version.
+        self.assertIsNone(event_sourced_repo.get_version(uuid4()))
+
+        # Create an entity, and change it.
+        entity = AggregateRoot.__create__()
+        entity_id = entity.id
+        entity.__trigger_event__(AggregateRoot.Event)
+        event_store.store_events(entity.__batch_pending_events__())
+
+        # Check the version is the version of the most recent event.
+        self.assertEqual(event_sourced_repo.get_version(entity_id), 1)
+        self.assertEqual(
+            event_sourced_repo.get_version(entity_id),
+            event_sourced_repo[entity_id].__version__,
+        )
+        self.assertIn(entity_id, event_sourced_repo)
+
+        # Check only the most recent event is retrieved.
+        with Tracer() as tracer:
+            self.assertIn(entity_id, event_sourced_repo)
+        self.assertEqual(tracer.get_spans("event_store.query")[0].attrs["count"], 1)
+        span = tracer.get_spans("repository.get_version")[0]
+        self.assertEqual(span.attrs["version"], 1)
+
+        # Discard the entity.
+        entity.__discard__()
+        event_store.store_events(entity.__batch_pending_events__())
+
+        # Check a discarded entity has no version.
+        self.assertIsNone(event_sourced_repo.get_version(entity_id))
+        self.assertNotIn(entity_id, event_sourced_repo)
@@ -6,6 +6,8 @@ from eventsourcing.application.snapshotting import SnapshottingApplication
 from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
 from eventsourcing.domain.model.aggregate import BaseAggregateRoot
 from eventsourcing.domain.model.events import DomainEvent
+from eventsourcing.domain.model.versioning import compile_upcaster
+from eventsourcing.infrastructure.upcasting import upcast_stored_events
 from eventsourcing.whitehead import TEntity
 
 
@@ -102,6 +104,37 @@ class TestUpcastable(TestCase):
         self.assertEqual(state_v1["a"], 10000)
         self.assertEqual(state_v0["a"], 1)
 
+    def test_upcaster_is_compiled_once(self):
+        UpcastableEventFixture.__class_version__ = 2
+        upcaster = UpcastableEventFixture.__get_upcaster__(0)
+        self.assertIs(UpcastableEventFixture.__get_upcaster__(0), upcaster)
+        self.assertIsNot(UpcastableEventFixture.__get_upcaster__(1), upcaster)
+        self.assertEqual(upcaster({"a": 1}), {"a": 1000, "__class_version__": 2})
+
+        # Changing the class version compiles a new upcaster.
+        UpcastableEventFixture.__class_version__ = 1
+        self.assertIsNot(UpcastableEventFixture.__get_upcaster__(0), upcaster)
+
+    def test_class_version_is_set_after_each_step(self):
+        steps = []
+
+        def upcast(obj_state, class_version):
+            steps.append((class_version, obj_state.get("__class_version__", 0)))
+            return obj_state
+
+        upcaster = compile_upcaster(upcast, 0, 2)
+        self.assertEqual(upcaster({"a": 1}), {"a": 1, "__class_version__": 2})
+        self.assertEqual(steps, [(0, 0), (1, 1)])
+
+    def test_current_state_is_not_upcast(self):
+        UpcastableEventFixture.__class_version__ = 2
+        state_v2 = {"a": 1, "__class_version__": 2}
+        self.assertIs(UpcastableEventFixture.__upcast_state__(state_v2), state_v2)
+        self.assertEqual(state_v2["a"], 1)
+
+    def tearDown(self) -> None:
+        UpcastableEventFixture.__class_version__ = 0
+
 
 class UpcastableEventFixture(DomainEvent):
     @classmethod
@@ -292,6 +325,44 @@ class TestUpcastingActiveWhenStoringAndRetrievingEvents(TestCase):
             self.assertEqual(copy.units, "")  # gets default
 
 
+class TestUpcastStoredEvents(TestCase):
+    def tearDown(self) -> None:
+        MultiVersionAggregateFixture.Triggered.__class_version__ = 0
+        del MultiVersionAggregateFixture.Triggered.__upcast__
+
+    def test_upcast_stored_events(self):
+        app = SQLAlchemyApplication(persist_event_type=BaseAggregateRoot.Event)
+        with app:
+            my_aggregate = MultiVersionAggregateFixture.__create__()
+            my_aggregate.trigger()
+            my_aggregate.trigger()
+            my_aggregate.__save__()
+
+            # Nothing to upcast.
+            self.assertEqual(upcast_stored_events(app.event_store), 0)
+
+            # Increase the version of the event class.
+            MultiVersionAggregateFixture.Triggered.__class_version__ = 2
+            MultiVersionAggregateFixture.Triggered.__upcast__ = (
+                MultiVersionAggregateFixture.Triggered.upcast_v2
+            )
+
+            # Rewrite the two triggered events.
+            self.assertEqual(upcast_stored_events(app.event_store), 2)
+            self.assertEqual(upcast_stored_events(app.event_store), 0)
+
+            # Check the recorded state is now current.
+            event_mapper = app.event_store.event_mapper
+            for record in app.event_store.record_manager.get_records(my_aggregate.id):
+                event_class, event_attrs = event_mapper.get_event_class_and_attrs(
+                    record.topic, record.state
+                )
+                if event_class is MultiVersionAggregateFixture.Triggered:
+                    self.assertEqual(event_attrs["__class_version__"], 2)
+                    self.assertEqual(event_attrs["value"], 0)
+                    self.assertEqual(event_attrs["units"], "")
+
+
 class MultiVersionAggregateFixture(BaseAggregateRoot):
     DEFAULT_VALUE = 0
     DEFAULT_UNITS = ""
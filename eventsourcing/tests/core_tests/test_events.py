@@ -10,6 +10,7 @@ from eventsourcing.domain.model.events import (
     EventWithOriginatorVersion,
     EventWithTimestamp,
     EventWithTimeuuid,
+    SlottedDomainEvent,
     assert_event_handlers_empty,
     clear_event_handlers,
     create_timesequenced_event_id,
@@ -19,6 +20,7 @@ from eventsourcing.domain.model.events import (
 )
 from eventsourcing.example.domainmodel import Example
 from eventsourcing.exceptions import EventHashError, TopicResolutionError
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
 from eventsourcing.utils.times import decimaltimestamp, decimaltimestamp_from_uuid
 from eventsourcing.utils.topic import get_topic, resolve_topic
 
@@ -66,6 +68,69 @@ class TestAbstractDomainEvent(TestCase):
         self.assertNotEqual(event2, SubclassEvent(name=event2.name))
 
 
+class SlottedEvent(SlottedDomainEvent):
+    __slots__ = ("originator_id", "originator_version", "name")
+
+
+class SlottedSubclassEvent(SlottedEvent):
+    __slots__ = "extra"
+
+
+class TestSlottedDomainEvent(TestCase):
+    def test(self):
+        # Check subclass can be instantiated.
+        event1 = SlottedEvent()
+        self.assertEqual(event1.__dict__, {})
+
+        # Check subclass can be instantiated with other parameters.
+        event2 = SlottedEvent(name="value")
+        self.assertEqual(event2.name, "value")
+        self.assertEqual(event2.__dict__, {"name": "value"})
+
+        # Check instances don't have an instance dict.
+        self.assertFalse(hasattr(event2, "__weakref__"))
+        self.assertEqual(SlottedEvent.__dictoffset__, 0)
+
+        # Check the attribute value cannot be changed
+        with self.assertRaises(AttributeError):
+            event2.name = "another value"
+        self.assertEqual(event2.name, "value")
+
+        # Check attributes must be declared.
+        with self.assertRaises(AttributeError):
+            SlottedEvent(other="value")
+
+        # Check equality and hashing.
+        self.assertEqual(event2, SlottedEvent(name="value"))
+        self.assertEqual(hash(event2), hash(SlottedEvent(name="value")))
+        self.assertNotEqual(event2, SlottedEvent(name="another value"))
+        self.assertNotEqual(event2, SlottedSubclassEvent(name=event2.name))
+
+        # Check hash is the same as a dict-based event with the same state.
+        class Event(DomainEvent):
+            pass
+
+        Event.__qualname__ = SlottedEvent.__qualname__
+        self.assertEqual(hash(Event(name="value")), hash(event2))
+
+        # Check slots are inherited.
+        event3 = SlottedSubclassEvent(name="value", extra=1)
+        self.assertEqual(event3.__dict__, {"name": "value", "extra": 1})
+
+    def test_mapper_round_trip(self):
+        mapper = SequencedItemMapper(
+            sequence_id_attr_name="originator_id",
+            position_attr_name="originator_version",
+        )
+        event = SlottedSubclassEvent(
+            originator_id=uuid4(), originator_version=1, name="value", extra=1
+        )
+        copy = mapper.event_from_item(mapper.item_from_event(event))
+        self.assertIsInstance(copy, SlottedSubclassEvent)
+        self.assertEqual(copy.__dict__, event.__dict__)
+        self.assertEqual(copy, event)
+
+
 class TestEventWithOriginatorID(TestCase):
     def test(self):
         # Check base class can be sub-classed.
@@ -391,6 +456,66 @@ class TestEvents(TestCase):
         # Check we can assert there are no event handlers subscribed.
         assert_event_handlers_empty()
 
+    def test_publish_subscribe_with_event_type(self):
+        calls = []
+        typed_handler = lambda events: calls.append(("typed", events))
+        handler = lambda events: calls.append(("untyped", events))
+
+        # Handlers are called in the order they are subscribed.
+        subscribe(handler=typed_handler, event_type=Event)
+        subscribe(handler=handler)
+        self.assertRaises(EventHandlersNotEmptyError, assert_event_handlers_empty)
+
+        # Typed handlers are called if all events are instances of the type.
+        events = [Event(), SubclassEvent()]
+        publish(events)
+        self.assertEqual(calls, [("typed", events), ("untyped", events)])
+
+        # Typed handlers aren't called if any event isn't an instance.
+        del calls[:]
+        other_events = [Event(), DomainEvent()]
+        publish(other_events)
+        self.assertEqual(calls, [("untyped", other_events)])
+
+        # Typed handlers aren't called if there are no events.
+        del calls[:]
+        publish([])
+        self.assertEqual(calls, [("untyped", [])])
+
+        # Typed handlers are called with an instance published on its own.
+        del calls[:]
+        event = SubclassEvent()
+        publish(event)
+        self.assertEqual(calls, [("typed", event), ("untyped", event)])
+
+        # Predicates are also checked for typed subscriptions.
+        del calls[:]
+        predicate = lambda events: len(events) > 1
+        subscribe(handler=handler, predicate=predicate, event_type=(SubclassEvent,))
+        publish([SubclassEvent()])
+        self.assertEqual(len(calls), 2)
+        publish(events)
+        self.assertEqual(len(calls), 4)
+        publish(events[1:] * 2)
+        self.assertEqual(len(calls), 7)
+
+        # Subscribing whilst publishing doesn't affect the published events.
+        del calls[:]
+        subscribe(handler=lambda _: subscribe(handler=handler, event_type=Event))
+        publish(events)
+        self.assertEqual(len(calls), 2)
+        publish(events)
+        self.assertEqual(len(calls), 5)
+
+        # Handlers are unsubscribed with their event type.
+        unsubscribe(handler=typed_handler)
+        self.assertEqual(len(calls), 5)
+        unsubscribe(handler=typed_handler, event_type=Event)
+        publish(events)
+        self.assertEqual(len(calls), 7)
+        clear_event_handlers()
+        assert_event_handlers_empty()
+
     def test_hash(self):
         entity_id1 = uuid4()
         event1 = Example.Created(
@@ -46,6 +46,31 @@ class TestPersistencePolicy(unittest.TestCase):
         self.assertEqual(1, self.event_store.store_events.call_count)
         self.event_store.store_events.assert_called_once_with([domain_event1])
 
+        # Publish a versioned entity event on its own (should be ignored).
+        publish(domain_event1)
+        self.assertEqual(1, self.event_store.store_events.call_count)
+
+    def test_is_event_can_be_overridden(self):
+        class SelectivePersistencePolicy(PersistencePolicy):
+            def is_event(self, events):
+                is_event = super(SelectivePersistencePolicy, self).is_event(events)
+                return is_event and events[0].originator_version > 0
+
+        self.persistence_policy.close()
+        self.persistence_policy = SelectivePersistencePolicy(
+            event_store=self.event_store, persist_event_type=VersionedEntity.Event
+        )
+        entity_id = uuid4()
+        domain_event1 = VersionedEntity.Event(
+            originator_id=entity_id, originator_version=0
+        )
+        domain_event2 = VersionedEntity.Event(
+            originator_id=entity_id, originator_version=1
+        )
+        publish([domain_event1])
+        publish([domain_event2])
+        self.event_store.store_events.assert_called_once_with([domain_event2])
+
 
 class TestSnapshottingPolicy(unittest.TestCase):
     def setUp(self):
@@ -1,12 +1,15 @@
 import datetime
+import zlib
 from time import sleep
+from unittest import mock
 from unittest.case import TestCase
 from uuid import uuid4
 
 from eventsourcing.domain.model.entity import TimestampedEntity, VersionedEntity
 from eventsourcing.domain.model.events import DomainEvent
-from eventsourcing.infrastructure.sequenceditem import SequencedItem
+from eventsourcing.infrastructure.sequenceditem import SequencedItem, StoredEvent
 from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.utils.cipher.aes import AESCipher
 from eventsourcing.utils.times import decimaltimestamp
 from eventsourcing.utils.topic import get_topic
 
@@ -146,3 +149,51 @@ class TestSequencedItemMapper(TestCase):
         self.assertEqual(domain_event.c, event3.c)
         # self.assertEqual(domain_event.d, event3.d)
         self.assertEqual(domain_event.e, event3.e)
+
+    def test_items_from_events_and_events_from_items(self):
+        cipher = AESCipher(cipher_key=b"0123456789abcdef")
+        mapper = SequencedItemMapper(
+            sequenced_item_class=StoredEvent, cipher=cipher, compressor=zlib
+        )
+        entity_id1 = uuid4()
+        events = [
+            Event1(originator_id=entity_id1, originator_version=i, a=i)
+            for i in range(5)
+        ]
+
+        # Check the states of the items are encrypted together.
+        with mock.patch.object(
+            cipher, "encrypt_many", wraps=cipher.encrypt_many
+        ) as encrypt_many:
+            stored_events = mapper.items_from_events(events)
+        encrypt_many.assert_called_once()
+        self.assertEqual([s.originator_version for s in stored_events], list(range(5)))
+        nonces = [s.state[:12] for s in stored_events]
+        self.assertEqual(len(set(nonces)), 5)
+
+        # Check states can be encoded and decoded without encryption.
+        topic, state = mapper.get_item_topic_and_state(
+            Event1, events[3].__dict__, encrypt=False
+        )
+        self.assertEqual(zlib.decompress(state), mapper.json_dumps(events[3].__dict__))
+        event = mapper.event_from_topic_and_state(topic, state, decrypt=False)
+        self.assertEqual(event.a, 3)
+
+        # Check the items can be mapped individually.
+        self.assertEqual(mapper.event_from_item(stored_events[3]).a, 3)
+        stored_event = mapper.item_from_event(events[3])
+        self.assertEqual(mapper.events_from_items([stored_event])[0].a, 3)
+
+        # Check the states of the items are decrypted together.
+        with mock.patch.object(
+            cipher, "decrypt_many", wraps=cipher.decrypt_many
+        ) as decrypt_many:
+            domain_events = mapper.events_from_items(stored_events)
+        decrypt_many.assert_called_once()
+        self.assertEqual([e.a for e in domain_events], list(range(5)))
+        self.assertEqual(domain_events[4].originator_id, entity_id1)
+
+        # Check items can be mapped without a cipher.
+        mapper = SequencedItemMapper(sequenced_item_class=StoredEvent)
+        stored_events = mapper.items_from_events(events)
+        self.assertEqual(mapper.events_from_items(stored_events), events)
@@ -64,9 +64,9 @@ class ExtendedIntegerSequencedRecord(Base):
 
 # Extend the sequenced item mapper to derive the extra values.
 class ExtendedSequencedItemMapper(SequencedItemMapper):
-    def construct_item_args(self, domain_event):
+    def construct_item_args(self, domain_event, encrypt=True):
         args = super(ExtendedSequencedItemMapper, self).construct_item_args(
-            domain_event
+            domain_event, encrypt=encrypt
         )
         event_type = domain_event.__class__.__qualname__
         return args + (event_type,)
@@ -616,6 +616,12 @@ class RecordManagerTrackingRecordsTestCase(RecordManagerNotificationsTestCase):
         self.assertTrue(self.record_manager.has_tracking_record(upstream_name, 0, 1))
         self.assertFalse(self.record_manager.has_tracking_record(upstream_name, 0, 2))
 
+        # Tracking records are for the upstream application's pipeline.
+        self.assertEqual(
+            self.record_manager.get_max_tracking_record_id(upstream_name, 1), 0
+        )
+        self.assertFalse(self.record_manager.has_tracking_record(upstream_name, 1, 1))
+
         # Can't write further events with same tracking kwargs.
         item2 = SequencedItem(
             sequence_id=sequence_id1,
@@ -1015,6 +1021,86 @@ class SequencedItemIteratorTestCase(AbstractSequencedItemIteratorTestCase):
 class ThreadedSequencedItemIteratorTestCase(AbstractSequencedItemIteratorTestCase):
     iterator_cls = ThreadedSequencedItemIterator
 
+    def test_pages_in_flight(self):
+        self.setup_sequenced_items()
+        states = [item.state for item in self.sequenced_items]
+
+        def get_states(pages_in_flight=3, **kwargs):
+            iterator = self.iterator_cls(
+                record_manager=self.entity_record_manager,
+                sequence_id=self.entity_id,
+                page_size=2,
+                pages_in_flight=pages_in_flight,
+                **kwargs
+            )
+            return iterator, [item.state for item in iterator]
+
+        # Pages after the first page are requested ahead.
+        iterator, retrieved = get_states()
+        self.assertEqual(retrieved, states)
+        self.assertEqual(iterator.page_counter, 6)
+        self.assertEqual(iterator.query_counter, 7)
+        self.assertGreaterEqual(len(iterator.page_latencies), 7)
+
+        iterator, retrieved = get_states(is_ascending=False)
+        self.assertEqual(retrieved, states[::-1])
+
+        # Pages are within the given bounds.
+        iterator, retrieved = get_states(gt=2, lte=8)
+        self.assertEqual(retrieved, states[3:9])
+        iterator, retrieved = get_states(gte=2, lt=8, is_ascending=False)
+        self.assertEqual(retrieved, states[2:8][::-1])
+        iterator, retrieved = get_states(pages_in_flight=1, gte=1, lt=8)
+        self.assertEqual(retrieved, states[1:8])
+
+        # Pages aren't requested after the limit.
+        iterator, retrieved = get_states(limit=5)
+        self.assertEqual(retrieved, states[:5])
+        self.assertEqual(iterator.query_counter, 3)
+        self.assertEqual(len(iterator.page_latencies), 3)
+
+        # Iterating can be stopped early.
+        iterator = self.iterator_cls(
+            record_manager=self.entity_record_manager,
+            sequence_id=self.entity_id,
+            page_size=2,
+            pages_in_flight=5,
+        )
+        items = iter(iterator)
+        self.assertEqual(next(items).state, states[0])
+        items.close()
+        self.assertEqual(iterator.all_item_counter, 1)
+
+    def test_gap_in_positions(self):
+        # Positions can have gaps, for example where a position was
+        # reserved but not used, so the bounds of the pages after the
+        # gap can't be calculated.
+        positions = list(range(0, 5)) + list(range(7, 15))
+        for position in positions:
+            self.entity_record_manager.record_item(
+                SequencedItem(
+                    sequence_id=self.entity_id,
+                    position=position,
+                    topic="eventsourcing.example.domain_model#Example.Created",
+                    state=b'{"i":%d}' % position,
+                )
+            )
+
+        def get_positions(**kwargs):
+            iterator = self.iterator_cls(
+                record_manager=self.entity_record_manager,
+                sequence_id=self.entity_id,
+                page_size=5,
+                pages_in_flight=3,
+                **kwargs
+            )
+            return [item.position for item in iterator]
+
+        self.assertEqual(get_positions(), positions)
+        self.assertEqual(get_positions(is_ascending=False), positions[::-1])
+        self.assertEqual(get_positions(lte=12), positions[:11])
+        self.assertEqual(get_positions(limit=8), positions[:8])
+
 
 class WithEventPersistence(WithRecordManagers):
     """
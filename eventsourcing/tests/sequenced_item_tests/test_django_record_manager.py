@@ -1,14 +1,18 @@
+import json
 import os
 import unittest
 from time import sleep
+from uuid import uuid4
 
 import django
 from django.core.management import call_command
 from django.test import TransactionTestCase
 
+from eventsourcing.exceptions import RecordConflictError
 from eventsourcing.infrastructure.django.apps import DjangoConfig
 from eventsourcing.infrastructure.django.factory import DjangoInfrastructureFactory
 from eventsourcing.infrastructure.django.utils import close_django_connection
+from eventsourcing.infrastructure.sequenceditem import SequencedItem, StoredEvent
 from eventsourcing.tests.sequenced_item_tests import base
 
 os.environ[
@@ -82,6 +86,40 @@ class TestDjangoRecordManagerWithStoredEvents(
         kwargs['integer_sequenced_record_class'] = models.StoredEventRecord
         return kwargs
 
+    def test_write_many_records(self):
+        originator_id = uuid4()
+        state = json.dumps({"name": "value"}).encode("utf-8")
+        max_notification_id = self.record_manager.get_max_notification_id()
+
+        # Write several events at once.
+        items = [
+            StoredEvent(originator_id, i, self.EXAMPLE_EVENT_TOPIC1, state)
+            for i in range(10)
+        ]
+        self.record_manager.record_items(items)
+        self.assertEqual(list(self.record_manager.get_items(originator_id)), items)
+
+        # Check the notification IDs are contiguous.
+        records = self.record_manager.get_notification_records(
+            start=max_notification_id
+        )
+        self.assertEqual(
+            [r.notification_id for r in records],
+            list(range(max_notification_id + 1, max_notification_id + 11)),
+        )
+
+        # Check none of the events are written if one of them conflicts.
+        conflicting = [
+            StoredEvent(originator_id, i, self.EXAMPLE_EVENT_TOPIC1, state)
+            for i in range(9, 15)
+        ]
+        with self.assertRaises(RecordConflictError):
+            self.record_manager.record_items(conflicting)
+        self.assertEqual(list(self.record_manager.get_items(originator_id)), items)
+        self.assertEqual(
+            self.record_manager.get_max_notification_id(), max_notification_id + 10
+        )
+
 
 
 class TestDjangoRecordManagerWithoutContiguousRecordIDs(
@@ -92,6 +130,27 @@ class TestDjangoRecordManagerWithoutContiguousRecordIDs(
     def construct_record_manager(self):
         return self.construct_entity_record_manager()
 
+    def test_write_many_records(self):
+        sequence_id = uuid4()
+        state = json.dumps({"name": "value"}).encode("utf-8")
+
+        # Write several items at once.
+        items = [
+            SequencedItem(sequence_id, i, self.EXAMPLE_EVENT_TOPIC1, state)
+            for i in range(10)
+        ]
+        self.record_manager.record_items(items)
+        self.assertEqual(list(self.record_manager.get_items(sequence_id)), items)
+
+        # Check none of the items are written if one of them conflicts.
+        conflicting = [
+            SequencedItem(sequence_id, i, self.EXAMPLE_EVENT_TOPIC1, state)
+            for i in range(9, 15)
+        ]
+        with self.assertRaises(RecordConflictError):
+            self.record_manager.record_items(conflicting)
+        self.assertEqual(list(self.record_manager.get_items(sequence_id)), items)
+
 
 # class WithDjangoRecordManagers(DjangoTestCase, WithActiveRecordManagers):
 #     def construct_entity_record_manager(self):
@@ -23,6 +23,7 @@ from eventsourcing.tests.sequenced_item_tests.test_django_record_manager import
 from eventsourcing.tests.sequenced_item_tests.test_sqlalchemy_record_manager import (
     SQLAlchemyRecordManagerTestCase,
 )
+from eventsourcing.utils.tracing import Tracer
 
 
 class TestArrayWithSQLAlchemy(SQLAlchemyRecordManagerTestCase, WithEventPersistence):
@@ -117,6 +118,28 @@ class TestArrayWithSQLAlchemy(SQLAlchemyRecordManagerTestCase, WithEventPersiste
             array[-4]
 
 
+    def test_assign_many(self):
+        array = self.repo[uuid4()]
+
+        # Items are assigned with one write.
+        with Tracer() as tracer:
+            array.assign_many(0, ["item1", "item2"])
+        self.assertEqual(len(tracer.get_spans("event_store.write")), 1)
+        array.assign_many(2, [])
+        self.assertEqual(array[:], ["item1", "item2", None])
+
+        # Either all or none of the items are assigned.
+        with self.assertRaises(ConcurrencyError):
+            array.assign_many(1, ["item3", "item4"])
+        self.assertEqual(array[:], ["item1", "item2", None])
+
+        # Check index errors.
+        with self.assertRaises(ArrayIndexError):
+            array.assign_many(2, ["item3", "item4"])
+        with self.assertRaises(ArrayIndexError):
+            array.assign_many(-1, ["item3"])
+
+
 class BigArrayTestCase(SQLAlchemyRecordManagerTestCase, WithEventPersistence):
     def start_and_append(self, array_size, num_items):
         array = self.get_big_array(array_size)
@@ -306,6 +329,68 @@ class TestBigArrayWithSQLAlchemy(BigArrayTestCase):
         # Check depth is 2.
         self.assertEqual(self.subrepo[root.id].get_last_item_and_next_position()[1], 2)
 
+    def test_last_array_is_remembered(self):
+        root, added = self.start_and_append(array_size=3, num_items=20)
+        array = self.repo[root.id]
+
+        # The first time, the last array is found from the root.
+        with Tracer() as tracer:
+            self.assertEqual(array.get_last_item_and_next_position(), (added[-1], 20))
+        self.assertEqual(len(tracer.get_spans("event_store.query")), 4)
+
+        # Then the last array is checked by looking at the next base array.
+        with Tracer() as tracer:
+            self.assertEqual(array.get_last_item_and_next_position(), (added[-1], 20))
+        self.assertEqual(len(tracer.get_spans("event_store.query")), 2)
+
+        # Items appended elsewhere are found.
+        added += self.append_items(3, root)
+        self.assertEqual(array.get_last_item_and_next_position(), (added[-1], 23))
+        self.assertEqual(array.get_last_array()[1], 21)
+
+        # Appending after items were appended elsewhere conflicts, and is retried.
+        array.get_next_position()
+        root.append("item-23")
+        array.append("item-24")
+        self.assertEqual(array[23], "item-23")
+        self.assertEqual(array[24], "item-24")
+        self.assertEqual(root.get_next_position(), 25)
+
+    def test_extend(self):
+        root = self.get_big_array(base_size=3)
+        items = ["item-{}".format(i) for i in range(22)]
+        self.assertEqual(root.extend(items[:2]), 0)
+
+        # Items in each base array are assigned with one write, and
+        # each base array is registered in its parent arrays once.
+        with Tracer() as tracer:
+            self.assertEqual(root.extend(items[2:20]), 2)
+        num_extend_writes = len(tracer.get_spans("event_store.write"))
+        with Tracer() as tracer:
+            other, _ = self.start_and_append(array_size=3, num_items=20)
+        num_append_writes = len(tracer.get_spans("event_store.write"))
+        self.assertLess(num_extend_writes * 2, num_append_writes)
+
+        # The items are where appending them one by one would put them.
+        self.assertEqual(list(root[0:20]), items[:20])
+        self.assertEqual(root.get_last_item_and_next_position(), (items[19], 20))
+        self.assertEqual(other.get_last_item_and_next_position(), (items[19], 20))
+        self.assertEqual(self.subrepo[root.id].get_next_position(), 3)
+        self.assertEqual(self.subrepo[other.id].get_next_position(), 3)
+
+        # Items assigned elsewhere are conflicts, and none of
+        # the items in the conflicting base array are assigned.
+        self.repo[root.id].append(items[20])
+        with self.assertRaises(ConcurrencyError):
+            root.assign_many(20, ["item", "item"])
+        self.assertEqual(root.extend(items[21:]), 21)
+        self.assertEqual(list(root[0:22]), items)
+
+        # Items that don't fit aren't assigned.
+        with self.assertRaises(ArrayIndexError):
+            root.extend(["item"] * 6)
+        self.assertEqual(root.get_next_position(), 22)
+
     def test_big_array_bigoffset(self):
         # Can add 256 items with large offset.
         base_size = 4000
@@ -598,6 +683,27 @@ class TestBigArrayWithSQLAlchemyAndMultithreading(BigArrayTestCase):
         self.subrepo = self.repo.subrepo
         self.result_queue = None
 
+    def test_get_slice_concurrently(self):
+        root, added = self.start_and_append(array_size=3, num_items=20)
+        for start, stop in [(0, 20), (1, 19), (4, 5), (5, 20)]:
+            self.assertEqual(
+                list(root.get_slice(start, stop, arrays_in_flight=4)),
+                added[start:stop],
+            )
+        root.arrays_in_flight = 2
+        self.assertEqual(list(root[2:]), added[2:] + [None] * 7)
+
+    def test_executor_is_shared(self):
+        root, added = self.start_and_append(array_size=3, num_items=10)
+        executor = BigArray.get_executor()
+        self.assertIs(BigArray.get_executor(), executor)
+
+        # Stop reading a slice before the base arrays that were read ahead.
+        items = root.get_slice(0, 10, arrays_in_flight=3)
+        self.assertEqual(next(items), added[0])
+        items.close()
+        self.assertEqual(list(root.get_slice(0, 10, arrays_in_flight=3)), added)
+
     def test_big_array_threads_1_1_1(self):
         self._test_big_array_threads(1, 1, 1)
 
@@ -41,3 +41,47 @@ class TestAESCipher(TestCase):
         with self.assertRaises(DataIntegrityError):
             damaged = ciphertext[:20]
             cipher.decrypt(damaged)
+
+    def test_encrypt_many(self):
+        from eventsourcing.utils.cipher.aes import AESCipher
+
+        cipher = AESCipher(cipher_key=b"0123456789abcdef")
+        plaintexts = [b"plaintext%d" % i for i in range(10)]
+
+        # Encrypt a batch of plaintexts.
+        ciphertexts = cipher.encrypt_many(plaintexts)
+        self.assertEqual(len(ciphertexts), 10)
+
+        # Check the nonces are unique.
+        nonces = [c[:12] for c in ciphertexts]
+        self.assertEqual(len(set(nonces)), 10)
+
+        # Check batches of one plaintext don't share nonces.
+        nonces = [cipher.encrypt_many([b"a"])[0][:12] for _ in range(1000)]
+        self.assertEqual(len(set(nonces)), 1000)
+        # Check the nonces have no fixed part (e.g. a counter starting at zero).
+        self.assertGreater(len(set(n[8:] for n in nonces)), 1)
+
+        # Decrypt the batch, and decrypt individually.
+        self.assertEqual(cipher.decrypt_many(ciphertexts), plaintexts)
+        self.assertEqual(cipher.decrypt(ciphertexts[3]), plaintexts[3])
+        self.assertEqual(cipher.decrypt_many([cipher.encrypt(b"a")]), [b"a"])
+        self.assertEqual(cipher.encrypt_many([]), [])
+        self.assertEqual(cipher.decrypt_many([]), [])
+
+        # Check DataIntegrityError is raised (MAC check fails).
+        with self.assertRaises(DataIntegrityError):
+            cipher.decrypt_many(ciphertexts[:2] + [b"a" + ciphertexts[2][:-1]])
+
+    def test_encrypt_many_with_threads(self):
+        from eventsourcing.utils.cipher.aes import AESCipher
+
+        class ThreadedAESCipher(AESCipher):
+            max_workers = 3
+
+        cipher = ThreadedAESCipher(cipher_key=b"0123456789abcdef")
+        plaintexts = [b"plaintext%d" % i for i in range(10)]
+        ciphertexts = cipher.encrypt_many(plaintexts)
+        self.assertEqual(len(set(c[:12] for c in ciphertexts)), 10)
+        self.assertEqual(cipher.decrypt_many(ciphertexts), plaintexts)
+        self.assertIsNot(cipher.get_executor(), AESCipher.get_executor())
@@ -0,0 +1,241 @@
+import pickle
+import zlib
+from unittest import TestCase
+from uuid import uuid4
+
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.domain.model.aggregate import AggregateRoot
+from eventsourcing.domain.model.events import assert_event_handlers_empty
+from eventsourcing.exceptions import DataIntegrityError
+from eventsourcing.infrastructure.compression import train_compressor
+from eventsourcing.infrastructure.integersequencegenerators.base import (
+    SimpleIntegerSequenceGenerator,
+)
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.utils.compressor import (
+    MAX_DICTIONARY_SIZE,
+    CompressionDictionary,
+    DictionaryCompressor,
+    train_dictionary,
+)
+from eventsourcing.utils.topic import get_topic
+
+
+class Counter(AggregateRoot):
+    def __init__(self, **kwargs):
+        super(Counter, self).__init__(**kwargs)
+        self.count = 0
+
+    def increment(self, by=1):
+        self.__trigger_event__(Counter.Incremented, by=by)
+
+    class Incremented(AggregateRoot.Event):
+        def mutate(self, obj):
+            obj.count += self.by
+
+
+def make_states(num_states, offset=0):
+    mapper = SequencedItemMapper()
+    return [
+        mapper.json_dumps(
+            {
+                "originator_id": uuid4(),
+                "originator_version": i,
+                "__event_hash__": "{:064x}".format(i * 7919),
+                "timestamp": 1600000000.0 + i,
+                "sku": "sku{}".format(i % 20),
+                "quantity": i % 5,
+            }
+        )
+        for i in range(offset, offset + num_states)
+    ]
+
+
+class TestDictionaryCompressor(TestCase):
+    def test_train_dictionary(self):
+        samples = make_states(100)
+        dictionary = train_dictionary(samples)
+        self.assertLessEqual(len(dictionary), MAX_DICTIONARY_SIZE)
+        # The most common strings are at the end.
+        self.assertIn(b'"originator_version":', dictionary[-1000:])
+
+        self.assertEqual(len(train_dictionary(samples, size=100)), 100)
+        self.assertEqual(train_dictionary([]), b"")
+
+    def test_compress_and_decompress(self):
+        compressor = DictionaryCompressor()
+        samples = make_states(100)
+        states = make_states(100, offset=100)
+
+        # Compress without a dictionary.
+        compressed = compressor.compress(states[0], "topic1")
+        self.assertEqual(compressor.decompress(compressed), states[0])
+        self.assertEqual(compressor.dictionaries, [])
+
+        # Train a dictionary, which isn't used until it is added.
+        dictionary = compressor.train("topic1", samples)
+        self.assertEqual(dictionary.dictionary_id, 1)
+        self.assertEqual(dictionary.topic, "topic1")
+        self.assertEqual(compressor.dictionaries, [])
+        self.assertEqual(compressor.compress(states[0], "topic1"), compressed)
+
+        # Compress with the added dictionary.
+        compressor.add_dictionary(dictionary)
+        self.assertEqual(compressor.dictionaries, [dictionary])
+        for state in states:
+            self.assertEqual(
+                compressor.decompress(compressor.compress(state, "topic1")), state
+            )
+
+        # Compressed states are smaller than with zlib.
+        with_dictionary = sum(len(compressor.compress(s, "topic1")) for s in states)
+        with_zlib = sum(len(zlib.compress(s)) for s in states)
+        self.assertLess(with_dictionary, with_zlib * 0.7)
+
+        # Other topics are compressed without a dictionary.
+        self.assertEqual(compressor.compress(states[0], "topic2"), compressed)
+
+        # States can be decompressed after training again.
+        compressed1 = compressor.compress(states[0], "topic1")
+        dictionary2 = compressor.train("topic1", states)
+        self.assertEqual(dictionary2.dictionary_id, 2)
+        compressor.add_dictionary(dictionary2)
+        compressed2 = compressor.compress(states[0], "topic1")
+        self.assertNotEqual(compressed2, compressed1)
+        self.assertEqual(compressor.decompress(compressed1), states[0])
+        self.assertEqual(compressor.decompress(compressed2), states[0])
+
+        # States can be decompressed with the kept dictionaries.
+        compressor = DictionaryCompressor(dictionaries=[dictionary2, dictionary])
+        self.assertEqual(compressor.decompress(compressed1), states[0])
+        self.assertEqual(compressor.compress(states[0], "topic1"), compressed2)
+
+        # Dictionary IDs can't be reused for other dictionaries.
+        with self.assertRaises(ValueError):
+            compressor.add_dictionary(
+                CompressionDictionary(
+                    dictionary_id=1, topic="topic2", data=dictionary.data
+                )
+            )
+
+        # States compressed with zlib can be decompressed.
+        self.assertEqual(compressor.decompress(zlib.compress(states[0])), states[0])
+
+    def test_shared_dictionary_ids(self):
+        # Processes that train dictionaries take IDs from a shared sequence.
+        dictionary_ids = SimpleIntegerSequenceGenerator()
+        compressor1 = DictionaryCompressor(dictionary_ids=dictionary_ids)
+        compressor2 = DictionaryCompressor(dictionary_ids=dictionary_ids)
+        dictionary1 = compressor1.train("topic1", make_states(10))
+        dictionary2 = compressor2.train("topic1", make_states(10, offset=10))
+        self.assertEqual(dictionary1.dictionary_id, 1)
+        self.assertEqual(dictionary2.dictionary_id, 2)
+
+        # Trained IDs aren't reused before the dictionaries are added.
+        compressor = DictionaryCompressor()
+        self.assertEqual(compressor.train("topic1", make_states(10)).dictionary_id, 1)
+        self.assertEqual(compressor.train("topic2", make_states(10)).dictionary_id, 2)
+
+        # IDs from the shared sequence can't be in use already.
+        compressor = DictionaryCompressor(
+            dictionaries=[dictionary2],
+            dictionary_ids=SimpleIntegerSequenceGenerator(1),
+        )
+        with self.assertRaises(ValueError):
+            compressor.train("topic1", make_states(10))
+
+    def test_damaged(self):
+        compressor = DictionaryCompressor()
+        compressor.add_dictionary(compressor.train("topic1", make_states(10)))
+        state = make_states(1)[0]
+        compressed = compressor.compress(state, "topic1")
+
+        # Check DataIntegrityError is raised (dictionary not found).
+        with self.assertRaises(DataIntegrityError):
+            DictionaryCompressor().decompress(compressed)
+
+        # Check DataIntegrityError is raised (dictionary of topic not found).
+        other = DictionaryCompressor()
+        other.add_dictionary(
+            CompressionDictionary(dictionary_id=2, topic="topic1", data=b"other")
+        )
+        with self.assertRaises(DataIntegrityError) as cm:
+            other.decompress(compressed, "topic1")
+        self.assertIn("dictionary 2 of topic 'topic1' was found", str(cm.exception))
+
+        # Check DataIntegrityError is raised (dictionary has same ID).
+        other = DictionaryCompressor()
+        other.add_dictionary(
+            CompressionDictionary(dictionary_id=1, topic="topic2", data=b"other")
+        )
+        with self.assertRaises(DataIntegrityError) as cm:
+            other.decompress(compressed, "topic1")
+        self.assertIn("trained for topic 'topic2'", str(cm.exception))
+        self.assertEqual(compressor.decompress(compressed, "topic1"), state)
+
+        # Check DataIntegrityError is raised (truncated).
+        with self.assertRaises(DataIntegrityError):
+            compressor.decompress(compressed[:-5])
+
+        # Check DataIntegrityError is raised (invalid header).
+        with self.assertRaises(DataIntegrityError):
+            compressor.decompress(compressed[:2])
+
+    def test_pickle(self):
+        compressor = DictionaryCompressor(level=9)
+        compressor.add_dictionary(compressor.train("topic1", make_states(10)))
+        state = make_states(1)[0]
+        compressed = compressor.compress(state, "topic1")
+
+        copy = pickle.loads(pickle.dumps(compressor))
+        self.assertEqual(copy.level, 9)
+        self.assertEqual(copy.dictionaries, compressor.dictionaries)
+        self.assertEqual(copy.decompress(compressed), state)
+
+
+class TestTrainCompressor(TestCase):
+    def setUp(self):
+        self.compressor = DictionaryCompressor()
+        self.app = SQLAlchemyApplication(
+            persist_event_type=AggregateRoot.Event,
+            uri="sqlite:///:memory:",
+            compressor=self.compressor,
+        )
+
+    def tearDown(self):
+        self.app.close()
+        assert_event_handlers_empty()
+
+    def test_train_compressor(self):
+        counter = Counter.__create__()
+        for _ in range(20):
+            counter.increment()
+        self.app.save(counter)
+
+        record_manager = self.app.event_store.record_manager
+        event_mapper = self.app.event_store.event_mapper
+        topic = get_topic(Counter.Incremented)
+        record = list(record_manager.get_notification_records())[-1]
+        size_without_dictionary = len(record.state)
+
+        # Topics with few events in the sample don't get a dictionary.
+        dictionaries = train_compressor(
+            self.compressor, record_manager, event_mapper, sample_size=10
+        )
+        self.assertEqual([d.topic for d in dictionaries], [topic])
+
+        # The new dictionaries are used after they are kept and added.
+        self.assertEqual(self.compressor.dictionaries, [])
+        for dictionary in dictionaries:
+            self.assertEqual(dictionary.dictionary_id, 1)
+            self.compressor.add_dictionary(dictionary)
+
+        # New events are compressed with the dictionary.
+        for _ in range(5):
+            counter.increment()
+        self.app.save(counter)
+        record = list(record_manager.get_notification_records())[-1]
+        self.assertLess(len(record.state), size_without_dictionary / 2)
+
+        # Events compressed before and after training can be retrieved.
+        self.assertEqual(self.app.repository[counter.id].count, 25)
@@ -0,0 +1,171 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.domain.model.aggregate import AggregateRoot
+from eventsourcing.domain.model.events import assert_event_handlers_empty
+from eventsourcing.infrastructure.export import ColumnarExporter, ColumnarWriter
+from eventsourcing.utils.random import encoded_random_bytes
+from eventsourcing.utils.topic import get_topic
+
+
+class Order(AggregateRoot):
+    def __init__(self, **kwargs):
+        super(Order, self).__init__(**kwargs)
+        self.lines = []
+
+    def add_line(self, sku, quantity):
+        self.__trigger_event__(Order.LineAdded, sku=sku, quantity=quantity)
+
+    class LineAdded(AggregateRoot.Event):
+        def mutate(self, obj):
+            obj.lines.append((self.sku, self.quantity))
+
+
+class ListWriter(ColumnarWriter):
+    def __init__(self):
+        self.pages = []
+
+    def write(self, topic, columns, page_id):
+        self.pages.append((topic, columns, page_id))
+
+    def get_column(self, topic, name):
+        values = []
+        for page_topic, columns, _ in self.pages:
+            if page_topic == topic:
+                values.extend(columns[name])
+        return values
+
+
+class TestColumnarExporter(TestCase):
+    decode_workers = 0
+
+    def setUp(self):
+        self.app = SQLAlchemyApplication(
+            persist_event_type=AggregateRoot.Event,
+            uri="sqlite:///:memory:",
+            cipher_key=encoded_random_bytes(16),
+        )
+
+    def tearDown(self):
+        self.app.close()
+        assert_event_handlers_empty()
+
+    def create_orders(self, num_orders):
+        orders = []
+        for _ in range(num_orders):
+            order = Order.__create__()
+            order.add_line("sku1", 2)
+            order.add_line("sku2", 1)
+            self.app.save(order)
+            orders.append(order)
+        return orders
+
+    def construct_exporter(self, writer):
+        return ColumnarExporter(
+            record_manager=self.app.event_store.record_manager,
+            event_mapper=self.app.event_store.event_mapper,
+            writer=writer,
+            page_size=4,
+            decode_workers=self.decode_workers,
+        )
+
+    def test_export(self):
+        orders = self.create_orders(3)
+        writer = ListWriter()
+        exporter = self.construct_exporter(writer)
+        self.assertEqual(exporter.export(), 9)
+        self.assertEqual(exporter.position, 9)
+
+        # Pages are written in order, partitioned by topic.
+        created_topic = get_topic(Order.Created)
+        line_added_topic = get_topic(Order.LineAdded)
+        self.assertEqual(
+            [(topic, page_id) for topic, _, page_id in writer.pages],
+            [
+                (created_topic, 0),
+                (line_added_topic, 0),
+                (line_added_topic, 4),
+                (created_topic, 4),
+                (line_added_topic, 8),
+            ],
+        )
+
+        # There is a column for each attribute of the events.
+        self.assertEqual(writer.get_column(created_topic, "notification_id"), [1, 4, 7])
+        self.assertEqual(
+            writer.get_column(created_topic, "originator_id"),
+            [str(order.id) for order in orders],
+        )
+        self.assertEqual(
+            writer.get_column(line_added_topic, "originator_version"), [1, 2] * 3
+        )
+        self.assertEqual(
+            writer.get_column(line_added_topic, "sku"), ["sku1", "sku2"] * 3
+        )
+        self.assertEqual(writer.get_column(line_added_topic, "quantity"), [2, 1] * 3)
+        # Decimal timestamps are exported exactly, as strings.
+        self.assertEqual(
+            writer.get_column(created_topic, "timestamp"),
+            [str(order.__created_on__) for order in orders],
+        )
+        columns = writer.pages[0][1]
+        self.assertEqual(
+            list(columns)[:4],
+            ["notification_id", "originator_id", "originator_version", "timestamp"],
+        )
+
+        # The export can be resumed from the returned position.
+        writer = ListWriter()
+        exporter = self.construct_exporter(writer)
+        self.assertEqual(exporter.export(start=9), 9)
+        self.assertEqual(writer.pages, [])
+        self.create_orders(1)
+        self.assertEqual(exporter.export(start=9), 12)
+        self.assertEqual(writer.get_column(created_topic, "notification_id"), [10])
+        self.assertEqual(
+            writer.get_column(line_added_topic, "notification_id"), [11, 12]
+        )
+
+        # The export can be stopped at a position.
+        writer = ListWriter()
+        exporter = self.construct_exporter(writer)
+        self.assertEqual(exporter.export(start=2, stop=5), 5)
+        self.assertEqual(
+            writer.get_column(created_topic, "notification_id")
+            + writer.get_column(line_added_topic, "notification_id"),
+            [4, 3, 5],
+        )
+
+    def test_parquet_writer(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest("Parquet export needs pyarrow")
+        from eventsourcing.infrastructure.parquet import ParquetWriter
+
+        self.create_orders(3)
+        with TemporaryDirectory() as path:
+            exporter = self.construct_exporter(ParquetWriter(path))
+            exporter.export()
+            dirnames = sorted(os.listdir(path))
+            self.assertEqual(len(dirnames), 2)
+            self.assertTrue(dirnames[0].startswith("topic="))
+            line_added_path = os.path.join(path, dirnames[1])
+            self.assertEqual(
+                sorted(os.listdir(line_added_path)),
+                [
+                    "part-00000000000000000000.parquet",
+                    "part-00000000000000000004.parquet",
+                    "part-00000000000000000008.parquet",
+                ],
+            )
+            table = pyarrow.parquet.read_table(
+                os.path.join(line_added_path, "part-00000000000000000000.parquet")
+            )
+            self.assertEqual(table.column("sku").to_pylist(), ["sku1", "sku2", "sku1"])
+
+
+class TestColumnarExporterWithDecodeWorkers(TestColumnarExporter):
+    decode_workers = 2
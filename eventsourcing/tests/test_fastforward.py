@@ -1,62 +1,168 @@
-# from eventsourcing.example.application import ExampleApplication
-# from eventsourcing.example.domainmodel import Example
-# from eventsourcing.exceptions import ConcurrencyError, RecordConflictError
-# from eventsourcing.tests.example_application_tests.base import ExampleApplicationTestCase
-# from eventsourcing.tests.sequenced_item_tests.test_sqlalchemy_record_manager import \
-#     WithSQLAlchemyRecordManagers
-#
-#
-# class TestFastForward(WithSQLAlchemyRecordManagers, ExampleApplicationTestCase):
-#
-#     def test(self):
-#         with self.construct_application() as app:
-#             assert isinstance(app, ExampleApplication)
-#             example = app.create_new_example(1, 2)
-#             instance1 = app.example_repo[example.id]
-#             instance2 = app.example_repo[example.id]
-#
-#             assert isinstance(instance1, Example)
-#             assert isinstance(instance2, Example)
-#
-#             self.assertEqual(instance1.__version__, 1)
-#             self.assertEqual(instance2.__version__, 1)
-#
-#             # Evolve instance1 by a version.
-#             instance1.beat_heart()
-#             self.assertEqual(instance1.__version__, 2)
-#
-#             # Fail to evolve instance2 in the same way.
-#             # Todo: This needs to be a deepcopy.
-#             preop_state = instance2.__dict__.copy()
-#             with self.assertRaises(RecordConflictError):
-#                 instance2.beat_heart()
-#
-#             # Reset instance2 to its pre-op state.
-#             instance2.__dict__.update(preop_state)
-#             self.assertEqual(instance2.__version__, 1)
-#
-#             # Fast forward instance2 from pre-op state.
-#             instance3 = app.example_repo.fastforward(instance2)
-#             self.assertEqual(instance2.__version__, 1)
-#             self.assertEqual(instance3.__version__, 2)
-#
-#             # Try again to beat heart.
-#             instance3.beat_heart()
-#             self.assertEqual(instance3.__version__, 3)
-#
-#             # Try to evolve instance1 from its stale version.
-#             preop_state = instance1.__dict__.copy()
-#             with self.assertRaises(ConcurrencyError):
-#                 instance1.beat_heart()
-#
-#             # Reset instance1 to pre-op state.
-#             instance1.__dict__.update(preop_state)
-#
-#             # Fast forward instance1 from pre-op state.
-#             instance4 = app.example_repo.fastforward(instance1)
-#             self.assertEqual(instance1.__version__, 2)
-#             self.assertEqual(instance4.__version__, 3)
-#
-#             # Try again to beat heart.
-#             instance4.beat_heart()
-#             self.assertEqual(instance4.__version__, 4)
+from copy import deepcopy
+from unittest import TestCase, mock
+
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.domain.model.aggregate import AggregateRoot
+from eventsourcing.domain.model.events import assert_event_handlers_empty
+from eventsourcing.exceptions import RecordConflictError, RepositoryKeyError
+from eventsourcing.utils.tracing import Tracer
+
+
+class Counter(AggregateRoot):
+    def __init__(self, **kwargs):
+        super(Counter, self).__init__(**kwargs)
+        self.count = 0
+
+    def increment(self):
+        self.__trigger_event__(Counter.Incremented)
+        return self.count
+
+    class Incremented(AggregateRoot.Event):
+        def mutate(self, obj):
+            obj.count += 1
+
+
+class FastForwardTestCase(TestCase):
+    use_cache = True
+
+    def setUp(self):
+        self.app = SQLAlchemyApplication(
+            persist_event_type=AggregateRoot.Event,
+            use_cache=self.use_cache,
+            uri="sqlite:///:memory:",
+        )
+        counter = Counter.__create__()
+        self.app.save(counter)
+        self.counter_id = counter.id
+
+    def tearDown(self):
+        self.app.close()
+        assert_event_handlers_empty()
+
+    def increment_elsewhere(self, num_events=1):
+        # Store events as if another instance of the application had saved them.
+        other = self.app.repository.get_entity(self.counter_id)
+        for _ in range(num_events):
+            other.increment()
+        self.app.event_store.store_events(other.__batch_pending_events__())
+
+
+class TestFastForward(FastForwardTestCase):
+    def test_fastforward(self):
+        instance1 = self.app.repository.get_entity(self.counter_id)
+        self.increment_elsewhere(2)
+
+        instance2 = self.app.repository.fastforward(instance1)
+        self.assertEqual(instance1.__version__, 0)
+        self.assertEqual(instance1.count, 0)
+        self.assertEqual(instance2.__version__, 2)
+        self.assertEqual(instance2.count, 2)
+
+        # Only the missing events are retrieved.
+        with Tracer() as tracer:
+            self.app.repository.fastforward(instance1)
+        query_span = tracer.get_spans("event_store.query")[0]
+        self.assertEqual(query_span.attrs["count"], 2)
+
+        # Fast forwarding an up-to-date instance gives an equal copy.
+        instance3 = self.app.repository.fastforward(instance2)
+        self.assertIsNot(instance3, instance2)
+        self.assertEqual(instance3.__version__, 2)
+
+        # A discarded entity can't be fast forwarded.
+        instance2.__discard__()
+        self.app.save(instance2)
+        self.assertIsNone(self.app.repository.fastforward(instance1))
+
+    def test_execute(self):
+        self.assertEqual(self.app.execute(self.counter_id, Counter.increment), 1)
+        self.assertEqual(self.app.execute(self.counter_id, Counter.increment), 2)
+        self.assertEqual(self.app.repository.get_entity(self.counter_id).count, 2)
+
+        with self.assertRaises(RepositoryKeyError):
+            self.app.execute(Counter.__create__().id, Counter.increment)
+
+    def test_execute_retries_after_conflict(self):
+        self.app.execute(self.counter_id, Counter.increment)
+        self.increment_elsewhere(2)
+
+        # The command is retried after fast forwarding the aggregate.
+        self.assertEqual(self.app.execute(self.counter_id, Counter.increment), 4)
+        counter = self.app.repository.get_entity(self.counter_id)
+        self.assertEqual(counter.__version__, 4)
+        self.assertEqual(counter.count, 4)
+        self.assertEqual(self.app.repository[self.counter_id].count, 4)
+
+    def test_execute_raises_after_max_attempts(self):
+        def conflicting_increment(counter):
+            self.increment_elsewhere()
+            counter.increment()
+
+        with self.assertRaises(RecordConflictError):
+            self.app.execute(self.counter_id, conflicting_increment, max_attempts=2)
+        self.assertEqual(self.app.repository.get_entity(self.counter_id).count, 2)
+
+    def test_execute_discarded_aggregate(self):
+        def discard_elsewhere(counter):
+            other = self.app.repository.get_entity(self.counter_id)
+            other.__discard__()
+            self.app.event_store.store_events(other.__batch_pending_events__())
+            counter.increment()
+
+        with self.assertRaises(RepositoryKeyError):
+            self.app.execute(self.counter_id, discard_elsewhere)
+        with self.assertRaises(RepositoryKeyError):
+            self.app.repository[self.counter_id]
+
+
+class TestFastForwardWithoutCache(TestFastForward):
+    use_cache = False
+
+    def test_execute_doesnt_copy_aggregate(self):
+        def increment_after_conflict(counter):
+            if not calls:
+                self.increment_elsewhere(2)
+            calls.append(counter)
+            return counter.increment()
+
+        # The aggregate is retrieved again after a conflict, not copied.
+        calls = []
+        with mock.patch(
+            "eventsourcing.application.simple.deepcopy", side_effect=deepcopy
+        ) as copy:
+            self.assertEqual(
+                self.app.execute(self.counter_id, increment_after_conflict), 3
+            )
+        self.assertEqual(copy.call_count, 0)
+        self.assertEqual(len(calls), 2)
+        self.assertIsNot(calls[0], calls[1])
+        self.assertEqual(self.app.repository[self.counter_id].count, 3)
+
+
+class TestRepositoryCache(FastForwardTestCase):
+    def test_execute_doesnt_read_cached_aggregate(self):
+        self.app.repository[self.counter_id]
+        with Tracer() as tracer:
+            for _ in range(3):
+                self.app.execute(self.counter_id, Counter.increment)
+        self.assertEqual(tracer.get_spans("repository.get_entity"), [])
+        self.assertEqual(tracer.get_spans("event_store.query"), [])
+        self.assertEqual(self.app.repository[self.counter_id].count, 3)
+
+    def test_failed_save_evicts_aggregate_from_cache(self):
+        counter = self.app.repository[self.counter_id]
+        self.increment_elsewhere()
+        counter.increment()
+        with self.assertRaises(RecordConflictError):
+            self.app.save(counter)
+        self.assertNotIn(self.counter_id, self.app.repository.cache)
+        self.assertEqual(self.app.repository[self.counter_id].count, 1)
+
+    def test_cache_keeps_latest_version(self):
+        counter = self.app.repository[self.counter_id]
+        later = deepcopy(counter)
+        later.increment()
+        self.app.repository.put_entity_in_cache(self.counter_id, later)
+        self.assertIs(self.app.repository.cache[self.counter_id], later)
+        self.app.repository.put_entity_in_cache(self.counter_id, counter)
+        self.assertIs(self.app.repository.cache[self.counter_id], later)
@@ -1,4 +1,9 @@
+from threading import Lock, Thread
+
+from eventsourcing.exceptions import ProgrammingError
 from eventsourcing.infrastructure.integersequencegenerators.base import (
+    AbstractIntegerSequenceGenerator,
+    ReservingIntegerSequenceGenerator,
     SimpleIntegerSequenceGenerator,
 )
 from eventsourcing.infrastructure.integersequencegenerators.redisincr import RedisIncr
@@ -26,6 +31,14 @@ class IntegerSequenceGeneratorTestCase(AbstractTestCase):
             j = next(g)
             self.assertEqual(i, j)
 
+    def test_reserve(self):
+        g = self.generator_class()
+        self.assertEqual(list(g.reserve(3)), [0, 1, 2])
+        self.assertEqual(next(g), 3)
+        self.assertEqual(list(g.reserve(1)), [4])
+        with self.assertRaises(ValueError):
+            g.reserve(0)
+
 
 class TestSimpleIntegerSequenceGenerator(IntegerSequenceGeneratorTestCase):
     generator_class = SimpleIntegerSequenceGenerator
@@ -33,3 +46,139 @@ class TestSimpleIntegerSequenceGenerator(IntegerSequenceGeneratorTestCase):
 
 class TestRedisIncr(IntegerSequenceGeneratorTestCase):
     generator_class = RedisIncr
+
+
+class FakeRedis(object):
+    """
+    Stands in for a Redis client, supporting the INCR and INCRBY commands.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.num_commands = 0
+        self.lock = Lock()
+
+    def incr(self, key):
+        return self.incrby(key, 1)
+
+    def incrby(self, key, amount):
+        with self.lock:
+            self.num_commands += 1
+            self.values[key] = self.values.get(key, 0) + amount
+            return self.values[key]
+
+
+class TestRedisIncrWithFakeRedis(IntegerSequenceGeneratorTestCase):
+    def generator_class(self):
+        return RedisIncr(redis=FakeRedis())
+
+    def test_reserve_uses_one_command(self):
+        redis = FakeRedis()
+        g = RedisIncr(redis=redis)
+        self.assertEqual(g.reserve(100), range(0, 100))
+        self.assertEqual(g.reserve(100), range(100, 200))
+        self.assertEqual(redis.num_commands, 2)
+
+
+class TestReservingIntegerSequenceGenerator(IntegerSequenceGeneratorTestCase):
+    def generator_class(self):
+        return ReservingIntegerSequenceGenerator(SimpleIntegerSequenceGenerator())
+
+    def test_reserve(self):
+        g = self.generator_class()
+        self.assertEqual(g.reserve(3), range(0, 3))
+        self.assertEqual(next(g), 3)
+        self.assertEqual(g.reserve(1), range(13, 14))
+        with self.assertRaises(ValueError):
+            g.reserve(0)
+
+    def test_blocks_are_reserved(self):
+        redis = FakeRedis()
+        g = ReservingIntegerSequenceGenerator(
+            RedisIncr(redis=redis), block_size=10, max_block_size=10
+        )
+        self.assertEqual([next(g) for _ in range(25)], list(range(25)))
+        self.assertEqual(redis.num_commands, 3)
+
+    def test_block_size_adapts_to_rate(self):
+        generator = SimpleIntegerSequenceGenerator()
+        g = ReservingIntegerSequenceGenerator(
+            generator,
+            block_size=4,
+            min_block_size=2,
+            max_block_size=16,
+            target_interval=1000,
+        )
+        # Blocks used quickly are followed by bigger blocks.
+        for _ in range(5):
+            next(g)
+        self.assertEqual(g.block_size, 8)
+        self.assertEqual(generator.i, 12)
+        for _ in range(95):
+            next(g)
+        self.assertEqual(g.block_size, 16)
+
+        # Blocks used slowly are followed by smaller blocks.
+        g.target_interval = -1
+        g.close()
+        for _ in range(3):
+            next(g)
+            g.close()
+        self.assertEqual(g.block_size, 2)
+
+        with self.assertRaises(ValueError):
+            ReservingIntegerSequenceGenerator(g, block_size=0)
+
+    def test_unused_ranges_are_reported(self):
+        unused = []
+        g = ReservingIntegerSequenceGenerator(
+            SimpleIntegerSequenceGenerator(),
+            block_size=10,
+            max_block_size=10,
+            on_unused=unused.append,
+        )
+        self.assertEqual(next(g), 0)
+        self.assertEqual(next(g), 1)
+        g.close()
+        self.assertEqual(unused, [range(2, 10)])
+        self.assertEqual(next(g), 10)
+
+        # Blocks reserved by the caller don't come from the current block.
+        self.assertEqual(g.reserve(5), range(20, 25))
+        self.assertEqual(next(g), 11)
+
+        # Closing after the block has been used doesn't report anything.
+        for _ in range(8):
+            next(g)
+        g.close()
+        self.assertEqual(unused, [range(2, 10)])
+
+    def test_threads_are_issued_distinct_integers(self):
+        g = ReservingIntegerSequenceGenerator(SimpleIntegerSequenceGenerator())
+        issued = []
+
+        def task():
+            issued.extend([next(g) for _ in range(1000)])
+
+        threads = [Thread(target=task) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(issued), list(range(4000)))
+
+    def test_generator_must_reserve_contiguous_blocks(self):
+        class Evens(AbstractIntegerSequenceGenerator):
+            def __init__(self):
+                self.i = 0
+
+            def __next__(self):
+                self.i += 2
+                return self.i
+
+        g = ReservingIntegerSequenceGenerator(Evens(), block_size=1)
+        self.assertEqual(next(g), 2)
+        g.close()
+        g.block_size = 2
+        with self.assertRaises(ProgrammingError):
+            next(g)
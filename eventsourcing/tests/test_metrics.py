@@ -0,0 +1,203 @@
+import logging
+from queue import Queue
+from threading import Event
+from unittest import TestCase
+
+from eventsourcing.application.process import ProcessApplication
+from eventsourcing.application.simple import PromptToPull
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.domain.model.events import assert_event_handlers_empty
+from eventsourcing.system.runner import PromptQueuedApplicationThread
+from eventsourcing.tests.test_process import ExampleAggregate, example_policy
+from eventsourcing.utils import metrics
+from eventsourcing.utils.metrics import (
+    InMemoryMetrics,
+    LoggingMetrics,
+    prometheus_text,
+)
+
+
+class TestInMemoryMetrics(TestCase):
+    def setUp(self):
+        self.sink = InMemoryMetrics()
+        metrics.add_sink(self.sink)
+
+    def tearDown(self):
+        metrics.remove_sink(self.sink)
+
+    def test_add_and_remove_sink(self):
+        self.assertIn(self.sink, metrics.sinks)
+        metrics.add_sink(self.sink)
+        self.assertEqual(metrics.sinks.count(self.sink), 1)
+        metrics.remove_sink(self.sink)
+        self.assertNotIn(self.sink, metrics.sinks)
+        metrics.remove_sink(self.sink)
+        metrics.increment("events_total", application="orders")
+        self.assertEqual(self.sink.get_counter("events_total", application="orders"), 0)
+
+    def test_increment(self):
+        metrics.increment("events_total", application="orders")
+        metrics.increment("events_total", 2, application="orders")
+        metrics.increment("events_total", application="payments")
+        self.assertEqual(self.sink.get_counter("events_total", application="orders"), 3)
+        self.assertEqual(
+            self.sink.get_counter("events_total", application="payments"), 1
+        )
+        self.assertEqual(self.sink.get_counter("events_total"), 0)
+
+    def test_observe(self):
+        metrics.observe("seconds", 0.5, application="orders")
+        metrics.observe("seconds", 1.5, application="orders")
+        summary = self.sink.get_summary("seconds", application="orders")
+        self.assertEqual(summary.count, 2)
+        self.assertEqual(summary.sum, 2.0)
+        self.assertEqual(summary.min, 0.5)
+        self.assertEqual(summary.max, 1.5)
+        self.assertEqual(self.sink.get_summary("seconds").count, 0)
+
+    def test_gauge(self):
+        metrics.gauge("lag", 5, application="orders")
+        metrics.gauge("lag", 2, application="orders")
+        self.assertEqual(self.sink.get_gauge("lag", application="orders"), 2)
+        self.sink.clear()
+        self.assertEqual(self.sink.get_gauge("lag", application="orders"), 0)
+
+    def test_prometheus_text(self):
+        metrics.increment("events_total", application="orders")
+        metrics.gauge("lag", 3, application='say "hi"')
+        metrics.observe("seconds", 0.25)
+        self.assertEqual(
+            prometheus_text(self.sink),
+            "# TYPE eventsourcing_events_total counter\n"
+            'eventsourcing_events_total{application="orders"} 1\n'
+            "# TYPE eventsourcing_lag gauge\n"
+            'eventsourcing_lag{application="say \\"hi\\""} 3\n'
+            "# TYPE eventsourcing_seconds summary\n"
+            "eventsourcing_seconds_count 1\n"
+            "eventsourcing_seconds_sum 0.25\n",
+        )
+
+
+class TestLoggingMetrics(TestCase):
+    def test_logs_measurements(self):
+        sink = LoggingMetrics(level=logging.INFO)
+        metrics.add_sink(sink)
+        try:
+            with self.assertLogs("eventsourcing.utils.metrics", logging.INFO) as cm:
+                metrics.increment("events_total", application="orders")
+                metrics.observe("seconds", 0.5)
+                metrics.gauge("lag", 1)
+        finally:
+            metrics.remove_sink(sink)
+        self.assertEqual(len(cm.output), 3)
+        self.assertIn("events_total", cm.output[0])
+
+
+class TestProcessApplicationMetrics(TestCase):
+    infrastructure_class = SQLAlchemyApplication
+
+    def setUp(self):
+        self.sink = InMemoryMetrics()
+
+    def tearDown(self):
+        metrics.remove_sink(self.sink)
+        assert_event_handlers_empty()
+
+    def test_process_application_metrics(self):
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        with process_class(
+            name="test",
+            policy=example_policy,
+            persist_event_type=ExampleAggregate.Event,
+            uri="sqlite:///:memory:",
+            setup_table=True,
+        ) as process:
+            process.follow("test", process.notification_log)
+            aggregate = ExampleAggregate.__create__()
+            aggregate.__save__()
+
+            # Nothing is recorded whilst metrics are disabled.
+            process.run()
+            self.assertFalse(self.sink.counters)
+
+            # Record metrics whilst processing another event.
+            metrics.add_sink(self.sink)
+            aggregate = ExampleAggregate.__create__()
+            aggregate.__save__()
+            record_manager = process.event_store.record_manager
+            head_notification_id = record_manager.get_max_notification_id()
+            process.run(PromptToPull("test", process.pipeline_id, head_notification_id))
+
+            labels = dict(application="test", upstream="test")
+            self.assertEqual(self.sink.get_counter("process_events_total", **labels), 3)
+            self.assertEqual(
+                self.sink.get_summary("process_event_seconds", **labels).count, 3
+            )
+            self.assertEqual(
+                self.sink.get_summary("policy_seconds", application="test").count, 3
+            )
+            self.assertEqual(
+                self.sink.get_summary("write_seconds", application="test").count, 3
+            )
+            self.assertEqual(self.sink.get_counter("notifications_read_total"), 3)
+
+            # Lag is the head of the prompt less the position of the reader.
+            reader = process.readers["test"]
+            self.assertEqual(
+                self.sink.get_gauge("notification_lag", **labels),
+                head_notification_id - reader.position,
+            )
+            while process.run():
+                pass
+            process.run(PromptToPull("test", process.pipeline_id, reader.position))
+            self.assertEqual(self.sink.get_gauge("notification_lag", **labels), 0)
+
+    def test_tick_interval_overrun(self):
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        with process_class(
+            name="test",
+            policy=example_policy,
+            persist_event_type=ExampleAggregate.Event,
+            uri="sqlite:///:memory:",
+            setup_table=True,
+        ) as process:
+            process.follow("test", process.notification_log)
+            # Processing an event takes longer than the tick interval.
+            process.tick_interval = 1e-9
+            metrics.add_sink(self.sink)
+            aggregate = ExampleAggregate.__create__()
+            aggregate.__save__()
+            logger_name = "eventsourcing.application.process"
+            with self.assertLogs(logger_name, "WARNING") as cm:
+                process.run()
+            self.assertIn("test cycle exceeded tick interval by", cm.output[0])
+            self.assertGreater(
+                self.sink.get_counter("tick_interval_overruns_total", application="test"),
+                0,
+            )
+
+    def test_clock_cycle_overrun(self):
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        with process_class(
+            name="test",
+            policy=example_policy,
+            persist_event_type=ExampleAggregate.Event,
+            uri="sqlite:///:memory:",
+            setup_table=True,
+        ) as process:
+            process.follow("test", process.notification_log)
+            # The clock ticks again before the process finishes.
+            clock_event = Event()
+            clock_event.set()
+            thread = PromptQueuedApplicationThread(
+                process=process, inbox=Queue(), outbox=None, clock_event=clock_event
+            )
+            metrics.add_sink(self.sink)
+            logger_name = "eventsourcing.system.runner"
+            with self.assertLogs(logger_name, "WARNING") as cm:
+                thread.process_prompt(PromptToPull("test", process.pipeline_id))
+            self.assertIn("test overran clock cycle", cm.output[0])
+            self.assertEqual(
+                self.sink.get_counter("tick_interval_overruns_total", application="test"),
+                1,
+            )
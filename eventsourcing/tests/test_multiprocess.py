@@ -0,0 +1,172 @@
+import multiprocessing
+import pickle
+from queue import Empty
+from unittest import TestCase
+from uuid import uuid4
+
+from eventsourcing.application.process import PromptToQuit
+from eventsourcing.application.simple import PromptToPull
+from eventsourcing.exceptions import ProgrammingError
+from eventsourcing.infrastructure.popo.manager import PopoRecordManager
+from eventsourcing.infrastructure.popo.records import StoredEventRecord
+from eventsourcing.infrastructure.sequenceditem import StoredEvent
+from eventsourcing.system.definition import System
+from eventsourcing.system.multiprocess import (
+    MultiprocessRunner,
+    NotificationRingBuffer,
+    PromptInbox,
+    RingBufferNotificationLog,
+)
+from eventsourcing.tests.system_test_fixtures import Orders, Reservations
+
+
+def put_prompts(inbox, num_prompts):
+    for i in range(num_prompts):
+        inbox.put(PromptToPull("upstream", 1, i + 1))
+
+
+def write_notifications(ring_buffer, notifications):
+    ring_buffer.write(notifications)
+
+
+class TestPromptInbox(TestCase):
+    def test_prompts_are_consolidated(self):
+        inbox = PromptInbox(upstream_names=["Upstream", "other"], pipeline_id=1)
+        with self.assertRaises(Empty):
+            inbox.get(timeout=0)
+
+        # Put prompts in another operating system process.
+        process = multiprocessing.Process(target=put_prompts, args=(inbox, 100))
+        process.start()
+        process.join()
+
+        # Check one prompt is received, with the highest notification ID.
+        prompt = inbox.get(timeout=1)
+        self.assertIsInstance(prompt, PromptToPull)
+        self.assertEqual(prompt.process_name, "upstream")
+        self.assertEqual(prompt.pipeline_id, 1)
+        self.assertEqual(prompt.head_notification_id, 100)
+        inbox.task_done()
+        with self.assertRaises(Empty):
+            inbox.get(timeout=0)
+
+        # Check prompts from different upstream applications are received.
+        inbox.put(PromptToPull("other", 1))
+        inbox.put(PromptToPull("upstream", 1, 101))
+        inbox.put(PromptToQuit())
+        prompts = [inbox.get(timeout=1) for _ in range(3)]
+        self.assertEqual(
+            [(p.process_name, p.head_notification_id) for p in prompts[:2]],
+            [("upstream", 101), ("other", None)],
+        )
+        self.assertIsInstance(prompts[2], PromptToQuit)
+
+        with self.assertRaises(ProgrammingError):
+            inbox.put("prompt")
+
+
+class TestNotificationRingBuffer(TestCase):
+    def test_read_and_write(self):
+        ring_buffer = NotificationRingBuffer(num_slots=4, slot_size=128)
+        self.assertIsNone(ring_buffer.read(1))
+
+        # Write notifications in another operating system process.
+        notifications = [
+            {"id": i, "topic": "topic", "state": b"state", "causal_dependencies": ""}
+            for i in range(1, 6)
+        ]
+        process = multiprocessing.Process(
+            target=write_notifications, args=(ring_buffer, notifications)
+        )
+        process.start()
+        process.join()
+
+        # Check the first notification has been overwritten.
+        self.assertIsNone(ring_buffer.read(1))
+        for i in range(2, 6):
+            self.assertEqual(ring_buffer.read(i), notifications[i - 1])
+        self.assertIsNone(ring_buffer.read(6))
+
+        # Check notifications that are too large aren't written.
+        ring_buffer.write([{"id": 6, "state": b"x" * 200}])
+        self.assertIsNone(ring_buffer.read(6))
+        self.assertIsNone(ring_buffer.read(2))
+
+        with self.assertRaises(ValueError):
+            NotificationRingBuffer(slot_size=16)
+
+
+class TestRingBufferNotificationLog(TestCase):
+    def test_get_items(self):
+        record_manager = PopoRecordManager(
+            record_class=StoredEventRecord,
+            sequenced_item_class=StoredEvent,
+            contiguous_record_ids=True,
+            application_name=uuid4().hex,
+        )
+        originator_id = uuid4()
+        record_manager.record_items(
+            [StoredEvent(originator_id, i, "topic", "state") for i in range(5)]
+        )
+        ring_buffer = NotificationRingBuffer(num_slots=10)
+        notification_log = RingBufferNotificationLog(
+            record_manager, section_size=10, ring_buffer=ring_buffer
+        )
+        expected = list(record_manager.get_notifications(0, 5))
+        self.assertEqual(notification_log.get_items(0, 10), expected)
+
+        # Put some of the notifications in the ring buffer.
+        in_buffer = [dict(n, state="buffered") for n in expected[:3]]
+        ring_buffer.write(in_buffer)
+        self.assertEqual(notification_log.get_items(0, 2), in_buffer[:2])
+        self.assertEqual(
+            notification_log.get_items(1, 10), in_buffer[1:] + expected[3:]
+        )
+        self.assertEqual(notification_log.get_items(3, None), expected[3:])
+        self.assertEqual(len(notification_log["1,10"].items), 5)
+
+
+class TestPromptToPull(TestCase):
+    def test_notifications_are_not_pickled(self):
+        prompt = PromptToPull("upstream", 1, 1, [{"id": 1}])
+        self.assertEqual(prompt.notifications, [{"id": 1}])
+        copy = pickle.loads(pickle.dumps(prompt))
+        self.assertEqual(copy, prompt)
+        self.assertEqual(copy.head_notification_id, 1)
+        self.assertIsNone(copy.notifications)
+
+    def test_combine(self):
+        prompt = PromptToPull("upstream", 1, 1, [{"id": 1}])
+        combined = prompt.combine(PromptToPull("upstream", 1, 2, [{"id": 2}]))
+        self.assertEqual(combined, prompt)
+        self.assertEqual(combined.head_notification_id, 2)
+        self.assertEqual(combined.notifications, [{"id": 1}, {"id": 2}])
+
+        # Notifications are only kept if both prompts carry them.
+        combined = combined.combine(PromptToPull("upstream", 1, None))
+        self.assertEqual(combined.head_notification_id, 2)
+        self.assertIsNone(combined.notifications)
+
+
+class TestMultiprocessRunner(TestCase):
+    def test_ring_buffers_need_notification_ids(self):
+        system = System(Orders | Reservations)
+
+        # Prompts are sent through queues by default.
+        runner = MultiprocessRunner(system)
+        self.assertFalse(runner.use_shared_memory)
+
+        # Notifications are only written to ring buffers
+        # if their IDs are set when events are recorded.
+        with self.assertRaises(ProgrammingError):
+            MultiprocessRunner(system, ring_buffer_size=10)
+
+        class NotifyingOrders(Orders):
+            set_notification_ids = True
+
+        class NotifyingReservations(Reservations):
+            set_notification_ids = True
+
+        system = System(NotifyingOrders | NotifyingReservations)
+        runner = MultiprocessRunner(system, ring_buffer_size=10)
+        self.assertEqual(runner.ring_buffer_size, 10)
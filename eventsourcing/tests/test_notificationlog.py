@@ -8,6 +8,11 @@ from eventsourcing.application.notificationlog import (
     RecordManagerNotificationLog,
 )
 from eventsourcing.domain.model.events import DomainEvent
+from eventsourcing.exceptions import ConcurrencyError, ProgrammingError
+from eventsourcing.infrastructure.integersequencegenerators.base import (
+    ReservingIntegerSequenceGenerator,
+    SimpleIntegerSequenceGenerator,
+)
 from eventsourcing.infrastructure.repositories.array import BigArrayRepository
 from eventsourcing.interface.notificationlog import (
     NotificationLogView,
@@ -20,6 +25,9 @@ from eventsourcing.tests.sequenced_item_tests.test_cassandra_record_manager impo
 from eventsourcing.tests.sequenced_item_tests.test_django_record_manager import (
     DjangoTestCase,
 )
+from eventsourcing.tests.sequenced_item_tests.test_popo_record_manager import (
+    PopoTestCase,
+)
 from eventsourcing.tests.sequenced_item_tests.test_sqlalchemy_record_manager import (
     SQLAlchemyRecordManagerTestCase,
 )
@@ -133,6 +141,127 @@ class TestBigArrayNotificationLog(TestNotificationLog):
         self.big_array.append(item)
 
 
+class TestBigArrayNotificationLogWithSequenceGenerator(TestBigArrayNotificationLog):
+    use_named_temporary_file = True
+
+    def create_notification_log(self, section_size):
+        self.big_array = self.create_big_array()
+        self.sequence_generator = SimpleIntegerSequenceGenerator()
+        self.notification_log = BigArrayNotificationLog(
+            self.big_array,
+            section_size=section_size,
+            sequence_generator=self.sequence_generator,
+        )
+        return self.notification_log
+
+    def append_notification(self, item):
+        self.notification_log.append_notifications([item])
+
+    def test_append_notifications_in_blocks(self):
+        self.create_notification_log(section_size=5)
+        self.big_array.repo.array_size = 5
+        self.assertEqual(self.notification_log.append_notifications([]), [])
+
+        # Each writer claims a block of positions.
+        reserved = []
+
+        def write(writer_num):
+            items = ["item{}-{}".format(writer_num, i) for i in range(7)]
+            reserved.extend(self.notification_log.append_notifications(items))
+
+        threads = [Thread(target=write, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(reserved), list(range(21)))
+
+        # Check the items of each writer are contiguous.
+        items = self.notification_log.get_items(0, None)
+        self.assertEqual(len(items), 21)
+        for i in range(0, 21, 7):
+            writer_num = items[i].split("-")[0]
+            self.assertEqual(
+                items[i : i + 7],
+                ["{}-{}".format(writer_num, j) for j in range(7)],
+            )
+
+        # Check the reader can read across base arrays.
+        reader = NotificationLogReader(
+            self.notification_log, use_direct_query_if_available=True
+        )
+        self.assertEqual(reader.list_notifications(), items)
+        self.assertEqual(reader.position, 21)
+        reader.seek(3)
+        self.assertEqual(list(reader.read(advance_by=9)), items[3:12])
+
+        # Check items aren't read after reserved positions that aren't
+        # assigned, since a slower writer may still assign them.
+        positions = self.sequence_generator.reserve(2)
+        self.notification_log.append_notifications(["last"])
+        self.assertEqual(self.notification_log.get_items(20, 30), [items[20]])
+        reader.seek(20)
+        self.assertEqual(reader.list_notifications(), [items[20]])
+        self.assertEqual(reader.position, 21)
+
+        # Check abandoned positions are gaps.
+        self.notification_log.abandon_positions(positions)
+        self.assertEqual(
+            self.notification_log.get_items(20, 30), [items[20], None, None, "last"]
+        )
+        self.assertEqual(reader.list_notifications(), [None, None, "last"])
+        self.assertEqual(reader.position, 24)
+
+        # Check assigned positions aren't abandoned.
+        self.notification_log.abandon_positions(range(23, 25))
+        self.assertEqual(self.notification_log.get_items(23, 30), ["last", None])
+
+    def test_abandon_unused_positions(self):
+        self.create_notification_log(section_size=5)
+        self.big_array.repo.array_size = 5
+        generator = ReservingIntegerSequenceGenerator(
+            SimpleIntegerSequenceGenerator(),
+            block_size=4,
+            on_unused=self.notification_log.abandon_positions,
+        )
+        self.notification_log.sequence_generator = generator
+
+        # Single items are appended from the generator's current block.
+        self.notification_log.append_notifications(["item0"])
+        self.notification_log.append_notifications(["item1"])
+        self.notification_log.append_notifications(["item4", "item5"])
+        self.assertEqual(self.notification_log.get_items(0, 10), ["item0", "item1"])
+
+        # The rest of the block is abandoned when the generator is closed.
+        generator.close()
+        self.assertEqual(
+            self.notification_log.get_items(0, 10),
+            ["item0", "item1", None, None, "item4", "item5"],
+        )
+
+        # Positions that fail to be assigned are abandoned.
+        self.big_array[6] = "other"
+        with self.assertRaises(ConcurrencyError):
+            self.notification_log.append_notifications(["item6", "item7"])
+        self.notification_log.append_notifications(["item8"])
+        self.assertEqual(
+            self.notification_log.get_items(6, 10), ["other", None, "item8"]
+        )
+
+    def test_append_notifications_requires_sequence_generator(self):
+        notification_log = BigArrayNotificationLog(
+            self.create_big_array(), section_size=5
+        )
+        with self.assertRaises(ProgrammingError):
+            notification_log.append_notifications(["item"])
+
+
+class TestBigArrayNotificationLogWithPopo(
+    PopoTestCase, TestBigArrayNotificationLogWithSequenceGenerator
+):
+    pass
+
+
 class TestNotificationLogReader(NotificationLogTestCase):
     def test(self):
         # Build notification log.
@@ -1,11 +1,15 @@
 from decimal import Decimal
 from unittest import TestCase
-from uuid import uuid4
+from uuid import uuid4, uuid5
 
 from sqlalchemy import Column, Text
 from sqlalchemy_utils import UUIDType
 
 from eventsourcing.application.command import CommandProcess
+from eventsourcing.application.notificationlog import (
+    NotificationLogReader,
+    RecordManagerNotificationLog,
+)
 from eventsourcing.application.process import (
     ProcessApplication,
     ProcessApplicationWithSnapshotting,
@@ -406,6 +410,245 @@ class TestProcessApplication(TestCase):
             ids = process.repository.event_store.record_manager.all_sequence_ids()
             self.assertEqual(len(list(ids)), 3)
 
+    def test_policy_workers(self):
+        self.check_policy_workers(use_cache=False)
+
+    def test_policy_workers_with_cache(self):
+        self.check_policy_workers(use_cache=True)
+
+    def check_policy_workers(self, use_cache):
+        def policy(repository, event):
+            # Count the events of each upstream aggregate.
+            tally_id = uuid5(event.originator_id, "tally")
+            if tally_id in repository:
+                tally = repository[tally_id]
+            else:
+                tally = ExampleAggregate.__create__(originator_id=tally_id)
+            tally.move_on()
+            return tally
+
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        upstream = process_class(
+            name="upstream", persist_event_type=ExampleAggregate.Event, setup_table=True
+        )
+
+        kwargs = {}
+        if self.infrastructure_class.is_constructed_with_session:
+            # Needed for SQLAlchemy only.
+            kwargs["session"] = upstream.session
+
+        downstream = process_class(
+            name="downstream",
+            policy=policy,
+            persist_event_type=ExampleAggregate.Event,
+            use_cache=use_cache,
+            policy_workers=4,
+            policy_window=5,
+            **kwargs
+        )
+        try:
+            downstream.follow("upstream", upstream.notification_log)
+
+            # Create aggregates with different numbers of events, so
+            # consecutive notifications sometimes touch the same tally.
+            aggregates = []
+            for i in range(6):
+                aggregate = ExampleAggregate.__create__()
+                for _ in range(i):
+                    aggregate.move_on()
+                aggregate.__save__()
+                aggregates.append(aggregate)
+
+            # Process the notifications in windows.
+            self.assertEqual(downstream.run(), 21)
+            self.assertEqual(downstream.run(), 0)
+
+            # Check the tallies are the same as if processed serially.
+            for i, aggregate in enumerate(aggregates):
+                tally = downstream.repository[uuid5(aggregate.id, "tally")]
+                self.assertEqual(tally.__version__, i + 1)
+
+            # Check the tracking records are contiguous.
+            record_manager = downstream.event_store.record_manager
+            self.assertEqual(
+                record_manager.get_max_tracking_record_id("upstream"), 21
+            )
+
+            # Check an exception is raised in order of the notifications.
+            downstream.policy_func = lambda repository, event: 1 / 0
+            aggregate.move_on()
+            aggregate.__save__()
+            with self.assertRaises(ZeroDivisionError):
+                downstream.run()
+            self.assertEqual(
+                record_manager.get_max_tracking_record_id("upstream"), 21
+            )
+        finally:
+            downstream.close()
+            upstream.close()
+
+    def test_dead_letters(self):
+        poison_ids = set()
+
+        def policy(repository, event):
+            if event.originator_id in poison_ids:
+                raise ValueError("poison")
+            tally = ExampleAggregate.__create__(
+                originator_id=uuid5(event.originator_id, "tally")
+            )
+            tally.move_on()
+            return tally
+
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        upstream = process_class(
+            name="upstream", persist_event_type=ExampleAggregate.Event, setup_table=True
+        )
+
+        kwargs = {}
+        if self.infrastructure_class.is_constructed_with_session:
+            # Needed for SQLAlchemy only.
+            kwargs["session"] = upstream.session
+
+        # The events of dead letters aren't notifiable.
+        with self.assertRaises(ProgrammingError):
+            process_class(name="downstream", use_dead_letters=True, **kwargs)
+
+        class DownstreamProcess(process_class):
+            set_notification_ids = True
+            use_dead_letters = True
+
+        downstream = DownstreamProcess(
+            name="downstream",
+            policy=policy,
+            persist_event_type=ExampleAggregate.Event,
+            **kwargs
+        )
+        try:
+            downstream.follow("upstream", upstream.notification_log)
+
+            poison = ExampleAggregate.__create__()
+            poison_ids.add(poison.id)
+            poison.__save__()
+            healthy = ExampleAggregate.__create__()
+            healthy.__save__()
+
+            # The poison notification is parked, and the next is processed.
+            self.assertEqual(downstream.run(), 2)
+            self.assertIn(uuid5(healthy.id, "tally"), downstream.repository)
+            self.assertNotIn(uuid5(poison.id, "tally"), downstream.repository)
+            record_manager = downstream.event_store.record_manager
+            self.assertEqual(record_manager.get_max_tracking_record_id("upstream"), 2)
+
+            self.assertEqual(len(downstream.dead_letters), 1)
+            letter = downstream.dead_letters[0]
+            self.assertEqual(letter.upstream_name, "upstream")
+            self.assertEqual(letter.pipeline_id, downstream.pipeline_id)
+            self.assertEqual(letter.notification_id, 1)
+            self.assertEqual(
+                resolve_topic(letter.event_topic), ExampleAggregate.Created
+            )
+            self.assertIn("poison", letter.error)
+
+            # Replaying fails whilst the policy still fails.
+            with self.assertRaises(ValueError):
+                downstream.replay_dead_letter("upstream", 1)
+            self.assertEqual(len(downstream.dead_letters), 1)
+
+            # Replaying after fixing the policy records the new events.
+            poison_ids.clear()
+            new_events = downstream.replay_dead_letter("upstream", 1)
+            self.assertEqual(len(new_events), 3)
+            self.assertIn(uuid5(poison.id, "tally"), downstream.repository)
+            self.assertEqual(downstream.dead_letters, [])
+
+            # Downstream applications aren't notified of dead letters.
+            reader = NotificationLogReader(downstream.notification_log)
+            topics = [n["topic"] for n in reader.read_list()]
+            self.assertTrue(topics)
+            for topic in topics:
+                self.assertNotIn("deadletters", topic)
+
+            # A notification that isn't a dead letter can't be replayed.
+            with self.assertRaises(KeyError):
+                downstream.replay_dead_letter("upstream", 2)
+
+            # Retryable exceptions are raised rather than parked.
+            def policy_with_conflict(repository, event):
+                raise CausalDependencyFailed()
+
+            downstream.policy_func = policy_with_conflict
+            healthy.move_on()
+            healthy.__save__()
+            with self.assertRaises(CausalDependencyFailed):
+                downstream.run()
+            self.assertEqual(downstream.dead_letters, [])
+        finally:
+            downstream.close()
+            upstream.close()
+
+    def test_dead_letters_in_other_pipeline(self):
+        poison_ids = set()
+
+        def policy(repository, event):
+            if event.originator_id in poison_ids:
+                raise ValueError("poison")
+            return ExampleAggregate.__create__(
+                originator_id=uuid5(event.originator_id, "tally")
+            )
+
+        process_class = ProcessApplication.mixin(self.infrastructure_class)
+        upstream = process_class(
+            name="upstream", persist_event_type=ExampleAggregate.Event, setup_table=True
+        )
+
+        kwargs = {}
+        if self.infrastructure_class.is_constructed_with_session:
+            # Needed for SQLAlchemy only.
+            kwargs["session"] = upstream.session
+
+        class DownstreamProcess(process_class):
+            set_notification_ids = True
+            use_dead_letters = True
+
+        # Construct a downstream process for each pipeline.
+        downstreams = []
+        for pipeline_id in (0, 1):
+            downstream = DownstreamProcess(
+                name="downstream", policy=policy, pipeline_id=pipeline_id, **kwargs
+            )
+            upstream_record_manager = upstream.event_store.record_manager.clone(
+                application_name="upstream", pipeline_id=pipeline_id
+            )
+            downstream.follow(
+                "upstream", RecordManagerNotificationLog(upstream_record_manager)
+            )
+            downstreams.append(downstream)
+        try:
+            # The poison notification is parked in pipeline 1.
+            upstream.change_pipeline(1)
+            poison = ExampleAggregate.__create__()
+            poison_ids.add(poison.id)
+            poison.__save__()
+            self.assertEqual(downstreams[1].run(), 1)
+            letter = downstreams[1].dead_letters[0]
+            self.assertEqual(letter.pipeline_id, 1)
+            self.assertEqual(letter.notification_id, 1)
+
+            # The dead letter is replayed with the process in pipeline 0.
+            poison_ids.clear()
+            with self.assertRaises(KeyError):
+                downstreams[0].replay_dead_letter("upstream", 1)
+            new_events = downstreams[0].replay_dead_letter(
+                "upstream", 1, pipeline_id=1
+            )
+            self.assertEqual(len(new_events), 2)
+            self.assertIn(uuid5(poison.id, "tally"), downstreams[0].repository)
+            self.assertEqual(downstreams[1].dead_letters, [])
+        finally:
+            for downstream in downstreams:
+                downstream.close()
+            upstream.close()
+
     def define_projection_record_class(self):
         class ProjectionRecord(Base):
             __tablename__ = "projections"
@@ -14,6 +14,10 @@ class TestProcessWithPopos(PopoTestCase, TestProcessApplication):
     def test_causal_dependencies(self):
         super(TestProcessWithPopos, self).test_causal_dependencies()
 
+    @skip("Popo record manager doesn't support pipelines")
+    def test_dead_letters_in_other_pipeline(self):
+        super(TestProcessWithPopos, self).test_dead_letters_in_other_pipeline()
+
     @skip("Popo record manager doesn't do projections into custom ORM objects")
     def test_projection_into_custom_orm_obj(self):
         super(TestProcessWithPopos, self).test_projection_into_custom_orm_obj()
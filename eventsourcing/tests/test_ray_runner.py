@@ -17,7 +17,7 @@ from eventsourcing.domain.model.events import (
 )
 from eventsourcing.system.definition import System
 from eventsourcing.system.ray import RayProcess, RayRunner
-from eventsourcing.system.rayhelpers import RayPrompt
+from eventsourcing.system.rayhelpers import NotificationBatch, RayPrompt
 from eventsourcing.tests.system_test_fixtures import (
     Orders,
     Payments,
@@ -189,13 +189,13 @@ class TestRayProcess(unittest.TestCase):
 
         # Get range of notifications.
         notifications = ray.get(ray_orders_process.get_notifications.remote(1, 1000))
-        self.assertIsInstance(notifications, list)
+        self.assertIsInstance(notifications, NotificationBatch)
         self.assertEqual(len(notifications), 1)
-        self.assertEqual(notifications[0]["id"], 1)
+        self.assertEqual(list(notifications)[0]["id"], 1)
 
         # Check the range is working.
         notifications = ray.get(ray_orders_process.get_notifications.remote(2, 2))
-        self.assertIsInstance(notifications, list)
+        self.assertIsInstance(notifications, NotificationBatch)
         self.assertEqual(len(notifications), 0, notifications)
 
         # Create process with Reservations application.
@@ -213,7 +213,7 @@ class TestRayProcess(unittest.TestCase):
         notifications = ray.get(
             ray_reservations_process.get_notifications.remote(1, 1000)
         )
-        self.assertIsInstance(notifications, list)
+        self.assertIsInstance(notifications, NotificationBatch)
         self.assertEqual(len(notifications), 0)
 
         # Prompt the process.
@@ -229,7 +229,7 @@ class TestRayProcess(unittest.TestCase):
             notifications = ray.get(
                 ray_reservations_process.get_notifications.remote(1, 1000)
             )
-            self.assertIsInstance(notifications, list)
+            self.assertIsInstance(notifications, NotificationBatch)
 
             try:
                 self.assertEqual(len(notifications), 1)
@@ -252,7 +252,7 @@ class TestRayProcess(unittest.TestCase):
 
         # Get range of notifications.
         notifications = ray.get(ray_orders_process.get_notifications.remote(1, 1000))
-        self.assertIsInstance(notifications, list)
+        self.assertIsInstance(notifications, NotificationBatch)
         self.assertEqual(len(notifications), 2)
 
         # Check another reservation was created.
@@ -264,7 +264,7 @@ class TestRayProcess(unittest.TestCase):
             notifications = ray.get(
                 ray_reservations_process.get_notifications.remote(1, 1000)
             )
-            self.assertIsInstance(notifications, list)
+            self.assertIsInstance(notifications, NotificationBatch)
 
             try:
                 self.assertEqual(len(notifications), 2)
@@ -290,3 +290,21 @@ class TestRayProcess(unittest.TestCase):
         # self.assertEqual(created_event_notification['id'], 1)
         # self.assertEqual(created_event_notification['originator_id'], order_id)
         # self.assertEqual(created_event_notification['originator_version'], 0)
+
+
+class TestNotificationBatch(unittest.TestCase):
+    def test_batch_in_object_store(self):
+        notifications = [
+            {"id": i, "topic": "topic{}".format(i % 2), "state": b"state%d" % i}
+            for i in range(1, 101)
+        ]
+        batch = NotificationBatch.from_notifications(notifications)
+
+        # Put and get the batch as one object.
+        copy = ray.get(ray.put(batch))
+        self.assertIsInstance(copy, NotificationBatch)
+        self.assertEqual(len(copy), 100)
+        for expected, notification in zip(notifications, copy):
+            self.assertEqual(notification["id"], expected["id"])
+            self.assertEqual(notification["topic"], expected["topic"])
+            self.assertEqual(bytes(notification["state"]), expected["state"])
@@ -0,0 +1,115 @@
+import gc
+import pickle
+from unittest import TestCase
+from uuid import uuid4
+from weakref import WeakSet
+
+from eventsourcing.domain.model.events import DomainEvent
+from eventsourcing.infrastructure.sequenceditem import StoredEvent
+from eventsourcing.infrastructure.sequenceditemmapper import SequencedItemMapper
+from eventsourcing.system.rayhelpers import (
+    NotificationBatch,
+    PromptedNotifications,
+    RayPrompt,
+)
+
+
+class TestNotificationBatch(TestCase):
+    def test_from_notifications(self):
+        notifications = [
+            {"id": 1, "topic": "a", "state": b"one", "causal_dependencies": None},
+            {"id": 2, "topic": "b", "state": b"", "causal_dependencies": "[]"},
+            {"id": 3, "topic": "a", "state": b"three", "causal_dependencies": None},
+        ]
+        batch = NotificationBatch.from_notifications(notifications)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(list(batch.ids), [1, 2, 3])
+        self.assertEqual(batch.topics, ["a", "b"])
+        self.assertEqual(batch.states, b"onethree")
+
+        # Check the notifications are the same, with states as memoryviews.
+        copy = pickle.loads(pickle.dumps(batch))
+        items = list(copy)
+        for notification in items:
+            self.assertIsInstance(notification["state"], memoryview)
+            notification["state"] = bytes(notification["state"])
+        self.assertEqual(items, notifications)
+
+        # Check an empty batch.
+        self.assertEqual(list(NotificationBatch.from_notifications([])), [])
+
+    def test_event_from_notification(self):
+        mapper = SequencedItemMapper(sequenced_item_class=StoredEvent)
+        originator_id = uuid4()
+        events = [
+            DomainEvent(originator_id=originator_id, originator_version=i, a=i)
+            for i in range(3)
+        ]
+        notifications = []
+        for i, event in enumerate(events):
+            item = mapper.item_from_event(event)
+            notifications.append(
+                {"id": i + 1, "topic": item.topic, "state": item.state}
+            )
+
+        # Check events can be decoded from the states in the buffer.
+        batch = NotificationBatch.from_notifications(notifications)
+        decoded = [mapper.event_from_notification(n) for n in batch]
+        self.assertEqual(decoded, events)
+
+
+class TestRayPrompt(TestCase):
+    def test_combine(self):
+        prompt = RayPrompt("orders", 1, 1, [(1, "rayid1")])
+        combined = prompt.combine(RayPrompt("orders", 1, 3, [(2, "rayid2")]))
+        self.assertEqual(combined.head_notification_id, 3)
+        self.assertEqual(combined.notification_ids, ((1, "rayid1"), (2, "rayid2")))
+
+
+class FakeObjectRef(object):
+    pass
+
+
+class FakeObjectStore(object):
+    """
+    Keeps objects only while there are refs to them, like the Ray object store.
+    """
+
+    def __init__(self):
+        self.refs = WeakSet()
+
+    def put(self, obj):
+        ref = FakeObjectRef()
+        self.refs.add(ref)
+        return ref
+
+
+class TestPromptedNotifications(TestCase):
+    def test_evict(self):
+        store = FakeObjectStore()
+        prompted = PromptedNotifications()
+
+        # Prompts carry refs of batches, identified by their first notification ID.
+        for notification_id in [1, 4, 6, 9]:
+            prompted.put("orders", notification_id, store.put(object()))
+        prompted.put("payments", 1, store.put(object()))
+        self.assertEqual(len(prompted), 5)
+
+        # Refs are popped when the reader's position is aligned with them.
+        self.assertIsInstance(prompted.pop("orders", 1), FakeObjectRef)
+        with self.assertRaises(KeyError):
+            prompted.pop("orders", 2)
+        with self.assertRaises(KeyError):
+            prompted.pop("reservations", 1)
+        gc.collect()
+        self.assertEqual(len(store.refs), 4)
+
+        # Refs at or below the reader's position are evicted.
+        self.assertEqual(prompted.evict("orders", 6), 2)
+        self.assertEqual(prompted.evict("orders", 6), 0)
+        self.assertEqual(prompted.evict("reservations", 6), 0)
+        gc.collect()
+        self.assertEqual(len(store.refs), 2)
+        self.assertEqual(len(prompted), 2)
+        self.assertIsInstance(prompted.pop("orders", 9), FakeObjectRef)
+        self.assertIsInstance(prompted.pop("payments", 1), FakeObjectRef)
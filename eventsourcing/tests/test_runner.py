@@ -0,0 +1,174 @@
+import pickle
+from queue import Queue
+from threading import Thread
+from unittest import TestCase
+
+from eventsourcing.application.process import PromptToQuit
+from eventsourcing.application.simple import PromptToPull
+from eventsourcing.exceptions import OperationalError
+from eventsourcing.system.runner import (
+    PromptOutbox,
+    RetryScheduler,
+    consolidate_prompts,
+    drain_prompts,
+)
+
+
+class TestConsolidatePrompts(TestCase):
+    def test_consolidate_prompts(self):
+        prompt_to_quit = PromptToQuit()
+        prompts = consolidate_prompts(
+            [
+                PromptToPull("orders", 1, 1),
+                PromptToPull("orders", 2, 5),
+                prompt_to_quit,
+                PromptToPull("orders", 1, 3),
+                PromptToPull("payments", 1, 2),
+                PromptToPull("orders", 1, 2),
+            ]
+        )
+        self.assertEqual(len(prompts), 4)
+        self.assertEqual(
+            [
+                (p.process_name, p.pipeline_id, p.head_notification_id)
+                for p in prompts[:3]
+            ],
+            [("orders", 1, 3), ("orders", 2, 5), ("payments", 1, 2)],
+        )
+        self.assertIs(prompts[3], prompt_to_quit)
+
+    def test_drain_prompts(self):
+        inbox = Queue()
+        for i in range(3):
+            inbox.put(PromptToPull("orders", 1, i + 2))
+        prompt = PromptToPull("orders", 1, 1)
+        prompts = drain_prompts(inbox, prompt)
+        self.assertEqual([p.head_notification_id for p in prompts], [1, 2, 3, 4])
+        self.assertTrue(inbox.empty())
+        inbox.join()
+
+
+class TestPromptOutbox(TestCase):
+    def test_put(self):
+        outbox = PromptOutbox()
+        outbox.downstream_inboxes["reservations"] = Queue()
+        outbox.downstream_inboxes["payments"] = Queue()
+        outbox.put(PromptToPull("orders", 1, 1))
+        for inbox in outbox.downstream_inboxes.values():
+            self.assertEqual(inbox.get_nowait().head_notification_id, 1)
+        self.assertEqual(outbox.num_prompts_put, 1)
+        self.assertEqual(outbox.num_prompts_collapsed, 0)
+
+    def test_prompts_put_whilst_delivering_are_consolidated(self):
+        outbox = PromptOutbox()
+        is_delivering = Queue()
+        can_deliver = Queue()
+
+        class SlowInbox(Queue):
+            def put(self, item, block=True, timeout=None):
+                if item.head_notification_id == 1:
+                    is_delivering.put(True)
+                    can_deliver.get()
+                super(SlowInbox, self).put(item, block, timeout)
+
+        inbox = SlowInbox()
+        outbox.downstream_inboxes["reservations"] = inbox
+
+        # Put a prompt in a thread, which blocks whilst delivering.
+        thread = Thread(target=outbox.put, args=(PromptToPull("orders", 1, 1),))
+        thread.start()
+        is_delivering.get(timeout=1)
+
+        # Put more prompts, which are consolidated.
+        for i in range(2, 6):
+            outbox.put(PromptToPull("orders", 1, i))
+        can_deliver.put(True)
+        thread.join(timeout=1)
+
+        prompts = drain_prompts(inbox, inbox.get_nowait())
+        self.assertEqual([p.head_notification_id for p in prompts], [1, 5])
+        self.assertEqual(outbox.num_prompts_put, 5)
+        self.assertEqual(outbox.num_prompts_collapsed, 3)
+
+    def test_pickle(self):
+        outbox = PromptOutbox()
+        outbox.put(PromptToPull("orders", 1, 1))
+        copy = pickle.loads(pickle.dumps(outbox))
+        self.assertEqual(copy.num_prompts_put, 1)
+        copy.put(PromptToPull("orders", 1, 2))
+        self.assertEqual(copy.num_prompts_put, 2)
+
+
+class FailingProcess(object):
+    """
+    Stands in for a process application, failing to pull from
+    upstream applications whilst they are listed as failing.
+    """
+
+    name = "reservations"
+    pipeline_id = 1
+    retryable_exceptions = (OperationalError,)
+
+    def __init__(self):
+        self.readers = {"orders": None, "payments": None}
+        self.failing = set()
+        self.prompts = []
+
+    def run(self, prompt):
+        self.prompts.append(prompt)
+        if prompt.process_name in self.failing:
+            raise OperationalError(prompt.process_name)
+
+
+class TestRetryScheduler(TestCase):
+    def test_get_delay(self):
+        process = FailingProcess()
+        retries = RetryScheduler(process, initial_delay=1, max_delay=5, jitter=0)
+        self.assertEqual([retries.get_delay(i) for i in range(1, 5)], [1, 2, 4, 5])
+
+        retries.jitter = 0.5
+        for _ in range(10):
+            self.assertTrue(2 <= retries.get_delay(3) <= 4)
+
+    def test_retries_dont_block_other_upstreams(self):
+        process = FailingProcess()
+        process.failing.add("orders")
+        retries = RetryScheduler(process, initial_delay=60)
+
+        # Runs all upstreams, scheduling a retry for the failing one.
+        retries.run()
+        self.assertEqual(
+            [p.process_name for p in process.prompts], ["orders", "payments"]
+        )
+        self.assertEqual(list(retries.scheduled), ["orders"])
+        self.assertLess(retries.get_timeout(100), 60)
+        self.assertEqual(retries.get_timeout(1), 1)
+
+        # Prompts for the failing upstream are combined with the scheduled retry.
+        retries.run(PromptToPull("orders", 1, 5))
+        retries.run(PromptToPull("payments", 1, 3))
+        self.assertEqual(
+            [p.process_name for p in process.prompts],
+            ["orders", "payments", "payments"],
+        )
+        self.assertEqual(retries.scheduled["orders"][1].head_notification_id, 5)
+
+        # Retries are run when they are due.
+        retries.run_due()
+        self.assertEqual(len(process.prompts), 3)
+        process.failing.clear()
+        retries.scheduled["orders"] = (0, retries.scheduled["orders"][1])
+        retries.run_due()
+        self.assertEqual(process.prompts[-1].head_notification_id, 5)
+        self.assertEqual(retries.scheduled, {})
+        self.assertEqual(dict(retries.attempts), {})
+
+    def test_max_attempts(self):
+        process = FailingProcess()
+        process.failing.add("orders")
+        retries = RetryScheduler(process, initial_delay=0, max_attempts=2)
+        retries.run(PromptToPull("orders", 1))
+        self.assertEqual(retries.attempts["orders"], 1)
+        with self.assertRaises(OperationalError):
+            retries.run_due()
+        self.assertEqual(len(process.prompts), 2)
@@ -3,15 +3,17 @@ from time import sleep, time
 from unittest import TestCase
 from uuid import uuid4
 
+from eventsourcing.application.notificationlog import RecordManagerNotificationLog
+from eventsourcing.application.process import ProcessApplication
 from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
 from eventsourcing.domain.model.events import (
     assert_event_handlers_empty,
     clear_event_handlers,
 )
 from eventsourcing.exceptions import ProgrammingError, RepositoryKeyError
-from eventsourcing.system.definition import System
+from eventsourcing.system.definition import System, partition
 from eventsourcing.system.multiprocess import MultiprocessRunner
-from eventsourcing.system.runner import MultiThreadedRunner
+from eventsourcing.system.runner import MultiThreadedRunner, SingleThreadedRunner
 from eventsourcing.tests.system_test_fixtures import (
     Examples,
     Order,
@@ -26,6 +28,16 @@ from eventsourcing.tests.system_test_fixtures import (
 from eventsourcing.tests.test_process import ExampleAggregate
 
 
+class MergedReservations(Reservations):
+    merged_pipeline_id = 0
+
+
+class Confirmations(ProcessApplication):
+    def policy(self, repository, event):
+        if isinstance(event, Reservation.Created):
+            return Payment.make(order_id=event.order_id)
+
+
 class TestSystem(TestCase):
     infrastructure_class = SQLAlchemyApplication
 
@@ -122,6 +134,27 @@ class TestSystem(TestCase):
             repository = app.repository
             self.assertEqual(repository[order_id].id, order_id)
 
+    def test_multiprocess_runner_with_shared_memory(self):
+        system = System(
+            Orders | Reservations | Orders,
+            Orders | Payments | Orders,
+            setup_tables=True,
+            infrastructure_class=self.infrastructure_class,
+        )
+
+        self.set_db_uri()
+        self.close_connections_before_forking()
+
+        with MultiprocessRunner(system, use_shared_memory=True) as runner:
+            orders = runner.get(Orders)
+            order_id = orders.create_new_order()
+
+            retries = 100
+            while not orders.repository[order_id].is_paid:
+                sleep(0.1)
+                retries -= 1
+                assert retries, "Failed set order.is_paid"
+
     def test_singlethreaded_runner_with_single_pipe(self):
         system = System(
             Orders | Reservations,
@@ -443,6 +476,148 @@ class TestSystem(TestCase):
             )
             print("Max order processing time: {:.3f}s".format(max(durations)))
 
+    def test_multipipeline_multiprocessing_merged(self):
+
+        self.set_db_uri()
+
+        system = System(
+            Orders | MergedReservations | Confirmations,
+            setup_tables=True,
+            infrastructure_class=self.infrastructure_class,
+        )
+
+        pipeline_ids = [1, 2]
+
+        multiprocess_runner = MultiprocessRunner(system, pipeline_ids=pipeline_ids)
+
+        num_orders = 10
+
+        self.close_connections_before_forking()
+
+        # Start multiprocessing system.
+        with multiprocess_runner:
+
+            # Create orders in the partition of their ID.
+            orders = multiprocess_runner.get(Orders)
+            for _ in range(num_orders):
+                order_id = uuid4()
+                orders.change_pipeline(multiprocess_runner.get_pipeline_id(order_id))
+                Order.__create__(originator_id=order_id).__save__()
+
+            # Wait for reservations from all partitions to be confirmed.
+            confirmations = multiprocess_runner.get(Confirmations)
+            record_manager = confirmations.event_store.record_manager
+            retries = 10 * num_orders
+            while len(list(record_manager.get_notification_records())) < num_orders:
+                sleep(0.1)
+                retries -= 1
+                assert retries, "Failed to confirm reservations"
+
+    def test_partition(self):
+        pipeline_ids = [1, 2, 3]
+        originator_id = uuid4()
+        pipeline_id = partition(originator_id, pipeline_ids)
+        self.assertIn(pipeline_id, pipeline_ids)
+        self.assertEqual(partition(originator_id, pipeline_ids), pipeline_id)
+        self.assertEqual(
+            {partition(uuid4(), pipeline_ids) for _ in range(100)}, set(pipeline_ids)
+        )
+        with self.assertRaises(ProgrammingError):
+            partition(originator_id, [])
+
+        runner = MultiprocessRunner(System(Orders), pipeline_ids=pipeline_ids)
+        self.assertEqual(runner.get_pipeline_id(originator_id), pipeline_id)
+
+    def test_merged_pipeline_ids(self):
+        system = System(Orders | MergedReservations | Confirmations | Payments)
+        self.assertEqual(system.get_pipeline_ids("orders", [1, 2]), [1, 2])
+        self.assertEqual(system.get_pipeline_ids("mergedreservations", [1, 2]), [1, 2])
+        self.assertEqual(system.get_pipeline_ids("confirmations", [1, 2]), [0])
+        self.assertEqual(system.get_pipeline_ids("payments", [1, 2]), [0])
+        self.assertEqual(system.get_output_pipeline_id("orders", 1), 1)
+        self.assertEqual(system.get_output_pipeline_id("mergedreservations", 1), 0)
+        self.assertEqual(system.get_output_pipeline_id("confirmations", 0), 0)
+
+        # Can't merge pipelines in a loop.
+        with self.assertRaises(ProgrammingError):
+            System(Orders | MergedReservations | Orders)
+
+        # Can't follow a partitioned process downstream of a merge.
+        with self.assertRaises(ProgrammingError):
+            System(Orders | MergedReservations | Confirmations, Orders | Confirmations)
+
+        # Only the multiprocess runner runs merged pipelines.
+        MultiprocessRunner(system, pipeline_ids=[1, 2])
+        with self.assertRaises(ProgrammingError):
+            SingleThreadedRunner(system)
+        with self.assertRaises(ProgrammingError):
+            MultiThreadedRunner(system)
+        with self.assertRaises(ProgrammingError):
+            with system:
+                pass
+
+    def test_merged_pipelines(self):
+        system = System(
+            Orders | MergedReservations | Confirmations,
+            setup_tables=True,
+            infrastructure_class=self.infrastructure_class,
+        )
+        pipeline_ids = [1, 2]
+
+        orders = system.construct_app(Orders)
+        workers = {}
+        for pipeline_id in pipeline_ids:
+            worker = system.construct_app(MergedReservations, pipeline_id=pipeline_id)
+            worker.follow(
+                "orders",
+                RecordManagerNotificationLog(
+                    orders.event_store.record_manager.clone(
+                        application_name="orders", pipeline_id=pipeline_id
+                    ),
+                    section_size=10,
+                ),
+            )
+            workers[pipeline_id] = worker
+        confirmations = system.construct_app(Confirmations, pipeline_id=0)
+        confirmations.follow("mergedreservations", workers[1].notification_log)
+
+        try:
+            # Create orders in the partition of their ID.
+            order_ids = {pipeline_id: [] for pipeline_id in pipeline_ids}
+            for _ in range(6):
+                order_id = uuid4()
+                pipeline_id = partition(order_id, pipeline_ids)
+                orders.change_pipeline(pipeline_id)
+                Order.__create__(originator_id=order_id).__save__()
+                order_ids[pipeline_id].append(order_id)
+
+            # Process each partition, merging reservations into pipeline 0.
+            for pipeline_id in pipeline_ids:
+                workers[pipeline_id].run()
+                self.assertEqual(
+                    workers[pipeline_id].get_recorded_position("orders"),
+                    len(order_ids[pipeline_id]),
+                )
+                # Running again doesn't process anything.
+                workers[pipeline_id].run()
+
+            notifications = list(workers[1].notification_log["1,10"].items)
+            self.assertEqual(len(notifications), 6)
+            self.assertEqual([n["id"] for n in notifications], list(range(1, 7)))
+
+            # Process the merged pipeline.
+            confirmations.run()
+            self.assertEqual(
+                confirmations.get_recorded_position("mergedreservations"), 6
+            )
+            payments = list(confirmations.notification_log["1,10"].items)
+            self.assertEqual(len(payments), 6)
+        finally:
+            confirmations.close()
+            for worker in workers.values():
+                worker.close()
+            orders.close()
+
     def set_db_uri(self):
         set_db_uri()
 
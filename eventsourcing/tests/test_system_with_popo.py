@@ -190,6 +190,10 @@ class TestSystemWithPopo(PopoTestCase, TestSystem):
 
         assert retries, "Failed set order.is_paid"
 
+    @skip("Popo record manager doesn't support multiprocessing")
+    def test_multiprocess_runner_with_shared_memory(self):
+        super(TestSystemWithPopo, self).test_multiprocess_runner_with_shared_memory()
+
     @skip("Popo record manager doesn't support multiprocessing")
     def test_multiprocessing_multiapp_system(self):
         super(TestSystemWithPopo, self).test_multiprocessing_multiapp_system()
@@ -202,6 +206,14 @@ class TestSystemWithPopo(PopoTestCase, TestSystem):
     def test_multipipeline_multiprocessing_multiapp(self):
         super(TestSystemWithPopo, self).test_multipipeline_multiprocessing_multiapp()
 
+    @skip("Popo record manager doesn't support pipelines")
+    def test_merged_pipelines(self):
+        super(TestSystemWithPopo, self).test_merged_pipelines()
+
+    @skip("Popo record manager doesn't support multiprocessing")
+    def test_multipipeline_multiprocessing_merged(self):
+        super(TestSystemWithPopo, self).test_multipipeline_multiprocessing_merged()
+
     def set_db_uri(self):
         # The Popo settings module doesn't currently recognise DB_URI.
         pass
@@ -2,11 +2,13 @@ import datetime
 from time import sleep
 from uuid import uuid4
 
+from eventsourcing.domain.model.events import publish
 from eventsourcing.domain.model.timebucketedlog import (
     Timebucketedlog,
     bucket_duration,
     bucket_starts,
     make_timebucket_id,
+    make_timebucket_index_id,
     start_new_timebucketedlog,
 )
 from eventsourcing.infrastructure.repositories.timebucketedlog_repo import (
@@ -22,6 +24,8 @@ from eventsourcing.tests.sequenced_item_tests.test_sqlalchemy_record_manager imp
     SQLAlchemyRecordManagerTestCase,
 )
 from eventsourcing.utils.times import decimaltimestamp
+from eventsourcing.utils.topic import get_topic
+from eventsourcing.utils.tracing import Tracer
 
 
 class TimebucketedlogTestCase(WithEventPersistence):
@@ -142,6 +146,93 @@ class TimebucketedlogTestCase(WithEventPersistence):
         messages = list(reader.get_messages(gt=halfway, lte=halfway))
         self.assertEqual(len(messages), 0)
 
+    def start_log_an_hour_ago(self, is_indexed):
+        name = uuid4()
+        event = Timebucketedlog.Started(
+            originator_id=name,
+            name=name,
+            bucket_size="second",
+            is_indexed=is_indexed,
+            originator_topic=get_topic(Timebucketedlog),
+            timestamp=decimaltimestamp() - 3600,
+        )
+        log = event.__mutate__(None)
+        publish([event])
+        return log
+
+    def test_bucket_index(self):
+        self.log_repo = TimebucketedlogRepo(self.entity_event_store)
+        log = self.start_log_an_hour_ago(is_indexed=True)
+        self.assertTrue(log.is_indexed)
+        log.log_message("message 1")
+        log.log_message("message 2")
+
+        # Buckets are indexed once, by whichever instance of the log
+        # logs the first message in the bucket.
+        other = self.log_repo[log.name]
+        self.assertTrue(other.is_indexed)
+        other.log_message("message 3")
+        log.log_message("message 4")
+        bucket_ids = [
+            e.bucket_id
+            for e in self.log_event_store.iter_events(
+                make_timebucket_index_id(log.name)
+            )
+        ]
+        self.assertTrue(bucket_ids)
+        self.assertEqual(len(bucket_ids), len(set(bucket_ids)))
+
+        # Only the buckets with messages are read.
+        reader = TimebucketedlogReader(log, self.log_event_store)
+        with Tracer() as tracer:
+            messages = list(reader.get_messages(is_ascending=True))
+        self.assertEqual(
+            messages, ["message 1", "message 2", "message 3", "message 4"]
+        )
+        self.assertLess(len(tracer.get_spans("event_store.query")), 10)
+
+        messages = list(reader.get_messages(is_ascending=False, limit=3))
+        self.assertEqual(messages, ["message 4", "message 3", "message 2"])
+
+        # The buckets can be read concurrently.
+        for bucket_size in ["second", "year"]:
+            log = start_new_timebucketedlog(uuid4(), bucket_size=bucket_size)
+            expected = []
+            for i in range(15):
+                expected.append(log.log_message(str(i)).message)
+                sleep(0.05)
+            halfway = decimaltimestamp()
+            for i in range(15, 30):
+                expected.append(log.log_message(str(i)).message)
+                sleep(0.05)
+            reader = TimebucketedlogReader(
+                log, self.log_event_store, buckets_in_flight=3
+            )
+            messages = list(reader.get_messages(is_ascending=True, page_size=4))
+            self.assertEqual(messages, expected)
+            messages = list(reader.get_messages(is_ascending=False, page_size=4))
+            self.assertEqual(messages, expected[::-1])
+            messages = list(reader.get_messages(gt=halfway, is_ascending=True))
+            self.assertEqual(messages, expected[15:])
+            messages = list(reader.get_messages(lt=halfway, limit=5))
+            self.assertEqual(messages, expected[14:9:-1])
+        self.assertIs(
+            TimebucketedlogReader.get_executor(), TimebucketedlogReader.get_executor()
+        )
+
+    def test_log_without_index(self):
+        log = self.start_log_an_hour_ago(is_indexed=False)
+        self.assertFalse(log.is_indexed)
+        log.log_message("message 1")
+        log.log_message("message 2")
+
+        # Every bucket is read.
+        reader = TimebucketedlogReader(log, self.log_event_store)
+        messages = list(reader.get_messages(gt=decimaltimestamp() - 5))
+        self.assertEqual(messages, ["message 2", "message 1"])
+        messages = list(reader.get_messages(limit=1))
+        self.assertEqual(messages, ["message 2"])
+
     @notquick
     def test_buckets_size_second(self):
         # Start new log.
@@ -422,7 +513,7 @@ class TestLogWithCassandra(WithCassandraRecordManagers, TimebucketedlogTestCase)
 
 
 class TestLogWithSQLAlchemy(SQLAlchemyRecordManagerTestCase, TimebucketedlogTestCase):
-    pass
+    use_named_temporary_file = True
 
 
 del TimebucketedlogTestCase
@@ -0,0 +1,126 @@
+import json
+import os
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+
+from eventsourcing.application.sqlalchemy import SQLAlchemyApplication
+from eventsourcing.domain.model.aggregate import AggregateRoot
+from eventsourcing.domain.model.events import assert_event_handlers_empty
+from eventsourcing.utils import tracing
+from eventsourcing.utils.random import encoded_random_bytes
+from eventsourcing.utils.tracing import Tracer
+
+
+class TestTracer(TestCase):
+    def tearDown(self):
+        assert tracing.tracer is None
+
+    def test_start_and_stop(self):
+        self.assertIsNone(tracing.tracer)
+        with Tracer() as tracer:
+            self.assertIs(tracing.tracer, tracer)
+        self.assertIsNone(tracing.tracer)
+
+    def test_spans_are_nested(self):
+        tracer = Tracer()
+        with tracer.span("outer", entity_id="1") as outer:
+            self.assertIs(tracer.current_span(), outer)
+            with tracer.span("inner") as inner:
+                inner.add("count", 2)
+                inner.add("count", 3)
+            with tracer.span("inner") as second:
+                second.set(count=1)
+        self.assertIsNone(tracer.current_span())
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.attrs["count"], 5)
+        self.assertEqual(len(tracer.get_spans()), 3)
+        self.assertEqual(tracer.get_spans("inner"), [inner, second])
+        self.assertEqual(tracer.get_spans(entity_id="1"), [outer])
+        self.assertEqual(tracer.get_descendants(outer), [inner, second])
+        self.assertGreaterEqual(outer.duration, inner.duration + second.duration)
+
+        trace = tracer.to_trace_events()
+        self.assertEqual(len(trace["traceEvents"]), 3)
+        event = trace["traceEvents"][0]
+        self.assertEqual(event["name"], "outer")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"]["entity_id"], "1")
+
+        tracer.clear()
+        self.assertEqual(tracer.get_spans(), [])
+
+
+class TestTracingRepository(TestCase):
+    def setUp(self):
+        self.app = SQLAlchemyApplication(
+            persist_event_type=AggregateRoot.Event,
+            cipher_key=encoded_random_bytes(16),
+            uri="sqlite:///:memory:",
+        )
+        self.app.repository.__page_size__ = 2
+
+    def tearDown(self):
+        if tracing.tracer is not None:
+            tracing.tracer.stop()
+        self.app.close()
+        assert_event_handlers_empty()
+
+    def test_get_entity(self):
+        aggregate = AggregateRoot.__create__()
+        for _ in range(4):
+            aggregate.__trigger_event__(AggregateRoot.Event)
+        aggregate.__save__()
+
+        # Nothing is recorded until a tracer is started.
+        tracer = Tracer()
+        self.app.repository[aggregate.id]
+        self.assertEqual(tracer.get_spans(), [])
+
+        with tracer:
+            self.app.repository[aggregate.id]
+
+        entity_id = str(aggregate.id)
+        get_entity_span = tracer.get_spans("repository.get_entity")[0]
+        self.assertEqual(get_entity_span.attrs["entity_id"], entity_id)
+        self.assertEqual(get_entity_span.attrs["version"], 4)
+
+        # Events are queried in pages of two.
+        query_spans = tracer.get_spans("event_store.query")
+        self.assertEqual([s.attrs["count"] for s in query_spans], [2, 2, 1])
+        self.assertEqual([s.attrs["query_number"] for s in query_spans], [1, 2, 3])
+
+        # Events are decoded in batches, and decrypted.
+        decode_spans = tracer.get_spans("event_store.decode")
+        self.assertEqual([s.attrs["count"] for s in decode_spans], [2, 2, 1])
+        self.assertGreater(decode_spans[0].attrs["decrypt_seconds"], 0)
+
+        mutate_span = tracer.get_spans("repository.mutate")[0]
+        self.assertEqual(mutate_span.attrs["count"], 5)
+
+        descendants = tracer.get_descendants(get_entity_span)
+        self.assertEqual(len(descendants), 7)
+
+        # Export the trace for the aggregate.
+        with NamedTemporaryFile(suffix=".json", delete=False) as f:
+            path = f.name
+        try:
+            tracer.export(path, entity_id=entity_id)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.remove(path)
+        names = [e["name"] for e in trace["traceEvents"]]
+        self.assertEqual(names[0], "repository.get_entity")
+        self.assertEqual(len(names), 8)
+
+    def test_store_events(self):
+        with Tracer() as tracer:
+            aggregate = AggregateRoot.__create__()
+            aggregate.__trigger_event__(AggregateRoot.Event)
+            aggregate.__save__()
+
+        encode_span = tracer.get_spans("event_store.encode")[0]
+        self.assertEqual(encode_span.attrs["count"], 2)
+        self.assertGreater(encode_span.attrs["encrypt_seconds"], 0)
+        self.assertEqual(len(tracer.get_spans("event_store.write")), 1)
@@ -7,7 +7,11 @@ from unittest import TestCase, skipIf
 from uuid import NAMESPACE_URL, UUID
 
 from eventsourcing.utils.times import utc_timezone
-from eventsourcing.utils.transcoding import ObjectJSONDecoder, ObjectJSONEncoder
+from eventsourcing.utils.transcoding import (
+    ClassStateDecoder,
+    ObjectJSONDecoder,
+    ObjectJSONEncoder,
+)
 
 try:
     from dataclasses import make_dataclass
@@ -402,6 +406,65 @@ class TestTranscoding(TestCase):
         self.decoder = ObjectJSONDecoder()
 
 
+class TestClassStateDecoder(TestCase):
+    def test_decode_flat_state(self):
+        state1 = {
+            "a": UUID("6ba7b811-9dad-11d1-80b4-00c04fd430c8"),
+            "b": Decimal("1.5"),
+            "c": datetime.datetime(2011, 1, 1, 1, 1, 1),
+            "d": "d",
+            "e": None,
+        }
+        state2 = dict(state1, b=Decimal("2.5"))
+
+        self.assertEqual(self.decode(MyDict, state1), state1)
+        shape = self.class_state_decoder.shapes[MyDict]
+        self.assertEqual(shape.keys, frozenset("abcde"))
+        self.assertEqual([key for key, _, _ in shape.decoded], ["a", "b", "c"])
+        self.assertEqual(shape.plain, ("d", "e"))
+
+        decoded = self.decode(MyDict, state2)
+        self.assertEqual(decoded, state2)
+        self.assertIsInstance(decoded["a"], UUID)
+        self.assertIsInstance(decoded["b"], Decimal)
+        self.assertIsInstance(decoded["c"], datetime.datetime)
+
+    def test_fallback_for_other_shapes(self):
+        state1 = {"a": UUID("6ba7b811-9dad-11d1-80b4-00c04fd430c8"), "b": 1}
+        self.assertEqual(self.decode(MyDict, state1), state1)
+
+        # Different keys.
+        state2 = {"a": state1["a"], "c": 1}
+        self.assertEqual(self.decode(MyDict, state2), state2)
+
+        # Different types of value.
+        state3 = {"a": Decimal("1.0"), "b": (1, 2)}
+        decoded = self.decode(MyDict, state3)
+        self.assertEqual(decoded, state3)
+        self.assertIsInstance(decoded["a"], Decimal)
+        self.assertIsInstance(decoded["b"], tuple)
+
+    def test_generic_decoding_for_nested_states(self):
+        state = {"a": [Decimal("1.0"), {"b": (1, 2)}], "c": Colour.RED}
+        self.assertEqual(self.decode(MyDeque, state), state)
+        self.assertIsNone(self.class_state_decoder.shapes[MyDeque])
+        self.assertEqual(self.decode(MyDeque, state), state)
+
+        # State which looks like an encoded value.
+        state = {"UUID": "6ba7b8119dad11d180b400c04fd430c8"}
+        decoded = self.decode(MySlottedClass, state)
+        self.assertEqual(decoded, UUID(state["UUID"]))
+
+    def decode(self, obj_class, state):
+        if not isinstance(state, str):
+            state = self.encoder.encode(state).decode("utf8")
+        return self.class_state_decoder.decode(obj_class, state)
+
+    def setUp(self):
+        self.encoder = ObjectJSONEncoder(sort_keys=True)
+        self.class_state_decoder = ClassStateDecoder(ObjectJSONDecoder())
+
+
 class MyDict(dict):
     pass
 
@@ -1,3 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, List, Optional, Sequence
+
 from Crypto.Cipher import AES
 
 from eventsourcing.exceptions import DataIntegrityError
@@ -7,8 +11,20 @@ from eventsourcing.utils.random import random_bytes
 class AESCipher(object):
     """
     Cipher strategy that uses Crypto library AES cipher in GCM mode.
+
+    Batches of plaintexts and ciphertexts can be encrypted and decrypted
+    with ``encrypt_many()`` and ``decrypt_many()``. Each state is still
+    encrypted with its own cipher object and random nonce, so on one thread
+    a batch takes about as long as a loop. If ``max_workers`` is greater
+    than one, batches are split across a pool of threads, which is shared
+    by all instances of this class. The Crypto library releases the GIL,
+    so this can help with large batches when there are many cores.
     """
 
+    max_workers = 1
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = Lock()
+
     def __init__(self, cipher_key: bytes):
         """
         Initialises AES cipher strategy with ``cipher_key``.
@@ -33,6 +49,30 @@ class AESCipher(object):
         # Return ciphertext.
         return ciphertext
 
+    def encrypt_many(self, plaintexts: Sequence[bytes]) -> List[bytes]:
+        """Return ciphertexts for given plaintexts."""
+
+        # Each plaintext has its own 96-bit random nonce, as with encrypt().
+        # The nonces are drawn from the OS with one call for the batch.
+        num_plaintexts = len(plaintexts)
+        nonces = random_bytes(12 * num_plaintexts)
+        key = self.cipher_key
+        new = AES.new
+        mode = AES.MODE_GCM
+
+        def encrypt(start: int, stop: int) -> List[bytes]:
+            ciphertexts = []
+            for i in range(start, stop):
+                nonce = nonces[12 * i : 12 * i + 12]
+                cipher = new(key, mode, nonce=nonce)
+                encrypted, tag = cipher.encrypt_and_digest(  # type: ignore
+                    plaintexts[i]
+                )
+                ciphertexts.append(nonce + tag + encrypted)
+            return ciphertexts
+
+        return self._map_batch(encrypt, num_plaintexts)
+
     def decrypt(self, ciphertext: bytes) -> bytes:
         """Return plaintext for given ciphertext."""
 
@@ -56,3 +96,36 @@ class AESCipher(object):
         except ValueError as e:
             raise DataIntegrityError("Cipher text is damaged: {}".format(e))
         return plaintext
+
+    def decrypt_many(self, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        """Return plaintexts for given ciphertexts."""
+
+        def decrypt(start: int, stop: int) -> List[bytes]:
+            return [self.decrypt(ciphertexts[i]) for i in range(start, stop)]
+
+        return self._map_batch(decrypt, len(ciphertexts))
+
+    def _map_batch(
+        self, func: Callable[[int, int], List[bytes]], batch_size: int
+    ) -> List[bytes]:
+        # Split the batch into a contiguous range for each worker.
+        num_ranges = min(self.max_workers, batch_size)
+        if num_ranges <= 1:
+            return func(0, batch_size)
+        bounds = [batch_size * i // num_ranges for i in range(num_ranges + 1)]
+        results = []
+        for result in self.get_executor().map(func, bounds[:-1], bounds[1:]):
+            results.extend(result)
+        return results
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns pool of threads used to encrypt and decrypt batches.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers, thread_name_prefix="cipher"
+                )
+            return cls._executor
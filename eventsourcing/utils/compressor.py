@@ -0,0 +1,290 @@
+"""
+Compression of small event states with shared dictionaries.
+
+Event states are small JSON documents whose keys and topic strings repeat,
+so compressing each state with zlib on its own saves little. Instead, a
+dictionary of common byte strings can be trained for each topic from a sample
+of event states, and used as the preset dictionary of a raw deflate stream::
+
+    compressor = DictionaryCompressor()
+    dictionary = compressor.train(topic, samples)
+    keep(dictionary)
+    compressor.add_dictionary(dictionary)
+    compressed = compressor.compress(state, topic)
+    assert compressor.decompress(compressed, topic) == state
+
+Compressed bytes start with a header that has the ID of the dictionary, so
+that states can be decompressed after a topic's dictionary has been trained
+again. Trained dictionaries must be kept (for example in a file) before they
+are added to the compressor, and given to the compressor when it is
+constructed, so that states compressed with them can still be decompressed.
+
+If dictionaries are trained by more than one process, the IDs of the
+dictionaries must be taken from a shared integer sequence generator, such
+as :class:`~eventsourcing.infrastructure.integersequencegenerators.redisincr.RedisIncr`,
+otherwise different dictionaries may have the same ID.
+"""
+import re
+import zlib
+from collections import Counter
+from struct import Struct
+from threading import Lock
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from eventsourcing.exceptions import DataIntegrityError
+
+# Windows larger than 8KB make priming a compressor slower, and
+# don't help with small states.
+WINDOW_BITS = 13
+MAX_DICTIONARY_SIZE = 2 ** WINDOW_BITS
+
+# Format version, and dictionary ID (zero when there is no dictionary).
+# The format version can't be mistaken for the first byte of a zlib
+# stream, so that states compressed with zlib can still be decompressed.
+HEADER = Struct(">BH")
+FORMAT_VERSION = 1
+
+# Quoted strings with the following colon or comma, and runs of other bytes.
+TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"[:,]?|[^"]+')
+
+
+class CompressionDictionary(NamedTuple):
+    """
+    Dictionary that was trained for a topic.
+    """
+
+    dictionary_id: int
+    topic: str
+    data: bytes
+
+
+def train_dictionary(
+    samples: Sequence[bytes], size: int = MAX_DICTIONARY_SIZE, num_examples: int = 4
+) -> bytes:
+    """
+    Returns a dictionary of byte strings that are common in the given samples.
+
+    Deflate references recent bytes more cheaply, so the most common strings
+    are placed at the end of the dictionary, followed by the samples that
+    are most typical, which have the common strings in their usual order.
+    """
+    assert 0 < size <= MAX_DICTIONARY_SIZE, size
+    tokenized = [TOKEN_PATTERN.findall(sample) for sample in samples]
+    counts: Counter = Counter()
+    for tokens in tokenized:
+        counts.update(set(tokens))
+
+    # Deflate can't use matches shorter than three bytes.
+    min_count = 2 if len(samples) > 1 else 1
+    common = [t for t, c in counts.items() if c >= min_count and len(t) >= 3]
+    common.sort(key=lambda t: (counts[t] * len(t), t))
+
+    # Find samples with the most common tokens for their length.
+    typical = sorted(
+        (i for i in range(len(samples)) if samples[i]),
+        key=lambda i: sum(counts[t] for t in tokenized[i]) / len(samples[i]),
+    )
+    examples = [samples[i] for i in typical[len(typical) - num_examples :]]
+    return b"".join(common + examples)[-size:]
+
+
+class DictionaryCompressor(object):
+    """
+    Compresses event states with a dictionary trained for each topic.
+
+    The latest dictionary of a topic is used to compress states. States of
+    topics without a dictionary are compressed without one.
+    """
+
+    def __init__(
+        self,
+        dictionaries: Iterable[CompressionDictionary] = (),
+        level: int = 6,
+        dictionary_ids: Optional[Iterator[int]] = None,
+    ):
+        """
+        Initialises compressor with previously trained ``dictionaries``.
+
+        :param dictionaries: dictionaries trained by this compressor before
+        :param level: zlib compression level
+        :param dictionary_ids: integer sequence generator shared by processes
+            that train dictionaries (IDs are one more than the integers)
+        """
+        self.level = level
+        self.dictionary_ids = dictionary_ids
+        self._lock = Lock()
+        self._last_trained_id = 0
+        self._dictionaries: Dict[int, CompressionDictionary] = {}
+        self._topic_dictionary_ids: Dict[str, int] = {}
+        self._primed_compressors: Dict[int, Any] = {}
+        self._primed_decompressors: Dict[int, Any] = {}
+        for dictionary in dictionaries:
+            self.add_dictionary(dictionary)
+
+    @property
+    def dictionaries(self) -> List[CompressionDictionary]:
+        """
+        Dictionaries that have been trained or added, in order of their IDs.
+        """
+        return sorted(self._dictionaries.values())
+
+    def train(
+        self, topic: str, samples: Sequence[bytes], size: int = MAX_DICTIONARY_SIZE
+    ) -> CompressionDictionary:
+        """
+        Trains a new dictionary for the topic from samples of event states,
+        and returns it. The dictionary isn't used to compress states until
+        it has been kept and then added with :func:`add_dictionary`.
+
+        :raises ValueError: If there are too many dictionaries, or the ID
+            taken from the shared sequence is already in use.
+        """
+        with self._lock:
+            if self.dictionary_ids is not None:
+                dictionary_id = next(self.dictionary_ids) + 1
+                if dictionary_id in self._dictionaries:
+                    raise ValueError(
+                        "Dictionary {} already exists".format(dictionary_id)
+                    )
+            else:
+                dictionary_id = (
+                    max(self._last_trained_id, max(self._dictionaries, default=0))
+                    + 1
+                )
+            if dictionary_id > 0xFFFF:
+                raise ValueError("Too many dictionaries")
+            self._last_trained_id = max(self._last_trained_id, dictionary_id)
+        return CompressionDictionary(
+            dictionary_id=dictionary_id,
+            topic=topic,
+            data=train_dictionary(samples, size=size),
+        )
+
+    def add_dictionary(self, dictionary: CompressionDictionary) -> None:
+        """
+        Adds a dictionary that was trained and kept, so that states of its
+        topic are compressed with it if it is the topic's latest dictionary.
+        """
+        with self._lock:
+            existing = self._dictionaries.get(dictionary.dictionary_id)
+            if existing is not None and existing != dictionary:
+                raise ValueError(
+                    "Dictionary {} already exists".format(dictionary.dictionary_id)
+                )
+            self._add_dictionary(dictionary)
+
+    def _add_dictionary(self, dictionary: CompressionDictionary) -> None:
+        dictionary_id = dictionary.dictionary_id
+        assert 0 < dictionary_id <= 0xFFFF, dictionary_id
+        self._dictionaries[dictionary_id] = dictionary
+        latest_id = self._topic_dictionary_ids.get(dictionary.topic, 0)
+        if dictionary_id > latest_id:
+            self._topic_dictionary_ids[dictionary.topic] = dictionary_id
+
+    def compress(self, data: bytes, topic: Optional[str] = None) -> bytes:
+        """
+        Compresses data with the latest dictionary for the topic.
+        """
+        dictionary_id = self._topic_dictionary_ids.get(topic, 0)  # type: ignore
+        # Copying a primed compressor is quicker than setting a dictionary.
+        try:
+            primed = self._primed_compressors[dictionary_id]
+        except KeyError:
+            primed = self._prime_compressor(dictionary_id)
+        compressor = primed.copy()
+        return (
+            HEADER.pack(FORMAT_VERSION, dictionary_id)
+            + compressor.compress(data)
+            + compressor.flush()
+        )
+
+    def decompress(self, data: bytes, topic: Optional[str] = None) -> bytes:
+        """
+        Decompresses data with the dictionary that was used to compress it.
+
+        If the topic is given, it is checked that the dictionary was trained
+        for the topic, so that a dictionary that has the same ID as another
+        isn't used.
+        """
+        if data[:1] != bytes((FORMAT_VERSION,)):
+            # Decompress states that were compressed with zlib.
+            return zlib.decompress(data)
+        if len(data) < HEADER.size:
+            raise DataIntegrityError("Compressed data is damaged: invalid header")
+        _, dictionary_id = HEADER.unpack_from(data)
+        if dictionary_id and topic is not None:
+            self._check_dictionary_topic(dictionary_id, topic)
+        try:
+            primed = self._primed_decompressors[dictionary_id]
+        except KeyError:
+            primed = self._prime_decompressor(dictionary_id)
+        decompressor = primed.copy()
+        try:
+            decompressed = decompressor.decompress(data[HEADER.size :])
+        except zlib.error as e:
+            raise DataIntegrityError("Compressed data is damaged: {}".format(e))
+        if not decompressor.eof:
+            raise DataIntegrityError("Compressed data is damaged: truncated")
+        return decompressed
+
+    def _check_dictionary_topic(self, dictionary_id: int, topic: str) -> None:
+        dictionary = self._dictionaries.get(dictionary_id)
+        if dictionary is None:
+            latest_id = self._topic_dictionary_ids.get(topic)
+            if latest_id is not None:
+                raise DataIntegrityError(
+                    "Compression dictionary {} not found, but dictionary {} of "
+                    "topic '{}' was found: a dictionary trained by another "
+                    "process wasn't kept, or dictionaries have the same "
+                    "ID".format(dictionary_id, latest_id, topic)
+                )
+        elif dictionary.topic != topic:
+            raise DataIntegrityError(
+                "Compression dictionary {} was trained for topic '{}', not "
+                "'{}': dictionaries have the same ID".format(
+                    dictionary_id, dictionary.topic, topic
+                )
+            )
+
+    def _prime_compressor(self, dictionary_id: int) -> Any:
+        args = [self.level, zlib.DEFLATED, -WINDOW_BITS, 8, zlib.Z_DEFAULT_STRATEGY]
+        if dictionary_id:
+            args.append(self._dictionaries[dictionary_id].data)
+        primed = zlib.compressobj(*args)
+        self._primed_compressors[dictionary_id] = primed
+        return primed
+
+    def _prime_decompressor(self, dictionary_id: int) -> Any:
+        if dictionary_id:
+            try:
+                dictionary = self._dictionaries[dictionary_id]
+            except KeyError:
+                raise DataIntegrityError(
+                    "Compression dictionary not found: {} (trained dictionaries "
+                    "must be kept and given to the compressor)".format(dictionary_id)
+                )
+            primed = zlib.decompressobj(-WINDOW_BITS, zdict=dictionary.data)
+        else:
+            primed = zlib.decompressobj(-WINDOW_BITS)
+        self._primed_decompressors[dictionary_id] = primed
+        return primed
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Primed compressors and locks can't be pickled.
+        return {
+            "dictionaries": self.dictionaries,
+            "level": self.level,
+            "dictionary_ids": self.dictionary_ids,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore
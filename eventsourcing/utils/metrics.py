@@ -0,0 +1,222 @@
+"""
+Metrics surface for process applications and system runners.
+
+Instrumented code calls :func:`increment`, :func:`observe` and :func:`gauge`
+only when some sinks have been added, so that instrumentation costs nothing
+when metrics are disabled::
+
+    if metrics.sinks:
+        metrics.increment("process_events_total", application="orders")
+
+Sinks receive each measurement, with the metric name and a dict of labels.
+"""
+import logging
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+sinks: List["MetricsSink"] = []
+
+
+def add_sink(sink: "MetricsSink") -> None:
+    """
+    Adds a sink, which enables metrics if it is the first sink.
+    """
+    if sink not in sinks:
+        sinks.append(sink)
+
+
+def remove_sink(sink: "MetricsSink") -> None:
+    """
+    Removes a sink, which disables metrics if it is the last sink.
+    """
+    try:
+        sinks.remove(sink)
+    except ValueError:
+        pass
+
+
+def increment(name: str, value: float = 1, **labels: str) -> None:
+    """
+    Increments a counter.
+    """
+    for sink in sinks:
+        sink.increment(name, value, labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """
+    Observes a value, such as a duration, which is summarised.
+    """
+    for sink in sinks:
+        sink.observe(name, value, labels)
+
+
+def gauge(name: str, value: float, **labels: str) -> None:
+    """
+    Sets a gauge, such as a queue depth or notification lag.
+    """
+    for sink in sinks:
+        sink.gauge(name, value, labels)
+
+
+class MetricsSink(ABC):
+    """
+    Receives measurements.
+    """
+
+    @abstractmethod
+    def increment(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        """
+        Increments a counter.
+        """
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        """
+        Observes a value.
+        """
+
+    @abstractmethod
+    def gauge(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        """
+        Sets a gauge.
+        """
+
+
+class Summary(object):
+    """
+    Count, sum, minimum and maximum of observed values.
+    """
+
+    __slots__ = ("count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Aggregates measurements in memory.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self.summaries: Dict[str, Dict[LabelsKey, Summary]] = {}
+        self.gauges: Dict[str, Dict[LabelsKey, float]] = {}
+
+    def increment(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = self._labels_key(labels)
+        with self.lock:
+            counters = self.counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = self._labels_key(labels)
+        with self.lock:
+            summaries = self.summaries.setdefault(name, {})
+            try:
+                summary = summaries[key]
+            except KeyError:
+                summary = summaries[key] = Summary()
+            summary.add(value)
+
+    def gauge(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = self._labels_key(labels)
+        with self.lock:
+            self.gauges.setdefault(name, {})[key] = value
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        return self.counters.get(name, {}).get(self._labels_key(labels), 0)
+
+    def get_summary(self, name: str, **labels: str) -> Summary:
+        return self.summaries.get(name, {}).get(self._labels_key(labels), Summary())
+
+    def get_gauge(self, name: str, **labels: str) -> float:
+        return self.gauges.get(name, {}).get(self._labels_key(labels), 0)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.summaries.clear()
+            self.gauges.clear()
+
+    @staticmethod
+    def _labels_key(labels: Dict[str, str]) -> LabelsKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class LoggingMetrics(MetricsSink):
+    """
+    Logs each measurement.
+    """
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+    ) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def increment(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        self.logger.log(self.level, "increment %s %s %s", name, labels, value)
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        self.logger.log(self.level, "observe %s %s %s", name, labels, value)
+
+    def gauge(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        self.logger.log(self.level, "gauge %s %s %s", name, labels, value)
+
+
+def prometheus_text(metrics: InMemoryMetrics, prefix: str = "eventsourcing_") -> str:
+    """
+    Returns metrics aggregated in memory in the Prometheus text exposition format.
+
+    Counters and gauges are exposed as such, and observed values are
+    exposed as summaries (with count and sum samples).
+    """
+    lines = []
+    with metrics.lock:
+        for name, values in sorted(metrics.counters.items()):
+            lines.append("# TYPE {}{} counter".format(prefix, name))
+            for key, value in sorted(values.items()):
+                lines.append(_sample(prefix + name, key, value))
+        for name, values in sorted(metrics.gauges.items()):
+            lines.append("# TYPE {}{} gauge".format(prefix, name))
+            for key, value in sorted(values.items()):
+                lines.append(_sample(prefix + name, key, value))
+        for name, summaries in sorted(metrics.summaries.items()):
+            lines.append("# TYPE {}{} summary".format(prefix, name))
+            for key, summary in sorted(summaries.items()):
+                lines.append(_sample(prefix + name + "_count", key, summary.count))
+                lines.append(_sample(prefix + name + "_sum", key, summary.sum))
+    return "\n".join(lines) + "\n"
+
+
+def _sample(name: str, key: LabelsKey, value: float) -> str:
+    if key:
+        labels = ",".join(
+            '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+            for k, v in key
+        )
+        return "{}{{{}}} {}".format(name, labels, _format_value(value))
+    return "{} {}".format(name, _format_value(value))
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
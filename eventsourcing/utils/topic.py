@@ -1,5 +1,5 @@
 import importlib
-from typing import Any, Dict, Type
+from typing import Any, Dict, Tuple, Type
 
 from eventsourcing.domain.model.versioning import Upcastable
 from eventsourcing.exceptions import TopicResolutionError
@@ -70,6 +70,12 @@ def resolve_attr(obj: Any, path: str) -> Any:
     return resolve_attr(head_obj, tail)
 
 
+# Whether or not classes are upcastable, and whether or not their
+# instances have a dict, cached to avoid checking each time an
+# object is reconstructed.
+_class_flags: Dict[type, Tuple[bool, bool]] = {}
+
+
 def reconstruct_object(obj_class: Type[T], obj_state: Dict[str, Any]) -> T:
     """
     Reconstructs object from given class and state.
@@ -78,11 +84,21 @@ def reconstruct_object(obj_class: Type[T], obj_state: Dict[str, Any]) -> T:
     :param obj_state: State of object to be reconstructed.
     :return: Reconstructed object.
     """
-    if issubclass(obj_class, Upcastable):
+    try:
+        is_upcastable, has_dict = _class_flags[obj_class]
+    except KeyError:
+        is_upcastable = issubclass(obj_class, Upcastable)
+        has_dict = obj_class.__dictoffset__ != 0
+        _class_flags[obj_class] = is_upcastable, has_dict
+    if is_upcastable:
         # Upcast the recorded state using the given class.
         obj_state = obj_class.__upcast_state__(obj_state)
 
     # Reconstruct the object class instance from the state.
     obj = object.__new__(obj_class)
-    obj.__dict__.update(obj_state)
+    if has_dict:
+        obj.__dict__.update(obj_state)
+    else:
+        # For instances with slots (e.g. slotted domain events).
+        obj.__setstate__(obj_state)  # type: ignore
     return obj
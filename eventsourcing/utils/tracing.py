@@ -0,0 +1,219 @@
+"""
+Opt-in tracing of the event store and repository hot paths.
+
+Instrumented code checks whether a tracer has been started, so that
+tracing costs nothing when it is disabled::
+
+    if tracing.tracer is not None:
+        with tracing.tracer.span("repository.get_entity", entity_id=str(entity_id)):
+            ...
+
+Spans record their start time, duration, thread, parent span and attributes
+(such as counts of items). The spans recorded by a tracer can be exported
+to a JSON file in the Chrome trace event format, which can be opened with
+chrome://tracing or https://ui.perfetto.dev to see where latency goes.
+"""
+import json
+import os
+from itertools import count
+from threading import Lock, get_ident, local
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+tracer: Optional["Tracer"] = None
+
+
+class Span(object):
+    """
+    Timed operation, with attributes.
+    """
+
+    __slots__ = (
+        "tracer",
+        "span_id",
+        "parent_id",
+        "name",
+        "attrs",
+        "thread_id",
+        "started",
+        "duration",
+    )
+
+    def __init__(
+        self, tracer: "Tracer", span_id: int, name: str, attrs: Dict[str, Any]
+    ):
+        self.tracer = tracer
+        self.span_id = span_id
+        self.parent_id: Optional[int] = None
+        self.name = name
+        self.attrs = attrs
+        self.thread_id = get_ident()
+        self.started = 0.0
+        self.duration: Optional[float] = None
+
+    def __enter__(self) -> "Span":
+        stack = self.tracer._get_stack()
+        if stack:
+            self.parent_id = stack[-1].span_id
+        stack.append(self)
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.duration = perf_counter() - self.started
+        stack = self.tracer._get_stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.tracer._record(self)
+
+    def set(self, **attrs: Any) -> None:
+        """
+        Sets attributes of the span.
+        """
+        self.attrs.update(attrs)
+
+    def add(self, name: str, value: float) -> None:
+        """
+        Adds to an attribute of the span, such as a count or a duration.
+        """
+        self.attrs[name] = self.attrs.get(name, 0) + value
+
+
+class Tracer(object):
+    """
+    Records spans, whilst it is started.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = Lock()
+        self._local = local()
+        self._span_ids = count(1)
+        self._origin = perf_counter()
+
+    def start(self) -> "Tracer":
+        """
+        Starts recording spans in instrumented code.
+        """
+        global tracer
+        tracer = self
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops recording spans.
+        """
+        global tracer
+        if tracer is self:
+            tracer = None
+
+    def __enter__(self) -> "Tracer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        """
+        Returns a new span, which is recorded when its context is exited.
+        """
+        return Span(self, next(self._span_ids), name, attrs)
+
+    def current_span(self) -> Optional[Span]:
+        """
+        Returns the innermost span entered in this thread, if there is one.
+        """
+        stack = self._get_stack()
+        return stack[-1] if stack else None
+
+    def get_spans(self, name: Optional[str] = None, **attrs: Any) -> List[Span]:
+        """
+        Returns recorded spans, optionally selected by name and attribute values.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        if name is not None:
+            spans = [s for s in spans if s.name == name]
+        for key, value in attrs.items():
+            spans = [s for s in spans if s.attrs.get(key) == value]
+        return spans
+
+    def get_descendants(self, span: Span) -> List[Span]:
+        """
+        Returns recorded spans that were entered within the given span.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        children: Dict[Optional[int], List[Span]] = {}
+        for s in spans:
+            children.setdefault(s.parent_id, []).append(s)
+        descendants = []
+        parents = [span]
+        while parents:
+            parent = parents.pop()
+            for child in children.get(parent.span_id, []):
+                descendants.append(child)
+                parents.append(child)
+        return sorted(descendants, key=lambda s: s.started)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def to_trace_events(self, spans: Optional[List[Span]] = None) -> Dict[str, Any]:
+        """
+        Returns spans in the Chrome trace event format.
+        """
+        if spans is None:
+            with self._lock:
+                spans = list(self.spans)
+        pid = os.getpid()
+        events = []
+        for span in sorted(spans, key=lambda s: s.started):
+            args = dict(span.attrs)
+            args["span_id"] = span.span_id
+            if span.parent_id is not None:
+                args["parent_id"] = span.parent_id
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "eventsourcing",
+                    "ph": "X",
+                    "ts": (span.started - self._origin) * 1e6,
+                    "dur": (span.duration or 0.0) * 1e6,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str, **attrs: Any) -> None:
+        """
+        Writes recorded spans to a JSON trace file.
+
+        If attribute values are given, for example an entity ID, only
+        the spans with those values and the spans within them are written.
+        """
+        spans: Optional[List[Span]] = None
+        if attrs:
+            selected: Dict[int, Span] = {}
+            for span in self.get_spans(**attrs):
+                selected[span.span_id] = span
+                for descendant in self.get_descendants(span):
+                    selected[descendant.span_id] = descendant
+            spans = list(selected.values())
+        with open(path, "w") as f:
+            json.dump(self.to_trace_events(spans), f, default=str)
+
+    def _get_stack(self) -> List[Span]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack: List[Span] = []
+            self._local.stack = stack
+            return stack
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
@@ -8,7 +8,7 @@ from inspect import isfunction
 from json import JSONDecoder, JSONEncoder
 from modulefinder import Module
 from types import FunctionType, MethodType
-from typing import Optional
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
 from uuid import UUID
 
 import dateutil.parser
@@ -88,6 +88,7 @@ def decoderpolicy(arg=None):
             return decorator
 
         wrapper.register = register
+        wrapper.decoder_map = decoder_map
 
         return wrapper
 
@@ -222,6 +223,104 @@ def decoder(d):
     return d
 
 
+class StateShape(NamedTuple):
+    """
+    The keys of a recorded object state, and the decoder functions
+    for the keys that have encoded values (such as UUIDs and Decimals).
+    """
+
+    keys: FrozenSet[str]
+    decoded: Tuple[Tuple[str, str, Callable[[Dict], Any]], ...]
+    plain: Tuple[str, ...]
+
+
+class ClassStateDecoder(object):
+    """
+    Decodes recorded object states, using the shape of the states
+    previously recorded for the same class of object.
+
+    Rather than having the JSON decoder call the library decoder
+    function for every JSON object, the shape of the state of each
+    class is learned when its first state is decoded. Only the values
+    in the shape that need decoding (such as UUIDs, Decimals and
+    timestamps) are then decoded. States that don't match the shape
+    of their class are decoded in the generic way, and so are states
+    of classes that have nested containers.
+    """
+
+    def __init__(self, json_decoder: JSONDecoder):
+        self.json_decoder = json_decoder
+        self.plain_json_decoder = JSONDecoder()
+        self.decoder_map: Dict[str, Callable[[Dict], Any]] = decoder.decoder_map
+        self.shapes: Dict[type, Optional[StateShape]] = {}
+
+    def decode(self, obj_class: type, s: str) -> Any:
+        try:
+            shape = self.shapes[obj_class]
+        except KeyError:
+            d = self.plain_json_decoder.decode(s)
+            shape = self.learn_shape(d)
+            self.shapes[obj_class] = shape
+            if shape is None:
+                return self.decode_generic(d)
+            return self.decode_with_shape(shape, d) or self.decode_generic(d)
+        else:
+            if shape is None:
+                return self.json_decoder.decode(s)
+            d = self.plain_json_decoder.decode(s)
+            return self.decode_with_shape(shape, d) or self.decode_generic(d)
+
+    def learn_shape(self, d: Any) -> Optional[StateShape]:
+        if type(d) is not dict or (len(d) == 1 and next(iter(d)) in self.decoder_map):
+            return None
+        decoded = []
+        plain = []
+        for key, value in d.items():
+            if type(value) is dict:
+                if len(value) != 1:
+                    return None
+                (marker, encoded), = value.items()
+                if type(encoded) in (dict, list) or marker not in self.decoder_map:
+                    return None
+                decoded.append((key, marker, self.decoder_map[marker]))
+            elif type(value) is list:
+                return None
+            else:
+                plain.append(key)
+        return StateShape(frozenset(d), tuple(decoded), tuple(plain))
+
+    def decode_with_shape(self, shape: StateShape, d: Any) -> Optional[Dict]:
+        """
+        Decodes values in given dict, or returns None if dict doesn't have shape.
+        """
+        if type(d) is not dict or d.keys() != shape.keys:
+            return None
+        for key in shape.plain:
+            if type(d[key]) in (dict, list):
+                return None
+        decoded_values = {}
+        for key, marker, decoder_func in shape.decoded:
+            value = d[key]
+            if type(value) is not dict or len(value) != 1 or marker not in value:
+                return None
+            decoded_values[key] = decoder_func(value)
+        d.update(decoded_values)
+        return d
+
+    def decode_generic(self, o: Any) -> Any:
+        """
+        Decodes plain JSON objects in the same way as the JSON decoder.
+        """
+        if type(o) is dict:
+            return self.json_decoder.object_hook(
+                {k: self.decode_generic(v) for k, v in o.items()}
+            )
+        elif type(o) is list:
+            return [self.decode_generic(i) for i in o]
+        else:
+            return o
+
+
 @encoder.register(type)
 def encode_type(o):
     return {"__type__": get_topic(o)}
@@ -12,6 +12,8 @@ class Event(object):
     Alfred North Whitehead, 1929
     """
 
+    __slots__ = ()
+
 
 class ActualOccasion(Event):
     """
@@ -29,6 +31,8 @@ class ActualOccasion(Event):
     Alfred North Whitehead, 1929
     """
 
+    __slots__ = ()
+
 
 class EnduringObject(Event):
     """
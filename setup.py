@@ -32,6 +32,8 @@ cassandra_requires = ["cassandra-driver<=3.23.99999"]
 
 django_requires = ["django<=3.1.99999"]
 
+parquet_requires = ["pyarrow<=0.17.99999"]
+
 testing_requires = (
     cassandra_requires
     + sqlalchemy_requires
@@ -40,6 +42,7 @@ testing_requires = (
     + ray_requires
     + thespian_requires
     + django_requires
+    + parquet_requires
     + [
         "mock<=4.0.99999",
         "flask<=1.1.99999",
@@ -110,6 +113,7 @@ setup(
         "grpc": grpc_requires,
         "ray": ray_requires,
         "django": django_requires,
+        "parquet": parquet_requires,
         "test": testing_requires,
         "tests": testing_requires,
         "testing": testing_requires,